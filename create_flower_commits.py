@@ -1,29 +1,31 @@
 #!/usr/bin/env python3
 """
 GitHub 잔디밭에 꽃(튤립) 패턴을 그리는 스크립트
-2024년 달력에 여러 개의 튤립을 고르게 배치합니다.
+2024년 달력에 여러 개의 튤립을 고르게 배치합니다 (interactive-cli/stamps.py로 합성).
 """
 
-import subprocess
+import argparse
+import cProfile
 from datetime import datetime, timedelta
 import random
 import os
-
-# 튤립 패턴 (7줄 x 5칸)
-# 1 = 커밋 있음, 0 = 커밋 없음
-TULIP_PATTERN = [
-    [0, 0, 1, 0, 0],  # 일요일
-    [0, 1, 1, 1, 0],  # 월요일
-    [1, 1, 1, 1, 1],  # 화요일
-    [0, 1, 1, 1, 0],  # 수요일
-    [0, 0, 1, 0, 0],  # 목요일
-    [0, 0, 1, 0, 0],  # 금요일
-    [0, 0, 1, 0, 0],  # 토요일
-]
-
-# 2024년 1월 1일은 월요일입니다
-# GitHub 잔디밭은 일요일부터 시작하므로 2023-12-31(일요일)부터 시작
-START_DATE = datetime(2023, 12, 31)
+import sys
+
+# interactive-cli의 커밋 백엔드 재사용
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "interactive-cli"))
+from finalize import finalize, print_report  # noqa: E402
+from git_backends import BACKENDS, make_backend  # noqa: E402
+from memory_repo import MemoryRepository  # noqa: E402
+from payloads import PAYLOADS, make_payload  # noqa: E402
+from progress import PhaseTimer, ProgressBar  # noqa: E402
+from run_history import finish_run, start_run  # noqa: E402
+from scheduler import (DEFAULT_PROFILE, PROFILES, CommitScheduler, load_profile,  # noqa: E402
+                       make_tzinfo, parse_tz, year_calendar, year_start_date)
+from stamps import STAMPS, Placement, composite  # noqa: E402
+
+# 대상 연도 (GitHub 잔디밭은 1월 1일이 속한 주의 일요일부터 시작)
+YEAR = 2024
+START_DATE = datetime.combine(year_start_date(YEAR), datetime.min.time())
 
 # 튤립을 배치할 주 간격 (0부터 시작)
 # 2024년은 약 52주이므로, 고르게 배치하기 위해 여러 위치에 배치
@@ -32,80 +34,150 @@ TULIP_START_WEEKS = [5, 14, 23, 32, 41, 50]  # 6개의 튤립
 # 하루에 생성할 커밋 수 범위
 COMMITS_PER_DAY = (5, 10)
 
+# 커밋 백엔드, payload 전략, 커밋 시각 스케줄러와 시간대 (main에서 설정)
+backend = None
+payload_strategy = "append"
+# payload (백엔드를 준비한 뒤 대상 브랜치의 파일 내용에서 시작)
+payload = None
+scheduler = None
+tzinfo = None
+# 단계별 시간 측정 (--profile일 때만 켜짐)
+timer = PhaseTimer()
 
-def create_commit(date, commit_number):
-    """특정 날짜에 커밋 생성"""
-    # 커밋 시간을 랜덤하게 설정 (더 자연스럽게)
-    hour = random.randint(9, 22)
-    minute = random.randint(0, 59)
-    second = random.randint(0, 59)
 
-    commit_date = date.replace(hour=hour, minute=minute, second=second)
+def create_commit(commit_date, commit_number):
+    """스케줄러가 정한 시각에 커밋 생성"""
     date_str = commit_date.strftime("%Y-%m-%d %H:%M:%S")
 
-    # 더미 파일 생성/수정
-    with open("flower_commits.txt", "a") as f:
-        f.write(f"Commit on {date_str}\n")
-
-    # git add
-    subprocess.run(["git", "add", "flower_commits.txt"], check=True)
+    commit_message = f"Flower commit {commit_number}"
+    with timer.phase("payload 생성"):
+        content = payload.next(f"Commit on {date_str}\n")
+    with timer.phase("커밋"):
+        backend.commit(commit_date, commit_message, content)
 
-    # git commit with custom date
-    env = os.environ.copy()
-    env["GIT_AUTHOR_DATE"] = date_str
-    env["GIT_COMMITTER_DATE"] = date_str
 
-    commit_message = f"Flower commit {commit_number}"
-    subprocess.run(
-        ["git", "commit", "-m", commit_message],
-        env=env,
-        check=True,
-        capture_output=True
-    )
+def tulip_grid():
+    """튤립 스탬프를 TULIP_START_WEEKS에 찍은 연도 그리드 (달력 밖의 칸은 잘림)"""
+    tulip = STAMPS["tulip"]
+    return composite([Placement(tulip, week) for week in TULIP_START_WEEKS], year=YEAR)
 
 
-def draw_tulip(start_week):
-    """특정 주에 튤립 그리기"""
+def draw_grid(grid):
+    """그리드의 칠한 칸마다 여러 개의 커밋 생성 (날짜 순서)"""
     commit_count = 0
 
-    for week_offset in range(5):  # 튤립 너비 (5주)
-        for day_of_week in range(7):  # 일요일(0) ~ 토요일(6)
-            if TULIP_PATTERN[day_of_week][week_offset] == 1:
-                # 해당 날짜 계산
-                days_from_start = (start_week + week_offset) * 7 + day_of_week
-                commit_date = START_DATE + timedelta(days=days_from_start)
-
-                # 2024년 범위 내에 있는지 확인
-                if datetime(2024, 1, 1) <= commit_date <= datetime(2024, 12, 31):
-                    # 해당 날짜에 여러 개의 커밋 생성
-                    num_commits = random.randint(*COMMITS_PER_DAY)
-                    for i in range(num_commits):
-                        commit_count += 1
-                        create_commit(commit_date, commit_count)
-                        print(f"✓ 커밋 생성: {commit_date.strftime('%Y-%m-%d')} (#{commit_count})")
-
+    # 그리드는 주 단위로 저장되어 있어 index가 곧 달력 표의 index
+    # 날짜별 커밋 수를 먼저 정하고 전체 커밋 시각을 스케줄러로 한 번에 생성
+    calendar = year_calendar(YEAR)
+    rng = random.Random(f"{scheduler.seed}:count")
+    days = [index for index, _ in grid.nonzero() if calendar[index]]
+    counts = [rng.randint(*COMMITS_PER_DAY) for _ in days]
+    seconds = iter(scheduler.schedule([calendar[index] for index in days], counts))
+    progress = ProgressBar(sum(counts))
+
+    for index, num_commits in zip(days, counts):
+        day_start = (START_DATE + timedelta(days=index)).replace(tzinfo=tzinfo)
+        # 해당 날짜에 여러 개의 커밋 생성 (시각은 오름차순)
+        for _ in range(num_commits):
+            commit_count += 1
+            create_commit(day_start + timedelta(seconds=next(seconds)), commit_count)
+            progress.update(commit_count)
+
+    progress.finish()
     return commit_count
 
 
 def main():
+    global backend, payload_strategy, timer, scheduler, tzinfo
+
+    parser = argparse.ArgumentParser(description="GitHub 잔디밭에 튤립 패턴 그리기")
+    parser.add_argument("--mode", choices=list(BACKENDS), default="fast-import",
+                        help="커밋 백엔드 (기본: fast-import, 기존 방식: subprocess)")
+    parser.add_argument("--payload", choices=list(PAYLOADS), default="append",
+                        help="커밋마다 payload 파일을 바꾸는 방식 (기본: append)")
+    parser.add_argument("--profile", nargs="?", const="flower-profile.prof", default=None,
+                        metavar="FILE",
+                        help="단계별 시간 요약을 출력하고 cProfile 결과를 FILE에 저장 "
+                             "(기본: flower-profile.prof)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="커밋 수/시각 시드 (같은 시드면 같은 히스토리, 기본: 무작위)")
+    parser.add_argument("--activity", default=DEFAULT_PROFILE, metavar="PROFILE",
+                        help=f"커밋 시간대 프로필 ({', '.join(PROFILES)} 또는 JSON 파일, "
+                             f"기본: {DEFAULT_PROFILE})")
+    parser.add_argument("--tz", default=None,
+                        help="커밋 시각의 시간대 오프셋 (예: +09:00, 기본: 로컬 시간대)")
+    parser.add_argument("--finalize", action="store_true",
+                        help="생성 후 repack하고 정리 전후 저장소 크기와 예상 push 크기 비교")
+    parser.add_argument("--ref", default=None, metavar="BRANCH",
+                        help="커밋을 쌓을 브랜치 (기본: 체크아웃된 브랜치, "
+                             "다른 브랜치면 작업 디렉토리를 건드리지 않음)")
+    args = parser.parse_args()
+    try:
+        profile = load_profile(args.activity)
+        tzinfo = make_tzinfo(parse_tz(args.tz))
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    scheduler = CommitScheduler(seed, profile)
+    backend = make_backend(args.mode, "flower_commits.txt", args.ref)
+    if not backend.persistent:
+        # memory 백엔드: 현재 저장소 위에서 메모리로 만든 뒤 마지막에 한 번에 기록
+        backend.repo = MemoryRepository.open()
+    payload_strategy = args.payload
+    timer = PhaseTimer(args.profile is not None)
+    backend.timer = timer
+
+    if args.profile is None:
+        draw_flowers(args.finalize)
+        return
+
+    profiler = cProfile.Profile()
+    profiler.runcall(draw_flowers, args.finalize)
+    profiler.dump_stats(args.profile)
+    timer.print_summary()
+    print(f"cProfile 결과: {args.profile} (python3 -m pstats {args.profile} 로 확인)")
+
+
+def draw_flowers(finalize_repository=False):
+    """튤립 그리드를 커밋으로 생성 (finalize_repository: 생성 후 repack하고 크기 비교)"""
+    global payload
+
     print("=" * 60)
     print("🌷 GitHub 잔디밭 꽃 그리기 시작!")
     print("=" * 60)
     print()
 
-    total_commits = 0
-
-    # 여러 개의 튤립 그리기
-    for idx, start_week in enumerate(TULIP_START_WEEKS, 1):
-        print(f"\n🌷 튤립 #{idx} 그리는 중 (시작 주: {start_week})...")
-        commits = draw_tulip(start_week)
-        total_commits += commits
-        print(f"   → {commits}개 커밋 생성 완료")
+    with timer.phase("시작 (백엔드 준비)"):
+        backend.begin()
+        # 체크아웃되지 않은 ref나 bare 저장소는 대상 브랜치의 payload 파일에서 이어 씀
+        payload = make_payload(payload_strategy, "flower_commits.txt", backend.initial_payload())
+    # 시작 전 브랜치 끝 기록 (git_generator.py rollback으로 되돌리기)
+    run = start_run(backend.ref, backend.base, {
+        "pattern": "tulip", "year": YEAR, "seed": scheduler.seed, "mode": backend.name,
+        "payload_file": "flower_commits.txt",
+    }, backend)
+
+    # 여러 개의 튤립을 한 그리드에 합성한 뒤 날짜 순서로 그리기
+    print(f"🌷 튤립 {len(TULIP_START_WEEKS)}개 그리는 중 (시작 주: {TULIP_START_WEEKS})...")
+    try:
+        total_commits = draw_grid(tulip_grid())
+    except BaseException:
+        backend.abort()
+        raise
+
+    with timer.phase("마무리 (브랜치 갱신)"):
+        backend.finish()
+        # memory 백엔드는 실행 기록 ref도 메모리에 쓰므로 flush 전에 기록
+        finish_run(run, backend.resolve(backend.ref), total_commits, backend)
+        if not backend.persistent:
+            backend.flush()
 
     print()
     print("=" * 60)
     print(f"✅ 완료! 총 {total_commits}개의 커밋이 생성되었습니다.")
     print("=" * 60)
+    if finalize_repository:
+        print_report(*finalize(backend.ref, timer))
     print()
     print("다음 명령어로 GitHub에 푸시하세요:")
     print("  git push -f origin main")
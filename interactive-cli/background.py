@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+에디터 안에서 실행하는 백그라운드 커밋 생성
+
+GenerationJob은 그리드 스냅샷으로 작업 스레드에서 커밋을 생성하고, 진행 상황을 큐로
+보냅니다. 에디터는 입력을 timeout으로 기다리면서 poll()로 큐를 비우므로 생성 중에도
+화면이 멈추지 않습니다. cancel()을 부르면 다음 커밋 전에 생성을 멈추고 확정되지 않은
+커밋을 버립니다 (확정된 커밋까지는 저널에 남아 git_generator.py resume으로 이어서 생성 가능).
+"""
+
+import queue
+import threading
+import time
+
+from generation_plan import DEFAULT_COUNT_MODE
+from git_generator import GitCommitGenerator
+from scheduler import DEFAULT_PROFILE
+
+
+class GenerationCancelled(Exception):
+    """생성 취소 요청"""
+
+
+class QueueProgress:
+    """ProgressBar 대신 진행 상황을 큐로 보내는 진행률 (취소 요청을 확인하는 지점)"""
+
+    def __init__(self, job, total, start=0, interval=0.1):
+        self.job = job
+        self.total = total
+        self.start = start
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_sent = 0.0
+
+    def update(self, done):
+        """done개 완료 (간격이 지났을 때만 큐에 보냄)"""
+        if self.job.cancel_requested.is_set():
+            raise GenerationCancelled()
+        now = time.perf_counter()
+        if now - self.last_sent >= self.interval:
+            self.last_sent = now
+            self.send(done, now)
+
+    def send(self, done, now=None):
+        elapsed = (now or time.perf_counter()) - self.started
+        rate = (done - self.start) / elapsed if elapsed > 0 else 0.0
+        self.job.events.put(("progress", done, self.total, rate))
+
+    def finish(self):
+        self.send(self.total)
+
+
+class GenerationJob:
+    """작업 스레드에서 실행하는 커밋 생성
+
+    이벤트(큐 항목):
+        ("start", 전체 커밋 수)
+        ("progress", 완료 수, 전체 수, 커밋/초)
+        ("done", 생성한 커밋 수)
+        ("cancelled", 브랜치에 확정된 커밋 수)
+        ("error", 메시지)
+    """
+
+    def __init__(self, grid, year, mode="fast-import", payload="append", seed=None,
+                 activity=DEFAULT_PROFILE, tz=None, count_mode=DEFAULT_COUNT_MODE):
+        # 편집과 무관하도록 호출한 쪽에서 스냅샷을 넘김 (CanvasGrid.snapshot)
+        self.grid = grid
+        self.year = year
+        self.seed = seed
+        self.generator = GitCommitGenerator(year, mode, payload, activity=activity, tz=tz,
+                                            count_mode=count_mode)
+        self.generator.progress_class = lambda total, start=0: QueueProgress(self, total, start)
+        # 오류는 화면에 출력하지 않고 이벤트로 보냄
+        self.generator.print_errors = False
+        self.events = queue.Queue()
+        self.cancel_requested = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="canvas-generate", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def running(self):
+        return self.thread.is_alive()
+
+    def cancel(self):
+        """다음 커밋 전에 멈추도록 요청 (기다리지 않음)"""
+        self.cancel_requested.set()
+
+    def wait(self, timeout=None):
+        self.thread.join(timeout)
+
+    def poll(self):
+        """쌓인 이벤트를 모두 꺼내 목록으로 반환 (기다리지 않음)"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _run(self):
+        generator = self.generator
+        try:
+            plan = generator.compile_plan(self.grid, self.seed)
+            self.events.put(("start", plan.total))
+            total = generator.execute_plan(plan, grid=self.grid)
+            if total is None:
+                self.events.put(("error", generator.error))
+                return
+            generator.save_generation(self.grid, plan)
+            self.events.put(("done", total))
+        except GenerationCancelled:
+            journal = getattr(generator, "journal", None)
+            self.events.put(("cancelled", journal.data["done"] if journal else 0))
+        except Exception as e:
+            self.events.put(("error", str(e) or type(e).__name__))
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+여러 (패턴, 연도, 저장소) 작업을 프로세스 풀로 병렬 생성
+
+각 작업(샤드)은 작업 프로세스에서 블롭과 트리를 자신의 팩파일로 직접 씁니다.
+커밋 해시는 부모에 의존하므로, 같은 저장소의 샤드들은 마지막에 연도 순서로
+커밋 오브젝트만 이어 써서 하나의 일렬 히스토리로 합칩니다 (작고 빠른 단계).
+
+매니페스트 예시 (batch.json):
+    {
+      "jobs": [
+        {"pattern": "heart.json", "year": 2022, "repo": "../repo-a"},
+        {"pattern": "flower.json", "year": 2023, "repo": "../repo-a", "seed": 7},
+        {"pattern": "heart.json", "year": 2024, "repo": "../repo-b", "tz": "+09:00"}
+      ],
+      "payload": "empty",
+      "activity": "workday",
+      "counts": "minimal"
+    }
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from generation_plan import COUNT_MODES, DEFAULT_COUNT_MODE, GenerationPlan
+from git_backends import raw_git_date, read_day_counts
+from git_objects import (
+    OBJ_BLOB, OBJ_COMMIT, OBJ_TREE, ObjectStore, PackWriter, TreeTemplate,
+    commit_object, find_git_dir, read_identity,
+)
+from pattern_store import load_grid
+from payloads import PAYLOADS, make_payload
+from scheduler import DEFAULT_PROFILE, load_profile, parse_tz
+
+PAYLOAD_FILE = "canvas_commits.txt"
+
+
+def resolve_pattern(pattern, manifest_dir):
+    """패턴 경로 찾기 (매니페스트 기준 상대 경로, 없으면 patterns/ 폴더)"""
+    candidates = [
+        os.path.join(manifest_dir, pattern),
+        os.path.join(manifest_dir, "patterns", pattern),
+        os.path.join("patterns", pattern),
+    ]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return os.path.abspath(candidate)
+    raise FileNotFoundError(f"패턴 파일을 찾을 수 없습니다: {pattern}")
+
+
+def render_shard(job):
+    """샤드 하나의 블롭/트리를 팩으로 쓰고 커밋 목록 반환 (작업 프로세스에서 실행)
+
+    반환하는 커밋 목록은 (트리 해시, raw 날짜, 메시지)이며, 부모 연결은 합치기 단계에서 합니다.
+    """
+    started = time.perf_counter()
+    plan = GenerationPlan.compile(load_grid(job["pattern"]), job["year"], job.get("seed"),
+                                  activity=job["activity"], tz=job["tz"],
+                                  count_mode=job["counts"], existing=job["existing"])
+    # 샤드마다 payload 파일은 빈 내용에서 시작
+    payload = make_payload(job["payload"], PAYLOAD_FILE, initial=b"")
+
+    store = ObjectStore(job["git_dir"])
+    base_tree = bytes.fromhex(job["base_tree"]) if job["base_tree"] else None
+    trees = TreeTemplate(store, base_tree, PAYLOAD_FILE)
+    writer = PackWriter(store.objects_dir)
+    root_tree = base_tree
+
+    commits = []
+    for record in plan.records():
+        date_str = record.date.strftime("%Y-%m-%d %H:%M:%S")
+        content = payload.next(f"Commit on {date_str}\n")
+        if content is not None:
+            blob = writer.add(OBJ_BLOB, content)
+            for root_tree, data in trees.build(blob):
+                writer.add(OBJ_TREE, data, root_tree)
+        elif root_tree is None:
+            # 파일을 바꾸지 않는 커밋인데 시작 트리가 없으면 빈 트리 사용
+            root_tree = writer.add(OBJ_TREE, b"")
+        commits.append((root_tree, raw_git_date(record.date).encode(), record.message.encode()))
+
+    if writer.entries:
+        writer.finish()
+    else:
+        writer.abort()
+
+    return {
+        "repo": job["repo"],
+        "year": job["year"],
+        "seed": plan.seed,
+        "commits": commits,
+        "content": payload.content,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def join_shards(info, shards):
+    """같은 저장소의 샤드들을 연도 순서로 커밋 오브젝트만 이어 써서 합침"""
+    started = time.perf_counter()
+    store = ObjectStore(info["git_dir"])
+    ident = info["ident"].encode()
+    writer = PackWriter(store.objects_dir)
+    tip = bytes.fromhex(info["base"]) if info["base"] else None
+
+    content = None
+    for shard in sorted(shards, key=lambda s: s["year"]):
+        for tree, when, message in shard["commits"]:
+            tip = writer.add(OBJ_COMMIT, commit_object(tree, tip, ident, when, message))
+        if shard["content"] is not None:
+            content = shard["content"]
+
+    if not writer.entries:
+        writer.abort()
+        return time.perf_counter() - started
+    writer.finish()
+    store.write_ref(info["ref"], tip)
+
+    # 체크아웃된 브랜치이므로 payload 파일의 작업 디렉토리/인덱스를 새 HEAD에 맞춤 (bare 저장소 제외)
+    if content is not None and info["root"]:
+        with open(os.path.join(info["root"], PAYLOAD_FILE), "wb") as f:
+            f.write(content)
+        if shutil.which("git"):
+            subprocess.run(["git", "add", PAYLOAD_FILE], cwd=info["root"], check=True)
+    return time.perf_counter() - started
+
+
+def load_jobs(manifest_file):
+    """매니페스트를 읽어 작업 목록 생성 (저장소별 브랜치, 시작 커밋, 작성자 정보 포함)"""
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"jobs": manifest}
+
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_file))
+    default_payload = manifest.get("payload", "append")
+    repos = {}
+    jobs = []
+    for entry in manifest["jobs"]:
+        repo = os.path.abspath(os.path.join(manifest_dir, entry.get("repo", ".")))
+        if repo not in repos:
+            root, git_dir = find_git_dir(repo)
+            store = ObjectStore(git_dir)
+            ref = store.head_ref()
+            base = store.read_ref(ref)
+            repos[repo] = {
+                "root": root,
+                "git_dir": git_dir,
+                "ref": ref,
+                "base": base.hex() if base else None,
+                "base_tree": store.commit_tree(base).hex() if base else None,
+                "ident": read_identity(git_dir),
+                # minimal 방식에서 기존 커밋으로 볼 날짜별 커밋 수
+                "existing": read_day_counts(base.hex(), cwd=root or git_dir) if base else {},
+            }
+        info = repos[repo]
+
+        payload = entry.get("payload", default_payload)
+        if payload not in PAYLOADS:
+            raise ValueError(f"알 수 없는 payload 전략: {payload}")
+        activity = entry.get("activity", manifest.get("activity", DEFAULT_PROFILE))
+        load_profile(activity)
+        count_mode = entry.get("counts", manifest.get("counts", DEFAULT_COUNT_MODE))
+        if count_mode not in COUNT_MODES:
+            raise ValueError(f"알 수 없는 커밋 수 방식: {count_mode}")
+        year = int(entry["year"])
+        # 작업 프로세스로는 해당 연도의 기존 커밋 수만 넘김
+        first, last = date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal()
+        existing = {ordinal: count for ordinal, count in info["existing"].items()
+                    if first <= ordinal <= last} if count_mode == "minimal" else {}
+        jobs.append({
+            "pattern": resolve_pattern(entry["pattern"], manifest_dir),
+            "year": year,
+            "repo": repo,
+            "seed": entry.get("seed"),
+            "payload": payload,
+            "activity": activity,
+            "tz": parse_tz(entry.get("tz", manifest.get("tz"))),
+            "counts": count_mode,
+            "existing": existing,
+            "git_dir": info["git_dir"],
+            "base_tree": info["base_tree"],
+        })
+    return jobs, repos
+
+
+def run_batch(manifest_file, workers=None):
+    """매니페스트의 모든 작업을 병렬로 생성하고 처리량 보고"""
+    jobs, repos = load_jobs(manifest_file)
+
+    print("=" * 60)
+    print(f"🗂  배치 생성: 작업 {len(jobs)}개, 저장소 {len(repos)}개, "
+          f"프로세스 {workers or os.cpu_count()}개")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = list(pool.map(render_shard, jobs))
+    render_seconds = time.perf_counter() - started
+
+    for shard in shards:
+        count = len(shard["commits"])
+        rate = count / shard["seconds"] if shard["seconds"] else 0
+        print(f"  ✓ {os.path.basename(shard['repo'])} {shard['year']}: "
+              f"{count}개 커밋 (시드 {shard['seed']}, {rate:,.0f}커밋/초)")
+
+    join_seconds = 0.0
+    for repo, info in repos.items():
+        join_seconds += join_shards(info, [s for s in shards if s["repo"] == repo])
+
+    total_seconds = time.perf_counter() - started
+    total_commits = sum(len(shard["commits"]) for shard in shards)
+    print()
+    print("=" * 60)
+    print(f"✅ 완료! 총 {total_commits}개 커밋")
+    print(f"   샤드 생성: {render_seconds:.2f}초 | 합치기: {join_seconds:.2f}초 | "
+          f"전체: {total_seconds:.2f}초")
+    print(f"   처리량: {total_commits / total_seconds:,.0f}커밋/초")
+    print("=" * 60)
+    return total_commits
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="여러 패턴/연도/저장소를 병렬로 생성")
+    parser.add_argument("manifest", help="작업 목록 JSON 파일")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="프로세스 수 (기본: CPU 코어 수)")
+    args = parser.parse_args()
+    run_batch(args.manifest, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+커밋 생성 벤치마크
+임시 저장소에서 고정 시드로 패턴 밀도(sparse/dense/saturated), 연도 수, 백엔드,
+payload 전략별로 generate_from_pattern을 실행하고 처리량과 저장소 크기를 측정합니다.
+
+케이스마다 별도 프로세스에서 실행하므로 최대 메모리(RSS)가 케이스별로 측정됩니다.
+결과는 JSON으로 저장하여 버전 사이의 성능 변화를 비교할 수 있습니다.
+
+    python3 benchmark.py --json before.json
+    python3 benchmark.py --json after.json --compare before.json
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from canvas_grid import CanvasGrid
+from generation_plan import COUNT_MODES, DEFAULT_COUNT_MODE
+from git_backends import BACKENDS, git_output
+from payloads import PAYLOADS
+from stamps import year_weeks
+
+# 밀도별 (칠할 칸 비율, 강도 범위)
+DENSITIES = {
+    "sparse": (0.05, (1, 2)),
+    "dense": (0.5, (1, 4)),
+    "saturated": (1.0, (4, 4)),
+}
+
+# 처리량이 이 비율 이상 떨어지면 비교 결과에 표시
+REGRESSION_THRESHOLD = 0.10
+
+
+def benchmark_grid(density, year, seed):
+    """밀도와 시드로 결정되는 연도 크기 그리드"""
+    ratio, (low, high) = DENSITIES[density]
+    rng = random.Random(f"{seed}:{density}:{year}")
+    grid = CanvasGrid(year_weeks(year), 7)
+    for index in range(grid.width * grid.height):
+        if rng.random() < ratio:
+            grid.set_index(index, rng.randint(low, high))
+    return grid
+
+
+def repo_footprint():
+    """현재 저장소의 (오브젝트 수, 디스크 크기 KiB) (생성 직후 상태 그대로)"""
+    stats = dict(line.split(": ", 1)
+                 for line in git_output(["count-objects", "-v"]).splitlines())
+    objects = int(stats["count"]) + int(stats["in-pack"])
+    size_kib = int(stats["size"]) + int(stats["size-pack"])
+    return objects, size_kib, int(stats["packs"])
+
+
+def run_case(case):
+    """케이스 하나를 임시 저장소에서 실행 (자식 프로세스에서 호출)"""
+    from git_generator import GitCommitGenerator
+
+    repo = tempfile.mkdtemp(prefix="canvas-bench-")
+    original_dir = os.getcwd()
+    try:
+        os.chdir(repo)
+        subprocess.run(["git", "init", "-q"], check=True)
+        subprocess.run(["git", "config", "user.name", "canvas"], check=True)
+        subprocess.run(["git", "config", "user.email", "canvas@example.com"], check=True)
+
+        grids = [(year, benchmark_grid(case["density"], year, case["seed"]))
+                 for year in range(case["year"], case["year"] + case["years"])]
+
+        commits = 0
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for year, grid in grids:
+                generator = GitCommitGenerator(year, case["mode"], case["payload"],
+                                               count_mode=case["counts"])
+                commits += generator.generate_from_pattern(None, case["seed"], grid=grid)
+        wall = time.perf_counter() - started
+
+        objects, size_kib, packs = repo_footprint()
+        # 리눅스의 ru_maxrss 단위는 KiB
+        self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return dict(case,
+                    commits=commits,
+                    wall_seconds=round(wall, 4),
+                    commits_per_second=round(commits / wall, 1) if wall else None,
+                    peak_rss_kib=self_rss,
+                    peak_child_rss_kib=child_rss,
+                    objects=objects,
+                    packs=packs,
+                    repo_kib=size_kib)
+    finally:
+        os.chdir(original_dir)
+        shutil.rmtree(repo, ignore_errors=True)
+
+
+def run_case_process(case):
+    """새 파이썬 프로세스에서 케이스 실행 (최대 RSS를 케이스별로 분리)"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run-case", json.dumps(case)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def case_key(result):
+    # counts가 없는 이전 결과는 random 방식으로 측정한 것
+    return (result["density"], result["mode"], result["payload"], result["years"],
+            result.get("counts", "random"))
+
+
+def environment():
+    """결과 비교에 필요한 실행 환경 정보"""
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    try:
+        revision = git_output(["rev-parse", "--short", "HEAD"], cwd=source_dir)
+    except (subprocess.CalledProcessError, OSError):
+        revision = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": revision,
+        "python": platform.python_version(),
+        "git": git_output(["--version"]).split()[-1],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def print_results(results, baseline=None):
+    """결과 표 출력 (baseline이 있으면 처리량 변화와 회귀 표시)"""
+    previous = {case_key(r): r for r in (baseline or {}).get("results", [])}
+
+    print("=" * 103)
+    print(f"{'밀도':<10}{'백엔드':<12}{'payload':<8}{'counts':<9}{'연도':>4}{'커밋':>8}{'시간':>9}"
+          f"{'커밋/초':>10}{'RSS':>9}{'오브젝트':>9}{'크기':>12}")
+    print("-" * 103)
+    regressions = 0
+    for r in results:
+        line = (f"{r['density']:<10}{r['mode']:<12}{r['payload']:<8}"
+                f"{r.get('counts', 'random'):<9}{r['years']:>4}"
+                f"{r['commits']:>8}{r['wall_seconds']:>8.2f}s{r['commits_per_second']:>10,.0f}"
+                f"{r['peak_rss_kib'] // 1024:>6} MB{r['objects']:>9}{r['repo_kib']:>8} KiB")
+        old = previous.get(case_key(r))
+        if old and old.get("commits_per_second"):
+            change = r["commits_per_second"] / old["commits_per_second"] - 1
+            line += f"  {change:+.0%}"
+            if change < -REGRESSION_THRESHOLD:
+                line += " ⚠️"
+                regressions += 1
+        print(line)
+    print("=" * 103)
+    if baseline is not None:
+        print(f"기준: {baseline['environment'].get('revision')} | 처리량 회귀: {regressions}건")
+    return regressions
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="커밋 생성 백엔드/저장소 크기 벤치마크")
+    parser.add_argument("--density", nargs="+", choices=list(DENSITIES), default=list(DENSITIES),
+                        help="패턴 밀도 (기본: 전부)")
+    parser.add_argument("--modes", nargs="+", choices=list(BACKENDS),
+                        default=["fast-import", "pack"],
+                        help="백엔드 (기본: fast-import pack, subprocess는 느려서 제외)")
+    parser.add_argument("--payloads", nargs="+", choices=list(PAYLOADS), default=["append"],
+                        help="payload 전략 (기본: append)")
+    parser.add_argument("--counts", nargs="+", choices=COUNT_MODES, default=[DEFAULT_COUNT_MODE],
+                        help=f"날짜별 커밋 수 결정 방식 (기본: {DEFAULT_COUNT_MODE})")
+    parser.add_argument("--years", nargs="+", type=int, default=[1],
+                        help="연속으로 생성할 연도 수 (기본: 1)")
+    parser.add_argument("--year", type=int, default=2024, help="시작 연도 (기본: 2024)")
+    parser.add_argument("--seed", type=int, default=0, help="패턴/커밋 시드 (기본: 0)")
+    parser.add_argument("--json", dest="output", default=None, help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--run-case", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return
+
+    cases = [
+        {"density": density, "mode": mode, "payload": payload, "years": years,
+         "counts": counts, "year": args.year, "seed": args.seed}
+        for density, years, mode, payload, counts in itertools.product(
+            args.density, args.years, args.modes, args.payloads, args.counts)
+    ]
+    results = []
+    for i, case in enumerate(cases, 1):
+        print(f"[{i}/{len(cases)}] {case['density']} / {case['mode']} / {case['payload']} / "
+              f"{case['counts']} / {case['years']}년 ...", file=sys.stderr)
+        results.append(run_case_process(case))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    regressions = print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"✓ 결과 저장: {args.output}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+bytearray 기반 잔디밭 그리드
+셀 하나를 1바이트(강도 0-4)로 저장하며, 주(열) 단위로 이어 붙여 저장합니다.
+index = week * height + day 이므로 높이가 7이면 index가 곧 시작일로부터의 일수입니다.
+"""
+
+import hashlib
+import re
+
+# 0이 아닌 바이트 (강도가 있는 칸)
+NONZERO = re.compile(rb"[^\x00]")
+
+
+class CanvasGrid:
+    """강도 그리드 (grid[day, week])
+
+    snapshot()은 버퍼를 공유하는 O(1) 복사본을 만들고, 어느 쪽이든 처음 수정할 때
+    버퍼를 복사합니다 (copy-on-write).
+    """
+
+    def __init__(self, width=52, height=7, data=None):
+        self.width = width
+        self.height = height
+        self._data = data if data is not None else bytearray(width * height)
+        self._shared = False
+
+    @classmethod
+    def from_list(cls, rows):
+        """JSON의 grid 목록(rows[day][week])에서 생성"""
+        height = len(rows)
+        width = len(rows[0]) if height > 0 else 0
+        grid = cls(width, height)
+        for day, row in enumerate(rows):
+            grid._data[day::height] = bytes(row)
+        return grid
+
+    def to_list(self):
+        """JSON의 grid 목록(rows[day][week])으로 변환"""
+        return [list(self._data[day::self.height]) for day in range(self.height)]
+
+    def _writable(self):
+        if self._shared:
+            self._data = bytearray(self._data)
+            self._shared = False
+        return self._data
+
+    def __getitem__(self, key):
+        day, week = key
+        return self._data[week * self.height + day]
+
+    def __setitem__(self, key, intensity):
+        day, week = key
+        self._writable()[week * self.height + day] = intensity
+
+    def index(self, day, week):
+        """(day, week) 칸의 버퍼 위치"""
+        return week * self.height + day
+
+    def get_index(self, index):
+        return self._data[index]
+
+    def set_index(self, index, intensity):
+        self._writable()[index] = intensity
+
+    def __eq__(self, other):
+        return (isinstance(other, CanvasGrid) and self.width == other.width
+                and self.height == other.height and self._data == other._data)
+
+    def __bytes__(self):
+        return bytes(self._data)
+
+    def row(self, day):
+        """요일 하나의 모든 주 강도"""
+        return self._data[day::self.height]
+
+    def column(self, week):
+        """주 하나의 모든 요일 강도"""
+        start = week * self.height
+        return self._data[start:start + self.height]
+
+    def columns(self, start, stop):
+        """start~stop 주 구간을 새 그리드로 잘라내기"""
+        data = self._data[start * self.height:stop * self.height]
+        return CanvasGrid(len(data) // self.height if self.height else 0, self.height, data)
+
+    def nonzero(self):
+        """(index, 강도)를 index 순서로 (강도 0인 칸은 건너뜀)"""
+        data = self._data
+        for match in NONZERO.finditer(data):
+            index = match.start()
+            yield index, data[index]
+
+    def snapshot(self):
+        """O(1) 복사본 (수정 시점에 버퍼 복사)"""
+        copy = CanvasGrid(self.width, self.height, self._data)
+        copy._shared = self._shared = True
+        return copy
+
+    def clear(self):
+        """모든 칸을 0으로"""
+        self._data = bytearray(self.width * self.height)
+        self._shared = False
+
+    def digest(self):
+        """그리드 내용의 해시"""
+        return hashlib.sha1(b"%d:%d:" % (self.width, self.height) + self._data).hexdigest()
+
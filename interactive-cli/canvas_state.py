@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+생성 상태 저장
+.git/canvas/ 아래에 생성 저널 등 작은 JSON 파일을 원자적으로 저장합니다.
+작업 디렉토리에는 아무것도 남기지 않습니다.
+"""
+
+import json
+import os
+
+from canvas_grid import CanvasGrid
+from git_objects import find_git_dir
+from pattern_store import load_grid
+
+JOURNAL_FILE = "journal.json"
+
+
+def generation_state_name(ref):
+    """브랜치별 생성 기록 파일 이름 (예: generated-refs-heads-main.json)"""
+    return "generated-" + ref.replace("/", "-") + ".json"
+
+
+def state_dir():
+    """현재 저장소의 상태 디렉토리 (.git/canvas)"""
+    _, git_dir = find_git_dir()
+    path = os.path.join(git_dir, "canvas")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def read_state(name):
+    """상태 파일 읽기 (없으면 None)"""
+    path = os.path.join(state_dir(), name)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_state(name, data):
+    """상태 파일을 임시 파일 + rename으로 원자적으로 쓰기"""
+    path = os.path.join(state_dir(), name)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class Journal:
+    """생성 진행 저널
+
+    시드, 계획 해시, 마지막으로 확정된 커밋 위치를 기록하여 중단된 생성을
+    같은 계획으로 이어서 진행할 수 있게 합니다.
+    """
+
+    def __init__(self, data, persist=True):
+        self.data = data
+        # False면 메모리에만 기록 (memory 백엔드)
+        self.persist = persist
+
+    @classmethod
+    def start(cls, plan, pattern_file, mode, payload, ref, base, start=0, grid=None,
+              persist=True):
+        """새 생성 시작 기록 (start: base 이전에 이미 있는 계획 내 커밋 수)
+
+        패턴 파일 없이 생성하면(에디터의 G) grid를 저널에 함께 기록합니다.
+        """
+        journal = cls({
+            "pattern": os.path.abspath(pattern_file) if pattern_file else None,
+            "year": plan.year,
+            "seed": plan.seed,
+            "plan": plan.digest(),
+            "reconcile": plan.reconciled,
+            "activity": plan.activity,
+            "tz": plan.tz,
+            "counts": plan.count_mode,
+            "history": plan.history,
+            "mode": mode,
+            "payload": payload,
+            "ref": ref,
+            "base": base,
+            "total": plan.total,
+            "start": start,
+            "done": start,
+            "head": base,
+            "status": "running",
+        }, persist)
+        if pattern_file is None and grid is not None:
+            journal.data["grid"] = grid.to_list()
+        journal.save()
+        return journal
+
+    @classmethod
+    def load(cls):
+        """저장된 저널 읽기 (없으면 None)"""
+        data = read_state(JOURNAL_FILE)
+        return cls(data) if data else None
+
+    def save(self):
+        if self.persist:
+            write_state(JOURNAL_FILE, self.data)
+
+    def grid(self):
+        """생성 중인 그리드 (패턴 파일 또는 저널에 기록한 그리드)"""
+        if self.data["pattern"] is None:
+            return CanvasGrid.from_list(self.data["grid"])
+        return load_grid(self.data["pattern"])
+
+    def update(self, done, head=None):
+        """done개의 커밋이 확정되었음을 기록 (head: 그 시점의 브랜치 끝)"""
+        self.data["done"] = done
+        self.data["head"] = head
+        self.save()
+
+    def finish(self, head=None):
+        self.data["status"] = "done"
+        self.update(self.data["total"], head)
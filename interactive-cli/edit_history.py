@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+에디터 실행 취소/다시 실행 기록
+편집을 (셀 index, 이전 값, 새 값) 델타 목록으로 저장합니다. 한 단계의 메모리와
+실행 취소 비용은 캔버스 크기가 아니라 그 단계에서 바뀐 셀 수에 비례합니다.
+"""
+
+from array import array
+
+
+class EditHistory:
+    """델타 기반 편집 기록
+
+    cells/old/new는 모든 단계의 델타를 이어 붙인 배열이고, starts[i]는 i번째 단계가
+    시작하는 위치입니다. 불러오기처럼 그리드 전체(크기 포함)가 바뀌는 단계는
+    델타 대신 copy-on-write 스냅샷 두 개를 체크포인트로 저장합니다.
+    """
+
+    def __init__(self, max_steps=100000):
+        self.max_steps = max_steps
+        self.cells = array('I')
+        self.old = bytearray()
+        self.new = bytearray()
+        self.starts = array('I')
+        self.replacements = {}   # 단계 번호 -> (이전 그리드, 새 그리드)
+        self.position = 0        # 실행 취소되지 않은 단계 수
+        self.pending = 0         # 아직 단계로 묶이지 않은 델타 수
+
+    def record(self, index, old, new):
+        """셀 하나의 변경 기록 (commit 전까지 같은 단계로 묶임)"""
+        if old == new:
+            return
+        if self.pending == 0:
+            self._truncate_redo()
+        self.cells.append(index)
+        self.old.append(old)
+        self.new.append(new)
+        self.pending += 1
+
+    def record_replace(self, before, after):
+        """그리드 전체 교체 기록 (스냅샷 두 개를 단계 하나로 저장)"""
+        self.commit()
+        self._truncate_redo()
+        self.replacements[len(self.starts)] = (before, after)
+        self.starts.append(len(self.cells))
+        self.position = len(self.starts)
+        self._trim()
+
+    def commit(self):
+        """기록 중인 델타를 하나의 단계로 확정"""
+        if self.pending == 0:
+            return
+        self.starts.append(len(self.cells) - self.pending)
+        self.pending = 0
+        self.position = len(self.starts)
+        self._trim()
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < len(self.starts)
+
+    def undo(self, grid):
+        """마지막 단계 되돌리기
+
+        델타는 grid에 직접 적용하고 (그리드, 바뀐 셀 index 목록)을 반환합니다.
+        그리드 전체가 교체된 단계면 이전 스냅샷과 None을 반환합니다.
+        """
+        self.commit()
+        if not self.can_undo():
+            return grid, []
+        self.position -= 1
+        step = self.position
+        if step in self.replacements:
+            return self.replacements[step][0].snapshot(), None
+        start, end = self._bounds(step)
+        for i in range(end - 1, start - 1, -1):
+            grid.set_index(self.cells[i], self.old[i])
+        return grid, self.cells[start:end]
+
+    def redo(self, grid):
+        """되돌린 단계 다시 적용 (반환값은 undo와 같음)"""
+        self.commit()
+        if not self.can_redo():
+            return grid, []
+        step = self.position
+        self.position += 1
+        if step in self.replacements:
+            return self.replacements[step][1].snapshot(), None
+        start, end = self._bounds(step)
+        for i in range(start, end):
+            grid.set_index(self.cells[i], self.new[i])
+        return grid, self.cells[start:end]
+
+    def _bounds(self, step):
+        start = self.starts[step]
+        end = self.starts[step + 1] if step + 1 < len(self.starts) else len(self.cells)
+        return start, end
+
+    def _truncate_redo(self):
+        """새 편집이 시작되면 다시 실행할 단계들을 버림"""
+        if self.position == len(self.starts):
+            return
+        cut = self.starts[self.position]
+        del self.cells[cut:]
+        del self.old[cut:]
+        del self.new[cut:]
+        del self.starts[self.position:]
+        for step in [s for s in self.replacements if s >= self.position]:
+            del self.replacements[step]
+
+    def _trim(self):
+        """단계가 max_steps를 넘으면 오래된 절반을 한 번에 버림 (분할 상환 O(1))"""
+        if len(self.starts) <= self.max_steps:
+            return
+        drop = len(self.starts) // 2
+        cut = self.starts[drop]
+        del self.cells[:cut]
+        del self.old[:cut]
+        del self.new[:cut]
+        self.starts = array('I', (start - cut for start in self.starts[drop:]))
+        self.replacements = {step - drop: grids for step, grids in self.replacements.items()
+                             if step >= drop}
+        self.position -= drop
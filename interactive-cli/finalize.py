@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+생성 후 저장소 정리 (finalize)
+생성 직후의 저장소에는 느슨한(loose) 오브젝트나 델타 압축되지 않은 팩이 많아서,
+git push가 오브젝트를 세고 압축하는 데 오래 걸립니다. 생성이 끝난 뒤 델타 탐색 범위를
+넓혀 한 번 repack해 두면 push는 만들어 둔 델타를 그대로 재사용합니다.
+
+정리 전후의 느슨한 오브젝트 수, 팩 크기와 함께, push할 때 실제로 보낼 팩을
+git pack-objects로 만들어 보아 예상 전송 크기와 준비 시간을 비교합니다.
+"""
+
+import struct
+import subprocess
+import time
+from collections import namedtuple
+
+from git_backends import git_output
+from progress import SUBPHASE
+
+# 델타 탐색 범위와 최대 델타 체인 길이 (git gc --aggressive와 같은 값)
+# 커밋마다 payload 파일이 조금씩 바뀌므로 넓게 찾을수록 직전 버전을 델타 기준으로 찾기 쉬움
+DELTA_WINDOW = 250
+DELTA_DEPTH = 50
+
+# loose: 느슨한 오브젝트 수, loose_kib: 그 크기, packs: 팩 수, pack_kib: 팩 크기,
+# push_bytes/push_objects: push할 때 보낼 팩의 크기와 오브젝트 수, push_seconds: 그 팩을 만드는 시간
+RepositoryStats = namedtuple(
+    "RepositoryStats", "loose loose_kib packs pack_kib push_bytes push_objects push_seconds")
+
+
+def object_counts():
+    """git count-objects -v 결과를 {항목: 정수}로"""
+    output = git_output(["count-objects", "-v"])
+    return {key: int(value) for key, value in
+            (line.split(": ", 1) for line in output.splitlines()) if value.isdigit()}
+
+
+def push_estimate(ref):
+    """ref를 push할 때 보낼 팩의 (크기 바이트, 오브젝트 수, 만드는 데 걸린 초)
+
+    리모트 추적 브랜치(refs/remotes/)에 이미 있는 커밋은 보내지 않는 것으로 계산합니다.
+    """
+    remotes = git_output(["for-each-ref", "--format=%(objectname)", "refs/remotes"]).split()
+    revisions = "\n".join([ref] + [f"^{sha}" for sha in remotes]) + "\n"
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        ["git", "pack-objects", "--revs", "--stdout", "--thin", "--delta-base-offset", "-q"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE
+    )
+    process.stdin.write(revisions.encode())
+    process.stdin.close()
+    # 팩은 버리고 크기만 셈 (헤더의 12바이트 중 8~12바이트가 오브젝트 수)
+    header = process.stdout.read(12)
+    size = len(header)
+    while True:
+        chunk = process.stdout.read(1 << 20)
+        if not chunk:
+            break
+        size += len(chunk)
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, "git pack-objects")
+    objects = struct.unpack(">I", header[8:12])[0] if len(header) == 12 else 0
+    return size, objects, time.perf_counter() - started
+
+
+def repository_stats(ref):
+    """현재 저장소의 오브젝트/팩 상태와 ref의 예상 push 크기"""
+    counts = object_counts()
+    push_bytes, push_objects, push_seconds = push_estimate(ref)
+    return RepositoryStats(counts["count"], counts["size"], counts["packs"], counts["size-pack"],
+                           push_bytes, push_objects, push_seconds)
+
+
+def repack(window=DELTA_WINDOW, depth=DELTA_DEPTH):
+    """모든 오브젝트를 팩 하나로 모으며 델타 압축 (느슨한 오브젝트는 지움)
+
+    이미 델타로 저장된 오브젝트는 재사용하고, 생성된 (델타가 없는) 오브젝트만
+    window/depth 설정으로 새로 델타를 찾습니다.
+    """
+    subprocess.run(["git", "repack", "-a", "-d", "-q", f"--window={window}",
+                    f"--depth={depth}"], check=True)
+
+
+def finalize(ref, timer):
+    """정리 전 상태 측정 → repack → 정리 후 상태 측정
+
+    반환값: (정리 전 RepositoryStats, 정리 후 RepositoryStats, repack에 걸린 초)
+    """
+    with timer.phase("정리"):
+        with timer.phase("정리" + SUBPHASE + "정리 전 측정"):
+            before = repository_stats(ref)
+        started = time.perf_counter()
+        with timer.phase("정리" + SUBPHASE + "repack"):
+            repack()
+        elapsed = time.perf_counter() - started
+        with timer.phase("정리" + SUBPHASE + "정리 후 측정"):
+            after = repository_stats(ref)
+    return before, after, elapsed
+
+
+def print_report(before, after, elapsed):
+    """정리 전후 비교표 출력"""
+    print()
+    print(f"📦 저장소 정리 (repack --window={DELTA_WINDOW} --depth={DELTA_DEPTH}, "
+          f"{elapsed:.2f}초)")
+    print("-" * 72)
+    print(f"{'':<10}{'loose 오브젝트':>14}{'팩':>6}{'팩 크기':>14}{'예상 push 크기':>16}"
+          f"{'push 준비':>10}")
+    for label, stats in (("정리 전", before), ("정리 후", after)):
+        print(f"{label:<10}{stats.loose:>14}{stats.packs:>7}{stats.pack_kib:>11} KiB"
+              f"{stats.push_bytes / 1024:>13.0f} KiB{stats.push_seconds:>9.2f}s")
+    print("-" * 72)
+    print(f"push할 오브젝트: {after.push_objects}개 (리모트 추적 브랜치에 있는 커밋 제외)")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+커밋 생성 계획
+패턴 + 연도를 (날짜, 커밋 수) 배열로 컴파일하고, 실행기는 커밋 레코드를
+제너레이터로 하나씩 받아 처리합니다. 커밋 시각은 스케줄러가 계획 전체를 한 번에
+정수 배열(커밋당 4~8바이트)로 만들고, datetime은 레코드를 꺼낼 때만 만듭니다.
+"""
+
+import hashlib
+import random
+from array import array
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from canvas_grid import CanvasGrid
+from git_objects import MAX_DELTA_DEPTH
+from intensity_solver import solve
+from scheduler import (
+    DEFAULT_PROFILE, SCHEDULE_VERSION, CommitScheduler, make_tzinfo, year_calendar,
+)
+
+# 커밋 하나 (index: 계획 내 0부터 시작하는 순번)
+CommitRecord = namedtuple("CommitRecord", "index date message")
+
+# 날짜별 커밋 수를 정하는 방식
+# random: 강도별 고정 범위에서 무작위 (INTENSITY_RANGES)
+# minimal: 하루 최대 커밋 수(peak) 비율로 근사한 최소 커밋 수 (기존 히스토리 반영, --counts minimal로 선택)
+COUNT_MODES = ("random", "minimal")
+DEFAULT_COUNT_MODE = "random"
+
+# 강도별 하루 커밋 수 범위 (random 방식)
+INTENSITY_RANGES = {
+    1: (1, 3),
+    2: (4, 7),
+    3: (8, 12),
+    4: (13, 20),
+}
+
+# 백엔드별 대략적인 처리량 (커밋/초, 추정치)
+BACKEND_RATES = {
+    "subprocess": 150,
+    "fast-import": 5000,
+    "pack": 30000,
+    "memory": 35000,
+}
+
+# 백엔드별 커밋당 커밋+트리 오브젝트 크기 (바이트, 추정치)
+# subprocess는 오브젝트마다 따로 압축한 느슨한 오브젝트라 팩보다 훨씬 큼 (gc 전)
+COMMIT_BYTES = {
+    "subprocess": 660,
+    "fast-import": 210,
+    "pack": 170,
+    "memory": 170,
+}
+
+# 델타로 저장할 때 payload 전략별 커밋당 blob 크기 (바이트, 추정치)
+PAYLOAD_BYTES = {
+    "empty": 0,
+    "rotate": 190,
+    "append": 230,
+}
+
+# payload 한 줄 길이, rotate가 유지하는 줄 수, 텍스트 blob의 zlib 압축률 (추정치)
+PAYLOAD_LINE_BYTES = 30
+ROTATE_LINES = 64
+BLOB_COMPRESSION = 0.21
+
+
+def estimate_object_bytes(commits, mode, payload):
+    """커밋 commits개를 만들 때 저장소에 쌓이는 오브젝트 크기 추정 (바이트)
+
+    subprocess는 blob을 델타 없이 통째로 압축하므로 append는 커밋마다 파일 전체가
+    다시 저장되어 N²/2 × 줄 길이에 비례합니다. 나머지 백엔드는 직전 blob에 대한
+    델타로 저장하지만 MAX_DELTA_DEPTH개마다 한 번은 전체 blob을 저장합니다.
+    """
+    size = commits * COMMIT_BYTES.get(mode, COMMIT_BYTES["subprocess"])
+    if payload == "empty":
+        return size
+    if payload == "rotate":
+        full = min(commits, ROTATE_LINES) * PAYLOAD_LINE_BYTES * BLOB_COMPRESSION
+        if mode == "subprocess":
+            return size + commits * full
+        return size + commits * (PAYLOAD_BYTES["rotate"] + full / MAX_DELTA_DEPTH)
+    # append: 전체 blob 크기의 합 = N²/2 × 줄 길이
+    full = commits * commits / 2 * PAYLOAD_LINE_BYTES * BLOB_COMPRESSION
+    if mode == "subprocess":
+        return size + full
+    return size + commits * PAYLOAD_BYTES["append"] + full / MAX_DELTA_DEPTH
+
+
+def intensity_to_commits(intensity, rng=random):
+    """강도를 커밋 개수로 변환"""
+    if intensity == 0:
+        return 0
+    return rng.randint(*INTENSITY_RANGES[min(intensity, 4)])
+
+
+class GenerationPlan:
+    """컴파일된 커밋 생성 계획
+
+    days/counts/intensities는 날짜 순서로 정렬된 작은 배열입니다. 커밋 수와 시각은
+    시드로 만든 난수를 날짜 순서로 소비하므로, 같은 패턴/시드/프로필이면 항상 같은
+    히스토리가 되고 앞쪽 날짜가 같으면 그 날짜들의 커밋도 같습니다.
+
+    minimal 방식의 counts는 기존 히스토리에 더해 만들 커밋 수이며, 기존 커밋만으로
+    원하는 단계가 되는 날짜는 계획에서 빠집니다.
+    """
+
+    def __init__(self, year, seed, days, counts, intensities, prefix="Canvas",
+                 activity=DEFAULT_PROFILE, tz=None, count_mode="random"):
+        self.year = year
+        self.seed = seed
+        self.days = days                # array('l'): 날짜 ordinal
+        self.counts = counts            # array('H'): 날짜별 커밋 수
+        self.intensities = intensities  # bytearray: 날짜별 강도
+        self.prefix = prefix
+        self.activity = activity        # 활동 프로필 이름 (또는 JSON 파일 경로)
+        self.tz = tz                    # 시간대 오프셋 (분, None이면 로컬 시간대)
+        self.count_mode = count_mode    # 커밋 수 결정 방식 (COUNT_MODES)
+        # minimal 방식: 연도의 하루 최대 커밋 수, 4단계 칸이 없어 올린 단계 수
+        self.peak = None
+        self.shift = 0
+        # minimal 방식에서 기존 커밋 수를 센 커밋 (없으면 None)
+        self.history = None
+        self.total = sum(counts)
+        # 기존 히스토리와 대조하여 부족분만 남긴 계획인지 여부
+        self.reconciled = False
+        self._seconds = None
+
+    @classmethod
+    def compile(cls, grid, year, seed=None, prefix="Canvas", activity=DEFAULT_PROFILE, tz=None,
+                count_mode="random", existing=None):
+        """패턴 그리드(CanvasGrid 또는 grid[day][week] 목록)와 연도로 계획 생성
+
+        existing: 이미 있는 날짜별 커밋 수 (ordinal -> 개수, minimal 방식에서 사용)
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        if not isinstance(grid, CanvasGrid):
+            grid = CanvasGrid.from_list(grid)
+        calendar = year_calendar(year)
+        rng = random.Random(f"{seed}:count")
+
+        days = array('l')
+        counts = array('H')
+        intensities = bytearray()
+        # 그리드는 주 단위로 저장되어 있어 index 순서가 곧 날짜 순서
+        for index, intensity in grid.nonzero():
+            week, day = divmod(index, grid.height)
+            cell = week * 7 + day
+            # 연도 범위 확인 (표에서 연도 밖의 칸은 0)
+            if day >= 7 or cell >= len(calendar) or not calendar[cell]:
+                continue
+            days.append(calendar[cell])
+            counts.append(intensity_to_commits(intensity, rng))
+            intensities.append(intensity)
+
+        plan = cls(year, seed, days, counts, intensities, prefix, activity, tz, count_mode)
+        if count_mode == "minimal":
+            plan.solve_counts(existing or {})
+        return plan
+
+    def solve_counts(self, existing):
+        """날짜별 커밋 수를 peak 비율 근사(intensity_solver)로 구한 최소값으로 바꿈 (기존 커밋 수를 빼고 남김)"""
+        calendar = year_calendar(self.year)
+        painted = set(self.days)
+        others_peak = max([existing.get(ordinal, 0) for ordinal in calendar
+                           if ordinal and ordinal not in painted] + [0])
+        solution = solve([(existing.get(ordinal, 0), intensity)
+                          for ordinal, intensity in zip(self.days, self.intensities)],
+                         others_peak)
+
+        days = array('l')
+        counts = array('H')
+        intensities = bytearray()
+        for ordinal, intensity, final in zip(self.days, self.intensities, solution.counts):
+            need = final - existing.get(ordinal, 0)
+            if need > 0:
+                days.append(ordinal)
+                counts.append(need)
+                intensities.append(intensity)
+        self.days, self.counts, self.intensities = days, counts, intensities
+        self.total = sum(counts)
+        self.peak = solution.peak
+        self.shift = solution.shift
+
+    def __len__(self):
+        return self.total
+
+    def digest(self):
+        """계획 내용의 해시 (같은 패턴/연도/시드면 같은 값)"""
+        h = hashlib.sha1()
+        h.update(f"{self.year}:{self.seed}:{self.prefix}:{self.reconciled}:"
+                 f"{SCHEDULE_VERSION}:{self.activity}:{self.tz}:{self.count_mode}:".encode())
+        h.update(self.days.tobytes())
+        h.update(self.counts.tobytes())
+        h.update(bytes(self.intensities))
+        return h.hexdigest()
+
+    def commit_seconds(self):
+        """커밋마다 그날 0시부터의 초 (계획 전체를 한 번에 만들어 캐시)"""
+        if self._seconds is None:
+            scheduler = CommitScheduler(self.seed, self.activity)
+            self._seconds = scheduler.schedule(self.days, self.counts)
+        return self._seconds
+
+    def records(self, start=0):
+        """start번째 커밋부터 CommitRecord를 순서대로 생성 (시각은 엄격히 증가)"""
+        seconds = self.commit_seconds()
+        tzinfo = make_tzinfo(self.tz)
+        index = 0
+        for ordinal, count in zip(self.days, self.counts):
+            if index + count <= start:
+                index += count
+                continue
+            base = datetime.fromordinal(ordinal).replace(tzinfo=tzinfo)
+            for i in range(max(start - index, 0), count):
+                commit_date = base + timedelta(seconds=seconds[index + i])
+                yield CommitRecord(index + i, commit_date, f"{self.prefix} commit {index + i + 1}")
+            index += count
+
+    def reconcile(self, existing):
+        """이미 있는 날짜별 커밋 수(existing: ordinal -> 개수)를 빼고 부족한 만큼만 남긴 계획
+
+        (새 계획, 이미 목표를 채운 날짜 목록 [(ordinal, 목표, 기존)]) 반환
+        """
+        days = array('l')
+        counts = array('H')
+        intensities = bytearray()
+        satisfied = []
+        for ordinal, count, intensity in zip(self.days, self.counts, self.intensities):
+            have = existing.get(ordinal, 0)
+            if have >= count:
+                satisfied.append((ordinal, count, have))
+                continue
+            days.append(ordinal)
+            counts.append(count - have)
+            intensities.append(intensity)
+
+        plan = GenerationPlan(self.year, self.seed, days, counts, intensities, self.prefix,
+                              self.activity, self.tz, self.count_mode)
+        plan.reconciled = True
+        return plan, satisfied
+
+    def estimate(self, mode, payload):
+        """예상 비용: 커밋 수, 소요 시간(초), 오브젝트 크기(바이트, 백엔드별)"""
+        return {
+            "commits": self.total,
+            "days": len(self.days),
+            "seconds": self.total / BACKEND_RATES.get(mode, BACKEND_RATES["subprocess"]),
+            "pack_bytes": estimate_object_bytes(self.total, mode, payload),
+        }
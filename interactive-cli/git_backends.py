@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""
+Git 커밋 백엔드
+커밋을 실제로 기록하는 방법(git 프로세스 호출 방식)을 분리합니다.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import datetime
+
+from git_objects import (
+    OBJ_BLOB, OBJ_COMMIT, OBJ_TREE, ObjectStore, PackWriter, TreeTemplate,
+    commit_object, find_git_dir, read_identity,
+)
+from memory_repo import MemoryRepository
+from progress import SUBPHASE, PhaseTimer, installed_hooks, spawn_cost
+
+
+def git_output(args, cwd=None):
+    """git 명령을 실행하고 표준 출력을 문자열로 반환"""
+    result = subprocess.run(
+        ["git"] + args,
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    return result.stdout.strip()
+
+
+def current_branch_ref(cwd=None):
+    """현재 체크아웃된 브랜치의 ref 반환 (예: refs/heads/main)"""
+    return git_output(["symbolic-ref", "-q", "HEAD"], cwd=cwd)
+
+
+def full_ref(name):
+    """브랜치 이름을 전체 ref 이름으로 (예: canvas -> refs/heads/canvas)"""
+    return name if name.startswith("refs/") else f"refs/heads/{name}"
+
+
+def worktree_ref(cwd=None):
+    """작업 디렉토리에 체크아웃된 브랜치 ref (bare 저장소나 detached HEAD면 None)"""
+    if git_output(["rev-parse", "--is-bare-repository"], cwd=cwd) == "true":
+        return None
+    try:
+        return current_branch_ref(cwd)
+    except subprocess.CalledProcessError:
+        return None
+
+
+def resolve_commit(ref, cwd=None):
+    """ref가 가리키는 커밋 해시 반환 (없으면 None)"""
+    result = subprocess.run(
+        ["git", "rev-parse", "-q", "--verify", f"{ref}^{{commit}}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def read_day_counts(ref="HEAD", cwd=None):
+    """히스토리의 작성일(author date)을 한 번의 git log 스트림으로 읽어 날짜별 커밋 수 반환
+
+    반환값: {날짜 ordinal: 커밋 수}
+    """
+    counts = {}
+    process = subprocess.Popen(
+        ["git", "log", "--format=%ad", "--date=short", ref],
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    for line in process.stdout:
+        day = line.rstrip("\n")
+        counts[day] = counts.get(day, 0) + 1
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, "git log")
+    return {datetime.date.fromisoformat(day).toordinal(): count for day, count in counts.items()}
+
+
+def git_output_env(args, env):
+    """환경 변수를 지정해 git 명령을 실행하고 표준 출력을 문자열로 반환"""
+    result = subprocess.run(["git"] + args, env=env, check=True, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def raw_git_date(date):
+    """datetime을 git raw 날짜 형식 '<epoch> <+hhmm>'으로 변환
+
+    시간대가 없는 datetime은 로컬 시각으로 봅니다.
+    """
+    if date.tzinfo is not None:
+        epoch = int(date.timestamp())
+        offset = int(date.utcoffset().total_seconds()) // 60
+    else:
+        epoch = int(time.mktime(date.timetuple()))
+        offset = time.localtime(epoch).tm_gmtoff // 60
+    sign = '+' if offset >= 0 else '-'
+    offset = abs(offset)
+    return f"{epoch} {sign}{offset // 60:02d}{offset % 60:02d}"
+
+
+class CommitBackend:
+    """커밋 백엔드 기본 클래스"""
+
+    name = None
+    # 몇 커밋마다 checkpoint()로 브랜치에 확정할지 (0이면 finish에서만)
+    checkpoint_interval = 0
+    # 실제 저장소에 기록하는지 (아니면 저널, 실행 기록, 생성 기록을 남기지 않음)
+    persistent = True
+
+    def __init__(self, payload_file, ref=None):
+        self.payload_file = payload_file
+        # 커밋을 쌓을 ref (None이면 체크아웃된 브랜치)
+        self.target = full_ref(ref) if ref else None
+        self.ref = None
+        self.base = None
+        # 대상 ref가 체크아웃되어 있어 작업 디렉토리와 인덱스를 맞춰야 하는지
+        self.worktree = True
+        # git 없이 오브젝트/ref를 읽는 저장소 (필요할 때 엶)
+        self.store = None
+        # 단계별 시간 측정 (--profile일 때 생성기가 켜진 타이머로 바꿈)
+        self.timer = PhaseTimer()
+
+    def begin(self):
+        """커밋 생성 시작 전 준비 (self.ref, self.base 설정)"""
+
+    def resolve(self, ref):
+        """ref가 가리키는 커밋 해시 (없으면 None)"""
+        return resolve_commit(ref)
+
+    def day_counts(self, commit):
+        """commit까지의 히스토리의 날짜별 커밋 수 ({날짜 ordinal: 커밋 수})"""
+        return read_day_counts(commit)
+
+    def write_ref(self, ref, commit):
+        """ref를 commit(해시 문자열)으로 갱신 (실행 기록 ref 등)"""
+        subprocess.run(["git", "update-ref", ref, commit], check=True)
+
+    def _object_store(self):
+        """begin 전(계획 컴파일, 실행 기록)에도 git 없이 ref를 읽고 쓸 수 있도록 저장소 열기"""
+        if self.store is None:
+            self.store = ObjectStore(find_git_dir()[1])
+        return self.store
+
+    def payload_path(self):
+        """저장소 루트 기준 payload 파일 경로"""
+        root, _ = find_git_dir()
+        prefix = os.path.relpath(os.getcwd(), root).replace(os.sep, "/") if root else "."
+        return self.payload_file if prefix == "." else f"{prefix}/{self.payload_file}"
+
+    def initial_payload(self):
+        """begin 후 payload 전략이 이어 쓸 초기 내용 (None이면 작업 디렉토리의 파일)
+
+        체크아웃되지 않은 ref나 bare 저장소는 작업 디렉토리의 파일이 대상 브랜치와 무관하므로
+        시작 커밋(base)의 payload 블롭에서 시작합니다 (파일이 없으면 빈 내용).
+        """
+        if self.worktree:
+            return None
+        if not self.base:
+            return b""
+        return self._object_store().read_path(bytes.fromhex(self.base), self.payload_path()) or b""
+
+    def _select_ref(self):
+        """대상 ref와 시작 커밋을 정하고 작업 디렉토리를 건드려도 되는지 확인"""
+        checked_out = worktree_ref()
+        try:
+            # bare 저장소는 HEAD가 가리키는 브랜치가 기본 대상
+            self.ref = self.target or current_branch_ref()
+        except subprocess.CalledProcessError:
+            raise ValueError("HEAD가 브랜치를 가리키지 않습니다. --ref로 대상 브랜치를 지정하세요.")
+        self.base = resolve_commit(self.ref)
+        # 체크아웃되지 않은 ref나 bare 저장소에서는 작업 디렉토리와 인덱스를 그대로 둠
+        self.worktree = self.ref == checked_out
+
+    def commit(self, date, message, content):
+        """date 시각으로 커밋 생성
+
+        content는 payload 파일의 새 내용이며, None이면 트리를 바꾸지 않습니다.
+        """
+        raise NotImplementedError
+
+    def checkpoint(self):
+        """지금까지의 커밋을 브랜치에 확정하고 브랜치 끝 커밋 해시 반환 (모르면 None)"""
+        return None
+
+    def finish(self):
+        """커밋 생성 마무리 (브랜치 갱신 등)"""
+
+    def abort(self):
+        """중단 시 정리 (확정되지 않은 커밋은 버림)"""
+
+    def _sync_worktree(self):
+        """체크아웃된 브랜치를 직접 갱신한 뒤 작업 디렉토리와 인덱스를 새 HEAD에 맞춤"""
+        if self.content is None or not self.worktree:
+            return
+        with open(self.payload_file, "wb") as f:
+            f.write(self.content)
+        # 인덱스 갱신은 git이 있을 때만 (없으면 작업 디렉토리 파일만 맞춤)
+        if shutil.which("git"):
+            subprocess.run(["git", "add", self.payload_file], check=True)
+
+
+class SubprocessBackend(CommitBackend):
+    """커밋마다 git add / git commit 프로세스를 실행하는 기존 방식
+
+    대상 ref가 체크아웃되어 있지 않으면(bare 저장소 포함) 임시 인덱스 파일에서
+    hash-object / update-index / write-tree / commit-tree로 커밋을 만들고 update-ref로
+    ref만 옮기므로, 작업 디렉토리와 저장소의 인덱스는 건드리지 않습니다.
+    """
+
+    name = "subprocess"
+    # 커밋마다 브랜치가 바로 갱신됨
+    checkpoint_interval = 1
+
+    def begin(self):
+        self._select_ref()
+        self.env = os.environ.copy()
+        self.index_file = None
+        if not self.worktree:
+            self._begin_private_index()
+
+        if self.timer.enabled:
+            # 훅 실행 시간은 git commit 안에 포함되므로 어떤 훅이 있는지 함께 보여줌
+            hooks = installed_hooks()
+            self.timer.note(f"설치된 훅: {', '.join(hooks)} (git commit 시간에 포함)"
+                            if hooks else "설치된 훅 없음")
+            self.timer.note(f"git 프로세스 1회 실행 비용 약 {spawn_cost() * 1000:.1f}ms "
+                            "(git --version 기준, 커밋마다 최대 2회 실행)")
+
+    def _begin_private_index(self):
+        """대상 ref의 트리를 읽은 임시 인덱스 준비"""
+        git_dir = git_output(["rev-parse", "--absolute-git-dir"])
+        fd, self.index_file = tempfile.mkstemp(prefix="canvas-index-", dir=git_dir)
+        os.close(fd)
+        os.remove(self.index_file)
+        self.env["GIT_INDEX_FILE"] = self.index_file
+        subprocess.run(["git", "read-tree"] + ([self.base] if self.base else ["--empty"]),
+                       env=self.env, check=True)
+        # 작업 디렉토리가 없으므로 payload는 저장소 루트 기준 경로
+        prefix = "" if git_output(["rev-parse", "--is-bare-repository"]) == "true" \
+            else git_output(["rev-parse", "--show-prefix"])
+        self.path = prefix + self.payload_file
+        self.tip = self.base
+
+    def _commit_tree(self, message, content):
+        """임시 인덱스로 트리를 만들어 커밋하고 ref를 옮김"""
+        timer = self.timer
+        if content is not None:
+            with timer.phase("커밋" + SUBPHASE + "git hash-object / update-index"):
+                blob = subprocess.run(["git", "hash-object", "-w", "--stdin"], input=content,
+                                      check=True, capture_output=True).stdout.decode().strip()
+                subprocess.run(["git", "update-index", "--add", "--cacheinfo",
+                                f"100644,{blob},{self.path}"], env=self.env, check=True)
+        with timer.phase("커밋" + SUBPHASE + "git write-tree / commit-tree"):
+            tree = git_output_env(["write-tree"], self.env)
+            parents = ["-p", self.tip] if self.tip else []
+            tip = git_output_env(["commit-tree", tree] + parents + ["-m", message], self.env)
+        with timer.phase("커밋" + SUBPHASE + "git update-ref"):
+            # 다른 곳에서 ref를 옮겼으면 실패하도록 이전 값을 함께 넘김
+            subprocess.run(["git", "update-ref", self.ref, tip, self.tip or ""], check=True)
+        self.tip = tip
+
+    def commit(self, date, message, content):
+        # 시간대가 있으면 오프셋도 함께 전달 (예: 2024-03-01 10:00:00 +0900)
+        date_str = date.strftime("%Y-%m-%d %H:%M:%S %z").rstrip()
+        timer = self.timer
+        if self.index_file:
+            self.env["GIT_AUTHOR_DATE"] = date_str
+            self.env["GIT_COMMITTER_DATE"] = date_str
+            self._commit_tree(message, content)
+            return
+
+        command = ["git", "commit", "--allow-empty", "-m", message]
+        if content is not None:
+            # 더미 파일 생성/수정
+            with timer.phase("커밋" + SUBPHASE + "payload 파일 쓰기"):
+                with open(self.payload_file, "wb") as f:
+                    f.write(content)
+
+            # git add
+            with timer.phase("커밋" + SUBPHASE + "git add"):
+                subprocess.run(["git", "add", self.payload_file], check=True)
+            command = ["git", "commit", "-m", message]
+
+        # git commit with custom date
+        self.env["GIT_AUTHOR_DATE"] = date_str
+        self.env["GIT_COMMITTER_DATE"] = date_str
+        with timer.phase("커밋" + SUBPHASE + "git commit (훅 포함)"):
+            subprocess.run(
+                command,
+                env=self.env,
+                check=True,
+                capture_output=True
+            )
+
+    def finish(self):
+        self._remove_index()
+
+    def abort(self):
+        self._remove_index()
+
+    def _remove_index(self):
+        if self.index_file and os.path.exists(self.index_file):
+            os.remove(self.index_file)
+        self.index_file = None
+
+
+class FastImportBackend(CommitBackend):
+    """모든 커밋을 하나의 git fast-import 스트림으로 전송하는 방식
+
+    브랜치 ref는 스트림이 끝날 때 한 번만 갱신됩니다.
+    """
+
+    name = "fast-import"
+    checkpoint_interval = 1000
+
+    def begin(self):
+        self._select_ref()
+        bare = git_output(["rev-parse", "--is-bare-repository"]) == "true"
+        self.path = ("" if bare else git_output(["rev-parse", "--show-prefix"])) + self.payload_file
+
+        # 작성자 정보 ("이름 <이메일> 시각 시간대"에서 이름과 이메일만 사용)
+        ident = git_output(["var", "GIT_COMMITTER_IDENT"])
+        self.ident = ident.rsplit(' ', 2)[0]
+
+        self.content = None
+        self.process = subprocess.Popen(
+            ["git", "fast-import", "--quiet", "--date-format=raw"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=1 << 16
+        )
+        self.stream = self.process.stdin
+        self.first = True
+        self.checkpoints = 0
+
+    def _data(self, payload):
+        self.stream.write(b"data %d\n" % len(payload))
+        self.stream.write(payload)
+        self.stream.write(b"\n")
+
+    def commit(self, date, message, content):
+        when = raw_git_date(date)
+        header = (
+            f"commit {self.ref}\n"
+            f"author {self.ident} {when}\n"
+            f"committer {self.ident} {when}\n"
+        )
+        self.stream.write(header.encode())
+        self._data(message.encode() + b"\n")
+        if self.first and self.base:
+            self.stream.write(f"from {self.base}\n".encode())
+        self.first = False
+        if content is not None:
+            self.content = content
+            self.stream.write(f"M 100644 inline {self.path}\n".encode())
+            self._data(content)
+
+    def checkpoint(self):
+        if self.first:
+            return self.base
+        # checkpoint는 비동기로 처리되므로 progress 응답을 받을 때까지 기다림
+        self.checkpoints += 1
+        marker = f"progress checkpoint {self.checkpoints}\n"
+        self.stream.write(b"checkpoint\n" + marker.encode())
+        self.stream.flush()
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise subprocess.CalledProcessError(self.process.wait(), "git fast-import")
+            if line.decode() == marker:
+                break
+        self._sync_worktree()
+        return resolve_commit(self.ref)
+
+    def finish(self):
+        self.stream.write(b"done\n")
+        self.stream.close()
+        self.process.stdout.read()
+        returncode = self.process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, "git fast-import")
+
+        if self.first:
+            return
+
+        self._sync_worktree()
+
+    def abort(self):
+        # 확정되지 않은 스트림은 fast-import를 종료시켜 버림
+        self.process.kill()
+        self.process.wait()
+
+
+class PackBackend(CommitBackend):
+    """git 실행 파일 없이 오브젝트를 직접 해시/압축하여 팩파일 하나로 쓰는 방식
+
+    블롭, 트리, 커밋을 모두 Python에서 만들고, 마지막에 팩파일과 인덱스를
+    쓴 뒤 refs/heads/<브랜치>를 한 번만 갱신합니다. 체크아웃되지 않은 ref나 bare
+    저장소에서는 ref만 갱신하고 작업 디렉토리는 건드리지 않습니다.
+    """
+
+    name = "pack"
+    # 팩 하나를 확정하는 비용은 작으므로 fast-import와 같은 간격으로 확정해 중단 시 잃는 커밋을 줄임
+    checkpoint_interval = 1000
+
+    def begin(self):
+        root, git_dir = find_git_dir()
+        self.store = ObjectStore(git_dir)
+        if self.target:
+            self.ref = self.target
+            try:
+                checked_out = self.store.head_ref() if root else None
+            except ValueError:
+                checked_out = None
+        else:
+            self.ref = checked_out = self.store.head_ref()
+        # bare 저장소는 HEAD가 가리키는 브랜치가 기본 대상이지만 작업 디렉토리는 없음
+        self.worktree = root is not None and self.ref == checked_out
+        self.parent = self.store.read_ref(self.ref)
+        self.base = self.parent.hex() if self.parent else None
+        self.ident = read_identity(git_dir).encode()
+
+        root_tree = self.store.commit_tree(self.parent) if self.parent else None
+        self.trees = TreeTemplate(self.store, root_tree, self.payload_path())
+
+        self.content = None
+        self.writer = PackWriter(self.store.objects_dir)
+        self.tip = self.parent
+        # 파일을 바꾸지 않는 커밋은 부모 트리(없으면 빈 트리)를 재사용
+        self.root_tree = root_tree
+
+    def commit(self, date, message, content):
+        with self.timer.phase("커밋" + SUBPHASE + "블롭/트리 해시·압축"):
+            if content is not None:
+                self.content = content
+                blob = self.writer.add(OBJ_BLOB, content)
+                for sha, data in self.trees.build(blob):
+                    self.writer.add(OBJ_TREE, data, sha)
+                self.root_tree = sha
+            elif self.root_tree is None:
+                self.root_tree = self.writer.add(OBJ_TREE, b"")
+            root_tree = self.root_tree
+
+        with self.timer.phase("커밋" + SUBPHASE + "커밋 오브젝트 해시·압축"):
+            when = raw_git_date(date).encode()
+            data = commit_object(root_tree, self.tip, self.ident, when, message.encode())
+            self.tip = self.writer.add(OBJ_COMMIT, data)
+
+    def checkpoint(self):
+        # 지금까지의 오브젝트를 팩 하나로 확정하고 새 팩을 시작
+        self.finish()
+        self.parent = self.tip
+        self.writer = PackWriter(self.store.objects_dir)
+        return self.tip.hex() if self.tip else None
+
+    def finish(self):
+        if self.tip == self.parent:
+            self.writer.abort()
+            return
+        self.writer.finish()
+        self.store.write_ref(self.ref, self.tip)
+        self._sync_worktree()
+
+    def abort(self):
+        self.writer.abort()
+
+    def resolve(self, ref):
+        return self._object_store().resolve(ref)
+
+    def write_ref(self, ref, commit):
+        self._object_store().write_ref(ref, bytes.fromhex(commit))
+
+
+class MemoryBackend(PackBackend):
+    """오브젝트와 ref를 메모리 저장소(MemoryRepository)에만 기록하는 방식
+
+    팩 백엔드와 같은 커밋을 만들지만 디스크와 git 프로세스를 쓰지 않으므로, 테스트나
+    계획/payload 비용만 따로 잴 때 사용합니다. flush()로 실제 저장소에 한 번에 옮길 수 있습니다.
+    """
+
+    name = "memory"
+    checkpoint_interval = 0
+    persistent = False
+
+    def __init__(self, payload_file, ref=None, repo=None):
+        super().__init__(payload_file, ref)
+        # 바탕 저장소 없이 빈 메모리 저장소에서 시작 (MemoryRepository.open()으로 바꿀 수 있음)
+        self.repo = repo if repo is not None else MemoryRepository()
+
+    def begin(self):
+        self.store = self.writer = self.repo
+        self.ref = self.target or self.repo.head_ref()
+        self.worktree = False
+        self.parent = self.repo.read_ref(self.ref)
+        self.base = self.parent.hex() if self.parent else None
+        self.ident = self.repo.ident
+
+        root_tree = self.repo.commit_tree(self.parent) if self.parent else None
+        self.trees = TreeTemplate(self.repo, root_tree, self.payload_path())
+        self.content = None
+        self.tip = self.parent
+        self.root_tree = root_tree
+
+    def checkpoint(self):
+        if self.tip:
+            self.repo.write_ref(self.ref, self.tip)
+        return self.tip.hex() if self.tip else None
+
+    def finish(self):
+        self.checkpoint()
+
+    def abort(self):
+        pass
+
+    def payload_path(self):
+        return self.repo.prefix + self.payload_file
+
+    def resolve(self, ref):
+        return self.repo.resolve(ref)
+
+    def day_counts(self, commit):
+        return self.repo.day_counts(commit)
+
+    def flush(self, git_dir=None):
+        """메모리의 커밋을 실제 저장소(git_dir, 없으면 바탕 저장소)에 기록하고 쓴 오브젝트 수 반환
+
+        바탕 저장소의 체크아웃된 브랜치에 기록했으면 작업 디렉토리와 인덱스도 새 브랜치 끝에 맞춥니다.
+        """
+        count = self.repo.flush(git_dir)
+        if git_dir is None and self.ref == worktree_ref():
+            self.worktree = True
+            self._sync_worktree()
+        return count
+
+
+BACKENDS = {
+    FastImportBackend.name: FastImportBackend,
+    MemoryBackend.name: MemoryBackend,
+    PackBackend.name: PackBackend,
+    SubprocessBackend.name: SubprocessBackend,
+}
+
+
+def make_backend(mode, payload_file, ref=None):
+    """모드 이름으로 백엔드 생성 (ref: 커밋을 쌓을 ref, None이면 체크아웃된 브랜치)"""
+    if mode not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드: {mode} (가능: {', '.join(BACKENDS)})")
+    return BACKENDS[mode](payload_file, ref)
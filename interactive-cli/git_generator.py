@@ -3,123 +3,163 @@
 GitHub 잔디밭 패턴을 실제 Git 커밋으로 변환
 """
 
-import subprocess
+import argparse
+import contextlib
+import cProfile
+import io
 import os
-import random
-from datetime import datetime, timedelta
-import json
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from canvas_state import Journal, generation_state_name, read_state, write_state
+from finalize import finalize, print_report
+from generation_plan import COUNT_MODES, DEFAULT_COUNT_MODE, GenerationPlan, intensity_to_commits
+from git_backends import (
+    BACKENDS, current_branch_ref, full_ref, git_output, make_backend, read_day_counts,
+    resolve_commit, worktree_ref,
+)
+from history_transfer import export_range, import_file
+from memory_repo import MemoryRepository
+from pattern_store import PatternLibrary, load_grid, save_binary
+from pattern_watcher import PatternWatcher
+from payloads import PAYLOADS, make_payload
+from progress import PhaseTimer, ProgressBar
+from run_history import find_run, finish_run, list_runs, reset_branch, rollback, start_run
+from scheduler import (
+    DEFAULT_PROFILE, PROFILES, SCHEDULE_VERSION, load_profile, parse_tz, year_start_date,
+)
 
 
 class GitCommitGenerator:
     """Git 커밋 생성기"""
 
-    def __init__(self, year=2024):
+    def __init__(self, year=2024, mode="fast-import", payload="append", profile=False,
+                 activity=DEFAULT_PROFILE, tz=None, count_mode=DEFAULT_COUNT_MODE, ref=None):
         self.year = year
-        # 해당 연도의 첫 일요일 찾기
-        jan_1 = datetime(year, 1, 1)
-        # 1월 1일이 무슨 요일인지 확인 (0=월요일, 6=일요일)
-        weekday = jan_1.weekday()
-        # 첫 일요일까지의 일수 계산
-        days_to_sunday = (6 - weekday) % 7
-        if days_to_sunday == 0 and weekday != 6:
-            days_to_sunday = -1
-        self.start_date = jan_1 - timedelta(days=(weekday + 1) % 7)
+        self.mode = mode
+        # 커밋 시각 분포 (활동 프로필)와 시간대 오프셋(분, None이면 로컬 시간대)
+        self.activity = activity
+        self.tz = tz
+        # 날짜별 커밋 수 결정 방식 (minimal: peak 비율로 근사한 최소, random: 강도별 범위)
+        self.count_mode = count_mode
+        self.payload_file = "canvas_commits.txt"
+        self.payload_strategy = payload
+        # 커밋을 쌓을 ref (None이면 체크아웃된 브랜치, 아니면 작업 디렉토리를 건드리지 않음)
+        self.ref = full_ref(ref) if ref else None
+        self.backend = make_backend(mode, self.payload_file, ref)
+        # 단계별 시간 측정 (profile=True일 때만)
+        self.timer = PhaseTimer(profile)
+        self.backend.timer = self.timer
+        # 진행률 표시 (에디터의 백그라운드 생성은 큐로 보내는 진행률로 바꿈)
+        self.progress_class = ProgressBar
+        # memory 백엔드: 생성이 끝나면 메모리의 커밋을 실제 저장소에 기록할지
+        self.flush = False
+        # 생성이 끝나면 repack하고 정리 전후 저장소/push 크기를 비교할지
+        self.finalize = False
+        # 시작하지 못한 이유 (execute_plan이 None을 반환했을 때)와 터미널에 출력할지
+        self.error = None
+        self.print_errors = True
+        # 해당 연도 잔디밭의 첫 일요일
+        self.start_date = datetime.combine(year_start_date(year), datetime.min.time())
 
     def intensity_to_commits(self, intensity):
         """강도를 커밋 개수로 변환"""
-        if intensity == 0:
-            return 0
-        elif intensity == 1:
-            return random.randint(1, 3)
-        elif intensity == 2:
-            return random.randint(4, 7)
-        elif intensity == 3:
-            return random.randint(8, 12)
-        else:  # intensity == 4
-            return random.randint(13, 20)
-
-    def create_commit(self, date, commit_number):
-        """특정 날짜에 커밋 생성"""
-        # 커밋 시간을 랜덤하게 설정
-        hour = random.randint(9, 22)
-        minute = random.randint(0, 59)
-        second = random.randint(0, 59)
-
-        commit_date = date.replace(hour=hour, minute=minute, second=second)
-        date_str = commit_date.strftime("%Y-%m-%d %H:%M:%S")
+        return intensity_to_commits(intensity)
 
-        # 더미 파일 생성/수정
-        commit_file = "canvas_commits.txt"
-        with open(commit_file, "a") as f:
-            f.write(f"Commit on {date_str}\n")
-
-        # git add
-        subprocess.run(["git", "add", commit_file], check=True)
-
-        # git commit with custom date
-        env = os.environ.copy()
-        env["GIT_AUTHOR_DATE"] = date_str
-        env["GIT_COMMITTER_DATE"] = date_str
+    def create_commit(self, commit_date, commit_message):
+        """특정 시각에 커밋 생성"""
+        date_str = commit_date.strftime("%Y-%m-%d %H:%M:%S")
 
-        commit_message = f"Canvas commit {commit_number}"
-        subprocess.run(
-            ["git", "commit", "-m", commit_message],
-            env=env,
-            check=True,
-            capture_output=True
-        )
+        with self.timer.phase("payload 생성"):
+            content = self.payload.next(f"Commit on {date_str}\n")
+        with self.timer.phase("커밋"):
+            self.backend.commit(commit_date, commit_message, content)
 
         return date_str
 
-    def generate_from_pattern(self, pattern_file):
-        """패턴 파일에서 커밋 생성"""
-        # 패턴 로드
-        with open(pattern_file, 'r') as f:
-            data = json.load(f)
-
-        grid = data['grid']
-        height = len(grid)
-        width = len(grid[0]) if height > 0 else 0
+    def branch(self):
+        """커밋을 쌓을 브랜치 ref (--ref가 없으면 HEAD가 가리키는 브랜치)"""
+        return self.ref or current_branch_ref()
+
+    def compile_plan(self, grid, seed=None, history="HEAD", existing=None):
+        """패턴 그리드를 커밋 생성 계획으로 컴파일
+
+        minimal 방식이면 history 커밋까지의 날짜별 커밋 수를 기존 커밋으로 보고
+        부족한 만큼만 계획합니다 (history가 None이면 기존 커밋 없음, "HEAD"이면 대상 브랜치).
+        existing: 이미 읽어 둔 history의 날짜별 커밋 수 (주면 history는 커밋 해시여야 함)
+        """
+        with self.timer.phase("계획 컴파일"):
+            if self.count_mode != "minimal":
+                existing = None
+            elif existing is None:
+                if history == "HEAD" and self.ref:
+                    history = self.ref
+                history = self.backend.resolve(history) if history else None
+                existing = self.backend.day_counts(history) if history else {}
+            plan = GenerationPlan.compile(grid, self.year, seed, activity=self.activity,
+                                          tz=self.tz, count_mode=self.count_mode,
+                                          existing=existing)
+            plan.history = history if self.count_mode == "minimal" else None
+            return plan
+
+    def reconcile_plan(self, plan, ref="HEAD"):
+        """ref까지의 히스토리에 이미 있는 커밋을 빼고 부족한 만큼만 만드는 계획 반환"""
+        if plan.count_mode == "minimal":
+            # minimal 방식은 계산할 때 이미 기존 커밋 수를 반영함
+            return plan
+        if ref == "HEAD" and self.ref:
+            ref = self.ref
+        history = self.backend.resolve(ref)
+        existing = self.backend.day_counts(history) if history else {}
+        plan, satisfied = plan.reconcile(existing)
+
+        if satisfied:
+            print(f"☑ 이미 목표 커밋 수를 채운 날짜: {len(satisfied)}일")
+            for ordinal, target, have in satisfied:
+                day = datetime.fromordinal(ordinal).strftime("%Y-%m-%d")
+                print(f"   {day}: 목표 {target}개 / 기존 {have}개")
+        return plan
+
+    def generate_from_pattern(self, pattern_file, seed=None, reconcile=False, grid=None):
+        """패턴 파일에서 커밋 생성
+
+        reconcile=True이면 기존 히스토리의 날짜별 커밋 수를 읽어 각 칸이
+        목표 강도에 도달하는 데 부족한 커밋만 생성합니다.
+        grid: 이미 읽은 패턴 그리드 (없으면 pattern_file에서 읽음)
+        """
+        if grid is None:
+            grid = load_grid(pattern_file)
+        width, height = grid.width, grid.height
+        plan = self.compile_plan(grid, seed)
+        if reconcile:
+            plan = self.reconcile_plan(plan)
 
         print("=" * 60)
         print("🎨 GitHub 잔디밭 커밋 생성 시작!")
         print("=" * 60)
         print(f"패턴 크기: {width}주 x {height}일")
-        print(f"대상 연도: {self.year}")
+        print(f"대상 연도: {self.year} | 시드: {plan.seed} | 활동 프로필: {self.activity}")
+        print(f"백엔드: {self.backend.name} | payload: {self.payload_strategy}")
+        self.print_count_mode(plan)
         print()
 
-        total_commits = 0
-        dates_with_commits = []
-
-        # 그리드를 순회하며 커밋 생성
-        for week in range(width):
-            for day in range(height):
-                intensity = grid[day][week]
-
-                if intensity > 0:
-                    # 해당 날짜 계산
-                    days_from_start = week * 7 + day
-                    commit_date = self.start_date + timedelta(days=days_from_start)
-
-                    # 연도 범위 확인
-                    if commit_date.year != self.year:
-                        continue
-
-                    # 강도에 따라 커밋 개수 결정
-                    num_commits = self.intensity_to_commits(intensity)
-
-                    for i in range(num_commits):
-                        total_commits += 1
-                        date_str = self.create_commit(commit_date, total_commits)
-                        print(f"✓ 커밋 생성: {date_str} (강도: {intensity}, #{total_commits})")
-
-                    dates_with_commits.append(commit_date.strftime("%Y-%m-%d"))
+        total_commits = self.execute_plan(plan, pattern_file=pattern_file)
+        if total_commits is None:
+            return 0
+        self.save_generation(grid, plan)
 
         print()
         print("=" * 60)
         print(f"✅ 완료! 총 {total_commits}개의 커밋이 생성되었습니다.")
-        print(f"📅 커밋이 생성된 날짜: {len(dates_with_commits)}일")
+        print(f"📅 커밋이 생성된 날짜: {len(plan.days)}일")
         print("=" * 60)
+        if not self.backend.persistent and not self.finish_in_memory():
+            return total_commits
+        if self.finalize:
+            print_report(*finalize(self.backend.ref, self.timer))
         print()
         print("다음 명령어로 GitHub에 푸시하세요:")
         print("  git push -f origin main")
@@ -127,14 +167,265 @@ class GitCommitGenerator:
 
         return total_commits
 
-    def preview_pattern(self, pattern_file):
-        """패턴 미리보기 (터미널)"""
-        with open(pattern_file, 'r') as f:
-            data = json.load(f)
+    def execute_plan(self, plan, start=0, pattern_file=None, journal=None, grid=None, run=None):
+        """계획의 커밋 레코드를 스트리밍으로 받아 start번째부터 커밋 생성
+
+        진행 상황은 .git/canvas/journal.json에 기록되어, 중단되더라도
+        resume 명령으로 마지막 확정 지점부터 이어서 생성할 수 있습니다.
+        시작 전 브랜치 끝과 만든 범위는 refs/canvas-runs/에 기록되어 rollback으로 되돌릴 수 있습니다.
+        grid: 패턴 파일 없이 생성할 때 저널에 함께 기록할 그리드
+        run: 이미 시작한 실행 기록 ID (없으면 새로 기록)
+        백엔드를 준비하지 못하면 (작성자 정보 없음 등) 오류를 출력하고 None을 반환합니다.
+        """
+        timer = self.timer
+        self.error = None
+        with timer.phase("시작 (백엔드 준비)"):
+            try:
+                self.backend.begin()
+            except ValueError as e:
+                self.error = str(e)
+                if self.print_errors:
+                    print(f"✗ 오류: {e}")
+                return None
+            # 체크아웃되지 않은 ref나 bare 저장소는 대상 브랜치의 payload 파일에서 이어 씀
+            self.payload = make_payload(self.payload_strategy, self.payload_file,
+                                        self.backend.initial_payload())
+            if journal is None:
+                journal = Journal.start(plan, pattern_file, self.mode, self.payload_strategy,
+                                        self.backend.ref, self.backend.base, start, grid,
+                                        persist=self.backend.persistent)
+                if run is None and self.backend.persistent:
+                    run = start_run(self.backend.ref, self.backend.base, {
+                        "pattern": os.path.basename(pattern_file) if pattern_file else None,
+                        "year": plan.year,
+                        "seed": plan.seed,
+                        "mode": self.mode,
+                        "payload_file": self.payload_file,
+                    }, self.backend)
+                journal.data["run"] = run
+                journal.save()
+        self.journal = journal
+
+        interval = self.backend.checkpoint_interval
+        total_commits = 0
+        # 커밋마다 출력하지 않고 진행률을 일정 간격으로만 갱신
+        progress = self.progress_class(plan.total, start=start)
+        try:
+            for record in plan.records(start):
+                self.create_commit(record.date, record.message)
+                total_commits += 1
+                progress.update(record.index + 1)
+
+                if interval and (record.index + 1) % interval == 0:
+                    with timer.phase("체크포인트 (브랜치 확정)"):
+                        journal.update(record.index + 1, self.backend.checkpoint())
+        except BaseException:
+            self.backend.abort()
+            raise
+
+        with timer.phase("마무리 (브랜치 갱신)"):
+            self.backend.finish()
+            journal.finish()
+            if journal.data.get("run"):
+                finish_run(journal.data["run"], self.backend.resolve(journal.data["ref"]),
+                           journal.data["total"] - journal.data.get("start", 0), self.backend)
+        progress.finish()
+        return total_commits
+
+    def resume(self, journal):
+        """저널에 기록된 생성을 마지막 확정 지점부터 이어서 진행"""
+        data = journal.data
+        grid = journal.grid()
+        plan = self.compile_plan(grid, data["seed"], data.get("history"))
+        if data.get("reconcile"):
+            # 생성 시작 전 브랜치 끝(base)과 대조하면 처음과 같은 계획이 나옴
+            existing = read_day_counts(data["base"]) if data["base"] else {}
+            plan, _ = plan.reconcile(existing)
+        if plan.digest() != data["plan"]:
+            print("✗ 패턴 파일이나 생성 방식이 바뀌어 저널의 계획과 일치하지 않습니다. "
+                  "이어서 생성할 수 없습니다.")
+            return 0
+
+        ref = data["ref"]
+        # 저널이 기록한 브랜치 끝과 같으면 기록을 그대로 사용하고,
+        # 마지막 기록 이후 커밋이 더 확정되었다면 base 이후 커밋 수로 계산
+        tip = resolve_commit(ref)
+        done = data["done"]
+        if tip != data["head"]:
+            revisions = f"{data['base']}..{tip}" if data["base"] else tip
+            done = data.get("start", 0) + int(git_output(["rev-list", "--count", revisions]))
+
+        print(f"↻ {done}/{plan.total}번째 커밋부터 이어서 생성합니다. (시드: {plan.seed})")
+        if done >= plan.total:
+            journal.finish(tip)
+            return 0
+
+        if worktree_ref() == ref:
+            # 기록되지 않은 변경이 남아 있을 수 있으므로 payload 파일을 브랜치 끝 상태로 되돌림
+            subprocess.run(["git", "checkout", "-q", "HEAD", "--", self.payload_file],
+                           capture_output=True)
+        total_commits = self.execute_plan(plan, start=done, journal=journal)
+        if total_commits is None:
+            return 0
+        if not plan.reconciled:
+            self.save_generation(grid, plan)
+        return total_commits
+
+    def save_generation(self, grid, plan):
+        """브랜치가 어떤 그리드/시드로 생성되었는지 기록 (regenerate에서 사용)"""
+        if not self.backend.persistent:
+            return None
+        data = self.journal.data
+        previous = read_state(generation_state_name(data["ref"]))
+        # 같은 생성 기록을 이어서 재생성한 경우 처음 base를 유지
+        base = data["base"]
+        if data.get("start") and previous:
+            base = previous["base"]
+        state = {
+            "grid": grid.to_list(),
+            "year": plan.year,
+            "seed": plan.seed,
+            "reconcile": plan.reconciled,
+            "activity": plan.activity,
+            "tz": plan.tz,
+            "counts": plan.count_mode,
+            "schedule": SCHEDULE_VERSION,
+            "base": base,
+            "head": self.backend.resolve(data["ref"]),
+            "total": plan.total,
+        }
+        write_state(generation_state_name(data["ref"]), state)
+        return state
+
+    def load_generation(self, ref, missing_message=True):
+        """ref의 생성 기록을 읽고 부분 재생성할 수 있는지 확인 (불가능하면 None)
+
+        처음 생성할 때와 같은 시각 분포/커밋 수 방식으로 계획을 다시 만들도록 설정을 맞춥니다.
+        """
+        state = read_state(generation_state_name(ref))
+        if state is None:
+            if missing_message:
+                print(f"✗ {ref}의 생성 기록이 없습니다. generate로 먼저 생성하세요.")
+            return None
+        if state["year"] != self.year or state["reconcile"]:
+            print("✗ 연도가 다르거나 --reconcile로 생성된 히스토리는 부분 재생성할 수 없습니다.")
+            return None
+        if state.get("schedule") != SCHEDULE_VERSION:
+            print("✗ 이전 버전의 커밋 시각 방식으로 생성된 히스토리입니다. generate로 다시 생성하세요.")
+            return None
+        if resolve_commit(ref) != state["head"]:
+            print("✗ 생성 이후 브랜치에 다른 커밋이 추가되었습니다. 부분 재생성할 수 없습니다.")
+            return None
+        self.activity = state["activity"]
+        self.tz = state["tz"]
+        self.count_mode = state.get("counts", "random")
+        return state
+
+    def regenerate(self, pattern_file, grid=None):
+        """패턴이 바뀐 첫 날짜 이전의 히스토리는 유지하고 그 이후만 다시 생성"""
+        ref = self.branch()
+        state = self.load_generation(ref)
+        if state is None:
+            return 0
+
+        if grid is None:
+            grid = load_grid(pattern_file)
+        # minimal 방식의 기존 커밋은 처음 생성하기 전 브랜치 끝(base)까지의 커밋
+        old_plan = self.compile_plan(state["grid"], state["seed"], state["base"])
+        new_plan = self.compile_plan(grid, state["seed"], state["base"])
+        total_commits, _ = self.apply_change(ref, state, old_plan, new_plan, grid, pattern_file)
+        return total_commits
 
-        grid = data['grid']
-        height = len(grid)
-        width = len(grid[0]) if height > 0 else 0
+    def apply_change(self, ref, state, old_plan, new_plan, grid, pattern_file):
+        """old_plan으로 만든 히스토리를 new_plan이 되도록 바뀐 부분만 다시 생성
+
+        반환값: (생성한 커밋 수, 새 생성 기록 또는 바뀐 것이 없으면 None)
+        """
+        # 날짜별 커밋 수와 시각은 (시드, 날짜)로만 결정되므로 (minimal 방식은 패턴 전체로),
+        # 처음으로 달라진 날짜 이전의 커밋이 같으면 그대로 유지
+        keep = 0
+        for old_day, old_count, new_day, new_count in zip(
+                old_plan.days, old_plan.counts, new_plan.days, new_plan.counts):
+            if old_day != new_day or old_count != new_count:
+                break
+            keep += old_count
+
+        if keep == old_plan.total == new_plan.total:
+            print("변경된 날짜가 없습니다.")
+            return 0, None
+
+        # 마지막으로 영향받지 않은 커밋 (생성된 커밋은 일렬로 이어져 있음)
+        drop = old_plan.total - keep
+        target = resolve_commit(f"{state['head']}~{drop}") if keep or state["base"] else None
+        print(f"↺ 앞의 {keep}개 커밋은 유지하고 {drop}개를 버린 뒤 "
+              f"{new_plan.total - keep}개를 다시 생성합니다.")
+
+        # 버리는 커밋도 rollback으로 되찾을 수 있도록 되돌리기 전의 브랜치 끝을 기록
+        run = start_run(ref, state["head"], {
+            "pattern": os.path.basename(pattern_file) if pattern_file else None,
+            "year": new_plan.year,
+            "seed": new_plan.seed,
+            "mode": self.mode,
+            "payload_file": self.payload_file,
+        }, self.backend)
+        reset_branch(ref, target, self.payload_file)
+
+        total_commits = self.execute_plan(new_plan, start=keep, pattern_file=pattern_file,
+                                          run=run)
+        if total_commits is None:
+            # 버린 커밋을 되돌려 재생성 전 상태로 복구
+            reset_branch(ref, state["head"], self.payload_file)
+            return 0, None
+        return total_commits, self.save_generation(grid, new_plan)
+
+    def finish_in_memory(self):
+        """memory 백엔드: 결과를 요약하고 flush가 켜져 있으면 실제 저장소에 기록 (기록했으면 True)"""
+        repo = self.backend.repo
+        size = sum(len(data) for _, data in repo.objects.values())
+        print(f"🧠 메모리 저장소: 오브젝트 {len(repo.objects)}개 ({size / 1024:.1f} KiB, 압축 전) | "
+              f"{self.backend.ref} → {(repo.resolve(self.backend.ref) or '없음')[:12]}")
+        if not self.flush:
+            print("   (저장소에는 기록하지 않았습니다. 기록하려면 --flush)")
+            return False
+        with self.timer.phase("메모리 → 저장소 기록 (flush)"):
+            count = self.backend.flush()
+        print(f"💾 오브젝트 {count}개를 팩 하나로 기록하고 {self.backend.ref}를 갱신했습니다.")
+        return True
+
+    def print_plan(self, plan):
+        """계획 요약과 예상 비용 출력 (커밋은 만들지 않음)"""
+        estimate = plan.estimate(self.mode, self.payload_strategy)
+
+        print("=" * 60)
+        print("🧾 커밋 생성 계획 (dry-run)")
+        print("=" * 60)
+        print(f"대상 연도: {self.year} | 시드: {plan.seed} | 활동 프로필: {self.activity}")
+        print(f"백엔드: {self.mode} | payload: {self.payload_strategy}")
+        self.print_count_mode(plan)
+        if plan.days:
+            first = datetime.fromordinal(plan.days[0]).strftime("%Y-%m-%d")
+            last = datetime.fromordinal(plan.days[-1]).strftime("%Y-%m-%d")
+            print(f"기간: {first} ~ {last}")
+        print(f"커밋 수: {estimate['commits']}개 ({estimate['days']}일)")
+        print(f"예상 소요 시간: {estimate['seconds']:.1f}초")
+        loose = " (느슨한 오브젝트, gc 전)" if self.mode == "subprocess" else ""
+        print(f"예상 팩 크기: {estimate['pack_bytes'] / 1024:.1f} KiB{loose}")
+        print(f"계획 해시: {plan.digest()}")
+        print("=" * 60)
+
+    def print_count_mode(self, plan):
+        """커밋 수 결정 방식 출력 (minimal이면 기준이 되는 하루 최대 커밋 수 포함)"""
+        if plan.count_mode != "minimal":
+            print("커밋 수: 강도별 범위에서 무작위 (random)")
+            return
+        print(f"커밋 수: 하루 최대 {plan.peak}개의 비율로 근사한 최소 (minimal, GitHub 사분위수와 다를 수 있음)")
+        if plan.shift:
+            print(f"⚠️  4단계 칸이 없어 모든 칸이 {plan.shift}단계 진하게 표시됩니다 "
+                  "(연도에서 커밋이 가장 많은 날은 항상 4단계).")
+
+    def preview_pattern(self, grid):
+        """패턴 미리보기 (터미널)"""
+        width, height = grid.width, grid.height
 
         print("\n" + "=" * 60)
         print("🎨 패턴 미리보기")
@@ -145,53 +436,339 @@ class GitCommitGenerator:
         shades = ['  ', '░░', '▒▒', '▓▓', '██']
 
         for day in range(height):
-            for week in range(width):
-                intensity = grid[day][week]
-                print(shades[intensity], end='')
-            print()
+            print(''.join(shades[intensity] for intensity in grid.row(day)))
 
         print("=" * 60)
         print(f"크기: {width}주 x {height}일")
         print("=" * 60 + "\n")
 
 
+def list_patterns(library):
+    """패턴 라이브러리 목록 출력 (색인 사용, 바뀐 파일만 다시 읽음)"""
+    entries = library.scan()
+    library.save()
+    if not entries:
+        print("patterns/ 폴더에 패턴 파일이 없습니다.")
+        return
+
+    print("=" * 60)
+    print(f"📚 패턴 라이브러리 ({len(entries)}개)")
+    print("=" * 60)
+    print(f"{'이름':<28}{'크기':>10}{'칠한 칸':>9}{'연도':>7}{'파일':>9}")
+    for name, entry in entries:
+        size = f"{entry['width']}x{entry['height']}"
+        year = entry["year"] or "-"
+        print(f"{name:<28}{size:>10}{entry['cells']:>9}{year:>7}{entry['size']:>8}B")
+    print("=" * 60)
+
+
+def print_runs():
+    """생성 실행 기록 목록 출력 (오래된 순)"""
+    runs = list_runs()
+    if not runs:
+        print("생성 실행 기록이 없습니다.")
+        return
+    print(f"{'실행 ID':<18}{'브랜치':<16}{'패턴':<16}{'연도':>5}{'커밋':>8}  {'생성 전':<12}{'생성 후':<12}")
+    for run_id, info in runs:
+        branch = info["ref"].replace("refs/heads/", "")
+        base = (info["base"] or "(빈 브랜치)")[:10]
+        head = (info["head"] or "(진행 중)")[:10]
+        print(f"{run_id:<18}{branch:<16}{info['pattern'] or '(에디터)':<16}{info['year'] or '-':>5}"
+              f"{info['commits']:>8}  {base:<12}{head:<12}")
+    print("되돌리기: python3 git_generator.py rollback --run <실행 ID> [--to base|head]")
+
+
+def export_history(run_id, ref, output):
+    """브랜치의 생성 기록(또는 실행 기록)의 커밋 범위를 번들/팩 파일 하나로 내보내기"""
+    if run_id:
+        run_id, info = find_run(run_id)
+        if info is None:
+            print(f"✗ 실행 기록을 찾을 수 없습니다: {run_id}")
+            return
+        if not info["head"]:
+            print(f"✗ {run_id}는 끝나지 않은 실행입니다.")
+            return
+        base, head = info["base"], info["head"]
+    else:
+        state = read_state(generation_state_name(ref))
+        if state is None:
+            print(f"✗ {ref}의 생성 기록이 없습니다. --run으로 실행을 지정하세요.")
+            return
+        base, head = state["base"], state["head"]
+
+    started = time.perf_counter()
+    kind, commits = export_range(base, head, output)
+    elapsed = time.perf_counter() - started
+    print(f"✓ {output} ({'번들' if kind == 'bundle' else '팩'}, 커밋 {commits}개, "
+          f"{os.path.getsize(output) / 1024:.1f} KiB, {elapsed:.2f}초)")
+    print(f"   범위: {(base or '(빈 브랜치)')[:12]}..{head[:12]}")
+    print(f"   가져오기: python3 git_generator.py import {output} [--ref 브랜치]")
+
+
+def import_history(path, ref):
+    """번들/팩 파일의 커밋 범위를 가져와 ref 브랜치에 적용 (rollback으로 되돌릴 수 있음)
+
+    브랜치 끝이 내보낸 범위의 시작 커밋과 같거나 브랜치가 없을 때만 적용합니다.
+    """
+    if not os.path.exists(path):
+        print(f"✗ 오류: {path} 파일을 찾을 수 없습니다.")
+        return
+    started = time.perf_counter()
+    try:
+        base, head, commits = import_file(path)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return
+    if base and not resolve_commit(base):
+        print(f"✗ 내보낸 범위의 시작 커밋 {base[:12]}이 이 저장소에 없습니다.")
+        return
+    tip = resolve_commit(ref)
+    if tip == head:
+        print("이미 가져온 히스토리입니다.")
+        return
+    if tip is not None and tip != base:
+        print(f"✗ {ref}의 끝({tip[:12]})이 내보낸 범위의 시작({(base or '빈 브랜치')[:12]})과 "
+              "달라 적용할 수 없습니다.")
+        return
+
+    run = start_run(ref, tip, {
+        "pattern": os.path.basename(path),
+        "year": None,
+        "seed": None,
+        "mode": "import",
+        "payload_file": "canvas_commits.txt",
+    })
+    reset_branch(ref, head, "canvas_commits.txt")
+    finish_run(run, head, commits)
+    elapsed = time.perf_counter() - started
+    print(f"✓ 커밋 {commits}개를 가져와 {ref}를 {head[:12]}로 옮겼습니다. ({elapsed:.2f}초)")
+
+
+def git_object_stats():
+    """현재 저장소를 하나의 팩으로 모은 뒤 (오브젝트 수, 팩 크기 KiB) 반환"""
+    subprocess.run(["git", "repack", "-adfq"], check=True)
+    output = subprocess.run(
+        ["git", "count-objects", "-v"],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    stats = dict(line.split(": ", 1) for line in output.splitlines())
+    objects = int(stats["count"]) + int(stats["in-pack"])
+    return objects, int(stats["size-pack"])
+
+
+def payload_report(pattern_file, year, mode, seed=0, grid=None):
+    """payload 전략별 비용(오브젝트 수, 팩 크기, 생성 시간)을 임시 저장소에서 측정"""
+    pattern_file = os.path.abspath(pattern_file)
+    if grid is None:
+        grid = load_grid(pattern_file)
+    original_dir = os.getcwd()
+    results = []
+
+    for strategy in PAYLOADS:
+        repo = tempfile.mkdtemp(prefix=f"canvas-{strategy}-")
+        try:
+            os.chdir(repo)
+            subprocess.run(["git", "init", "-q"], check=True)
+            subprocess.run(["git", "config", "user.name", "canvas"], check=True)
+            subprocess.run(["git", "config", "user.email", "canvas@example.com"], check=True)
+
+            # 같은 시드로 같은 커밋 수/시각을 만들어 전략끼리 비교
+            generator = GitCommitGenerator(year, mode, strategy)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                commits = generator.generate_from_pattern(pattern_file, seed, grid=grid)
+            elapsed = time.perf_counter() - started
+
+            objects, pack_kib = git_object_stats()
+            results.append((strategy, commits, objects, pack_kib, elapsed))
+        finally:
+            os.chdir(original_dir)
+            shutil.rmtree(repo, ignore_errors=True)
+
+    print("=" * 60)
+    print(f"📦 payload 전략별 비용 (백엔드: {mode}, 연도: {year})")
+    print("=" * 60)
+    print(f"{'전략':<8}{'커밋':>8}{'오브젝트':>10}{'팩 크기':>12}{'시간':>10}")
+    for strategy, commits, objects, pack_kib, elapsed in results:
+        print(f"{strategy:<8}{commits:>8}{objects:>10}{pack_kib:>9} KiB{elapsed:>9.2f}s")
+    print("=" * 60)
+    return results
+
+
 def main():
     """메인 함수"""
-    import sys
+    parser = argparse.ArgumentParser(
+        description="GitHub 잔디밭 패턴을 실제 Git 커밋으로 변환",
+        epilog="패턴 파일은 patterns/ 폴더에서 찾습니다."
+    )
+    parser.add_argument("command",
+                        choices=["preview", "plan", "dry-run", "generate", "regenerate",
+                                 "resume", "payload-report", "list", "compact",
+                                 "list-runs", "rollback", "watch", "export", "import"],
+                        help="preview: 미리보기 | plan/dry-run: 계획과 예상 비용 | "
+                             "generate: 커밋 생성 | regenerate: 바뀐 날짜부터 다시 생성 | "
+                             "resume: 중단된 생성 이어서 진행 | "
+                             "payload-report: payload 전략별 비용 비교 | "
+                             "list: 패턴 목록 | compact: .cgrid 바이너리로 변환 | "
+                             "list-runs: 생성 실행 기록 | rollback: 실행 전/후 상태로 되돌리기 | "
+                             "watch: 패턴 파일이 바뀔 때마다 자동으로 regenerate | "
+                             "export: 생성한 커밋 범위를 번들/팩 파일로 | "
+                             "import: 번들/팩 파일의 커밋을 브랜치에 적용")
+    parser.add_argument("pattern", nargs="?", default="pattern.json",
+                        help="패턴 파일 이름 (기본: pattern.json, import: 가져올 번들/팩 파일 경로)")
+    parser.add_argument("year", nargs="?", type=int, default=2024,
+                        help="대상 연도 (기본: 2024)")
+    parser.add_argument("--mode", choices=list(BACKENDS), default="fast-import",
+                        help="커밋 백엔드 (기본: fast-import, 기존 방식: subprocess)")
+    parser.add_argument("--payload", choices=list(PAYLOADS), default="append",
+                        help="커밋마다 payload 파일을 바꾸는 방식 (기본: append)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="커밋 수/시각을 결정하는 난수 시드 (같은 시드면 같은 히스토리)")
+    parser.add_argument("--reconcile", action="store_true",
+                        help="기존 히스토리의 날짜별 커밋 수를 반영하여 부족한 커밋만 생성 "
+                             "(minimal은 항상 반영)")
+    parser.add_argument("--counts", choices=COUNT_MODES, default=DEFAULT_COUNT_MODE,
+                        help="날짜별 커밋 수 (random: 강도별 고정 범위, "
+                             "minimal: 하루 최대 커밋 수 비율로 근사한 최소 (GitHub 사분위수 아님), 기본: random)")
+    parser.add_argument("--activity", default=DEFAULT_PROFILE, metavar="PROFILE",
+                        help=f"커밋 시각 분포 ({', '.join(PROFILES)} 또는 JSON 파일, "
+                             f"기본: {DEFAULT_PROFILE})")
+    parser.add_argument("--tz", default=None,
+                        help="커밋 시각의 시간대 오프셋 (예: +09:00, -0500, 기본: 로컬 시간대)")
+    parser.add_argument("--finalize", action="store_true",
+                        help="generate: 생성 후 repack하고 정리 전후 저장소 크기와 예상 push 크기 비교")
+    parser.add_argument("--flush", action="store_true",
+                        help="--mode memory: 현재 저장소 위에서 메모리로 생성한 뒤 "
+                             "팩 하나로 한 번에 기록")
+    parser.add_argument("--ref", default=None, metavar="BRANCH",
+                        help="커밋을 쌓을 브랜치 (기본: 체크아웃된 브랜치). 체크아웃되지 않은 브랜치나 "
+                             "bare 저장소에서는 작업 디렉토리와 인덱스를 건드리지 않음")
+    parser.add_argument("--run", default=None, metavar="ID",
+                        help="rollback/export할 실행 ID (list-runs로 확인, 기본: rollback은 "
+                             "가장 최근 실행, export는 브랜치의 생성 기록 전체)")
+    parser.add_argument("--output", "-o", default="canvas-history.bundle", metavar="FILE",
+                        help="export: 내보낼 파일 (.pack이면 팩, 아니면 번들, "
+                             "기본: canvas-history.bundle)")
+    parser.add_argument("--to", choices=["base", "head"], default="base",
+                        help="rollback 대상 (base: 생성 전, head: 생성 후, 기본: base)")
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="watch: 파일 확인 간격 (초, 기본: 0.5)")
+    parser.add_argument("--debounce", type=float, default=1.0,
+                        help="watch: 마지막 저장 후 이 시간 동안 변화가 없으면 반영 (초, 기본: 1.0)")
+    parser.add_argument("--profile", nargs="?", const="canvas-profile.prof", default=None,
+                        metavar="FILE",
+                        help="단계별 시간 요약을 출력하고 cProfile 결과를 FILE에 저장 "
+                             "(기본: canvas-profile.prof)")
+    args = parser.parse_args()
+
+    if args.profile is None:
+        run_command(args)
+        return
 
-    if len(sys.argv) < 2:
-        print("사용법:")
-        print("  python git_generator.py preview pattern.json  # 미리보기")
-        print("  python git_generator.py generate pattern.json  # 커밋 생성")
-        print("  python git_generator.py generate pattern.json 2024  # 특정 연도")
-        print()
-        print("패턴 파일은 patterns/ 폴더에서 찾습니다.")
+    profiler = cProfile.Profile()
+    generator = profiler.runcall(run_command, args)
+    profiler.dump_stats(args.profile)
+    if generator is not None:
+        generator.timer.print_summary()
+    print(f"cProfile 결과: {args.profile} (python3 -m pstats {args.profile} 로 확인)")
+
+
+def run_command(args):
+    """명령 실행 (사용한 생성기 반환, 없으면 None)"""
+    if args.command == "resume":
+        journal = Journal.load()
+        if journal is None or journal.data["status"] == "done":
+            print("이어서 진행할 생성 작업이 없습니다.")
+            return
+        data = journal.data
+        generator = GitCommitGenerator(data["year"], data["mode"], data["payload"],
+                                       args.profile is not None,
+                                       data.get("activity", DEFAULT_PROFILE), data.get("tz"),
+                                       data.get("counts", "random"), data["ref"])
+        generator.resume(journal)
+        return generator
+
+    if args.command == "list-runs":
+        print_runs()
+        return
+    if args.command == "rollback":
+        ok, message = rollback(args.run, args.to, full_ref(args.ref) if args.ref else None)
+        print(("✓ " if ok else "✗ ") + message)
+        return
+    if args.command == "export":
+        export_history(args.run, full_ref(args.ref) if args.ref else current_branch_ref(),
+                       args.output)
+        return
+    if args.command == "import":
+        import_history(args.pattern, full_ref(args.ref) if args.ref else current_branch_ref())
         return
 
-    command = sys.argv[1]
-    pattern_filename = sys.argv[2] if len(sys.argv) > 2 else "pattern.json"
-    year = int(sys.argv[3]) if len(sys.argv) > 3 else 2024
+    library = PatternLibrary('patterns')
+    if args.command == "list":
+        list_patterns(library)
+        return
 
     # patterns 폴더에서 파일 찾기
-    pattern_file = os.path.join('patterns', pattern_filename)
+    pattern_file = os.path.join('patterns', args.pattern)
 
     if not os.path.exists(pattern_file):
         print(f"✗ 오류: {pattern_file} 파일을 찾을 수 없습니다.")
         print(f"patterns/ 폴더에 패턴 파일이 있는지 확인하세요.")
         return
 
-    generator = GitCommitGenerator(year)
+    # 패턴은 명령마다 한 번만 읽어 미리보기와 생성에서 함께 사용
+    grid = library.load(args.pattern)
+    library.save()
+
+    if args.command == "compact":
+        target = os.path.splitext(pattern_file)[0] + ".cgrid"
+        save_binary(target, grid, args.year)
+        print(f"✓ {target} 저장 ({os.path.getsize(pattern_file)}B → {os.path.getsize(target)}B)")
+        return
 
-    if command == "preview":
-        generator.preview_pattern(pattern_file)
-    elif command == "generate":
-        generator.preview_pattern(pattern_file)
+    try:
+        load_profile(args.activity)
+        tz = parse_tz(args.tz)
+    except ValueError as e:
+        print(f"✗ 오류: {e}")
+        return
+    generator = GitCommitGenerator(args.year, args.mode, args.payload, args.profile is not None,
+                                   args.activity, tz, args.counts, args.ref)
+    generator.finalize = args.finalize
+    if args.mode == "memory":
+        if args.command in ("regenerate", "watch"):
+            print("✗ memory 백엔드는 생성 기록을 남기지 않으므로 regenerate/watch를 쓸 수 없습니다.")
+            return
+        if args.flush:
+            # 현재 저장소의 브랜치 위에 이어서 생성해야 기록할 수 있음
+            generator.backend.repo = MemoryRepository.open()
+            generator.flush = True
+
+    if args.command == "preview":
+        generator.preview_pattern(grid)
+    elif args.command in ("plan", "dry-run"):
+        generator.preview_pattern(grid)
+        plan = generator.compile_plan(grid, args.seed)
+        if args.reconcile:
+            plan = generator.reconcile_plan(plan)
+        generator.print_plan(plan)
+    elif args.command == "generate":
+        generator.preview_pattern(grid)
         print("위 패턴으로 커밋을 생성하시겠습니까? (y/n): ", end='')
         confirm = input().strip().lower()
         if confirm == 'y':
-            generator.generate_from_pattern(pattern_file)
-    else:
-        print(f"알 수 없는 명령어: {command}")
+            generator.generate_from_pattern(pattern_file, args.seed, args.reconcile, grid)
+    elif args.command == "regenerate":
+        generator.preview_pattern(grid)
+        generator.regenerate(pattern_file, grid)
+    elif args.command == "watch":
+        PatternWatcher(generator, pattern_file, args.interval, args.debounce).run()
+    elif args.command == "payload-report":
+        payload_report(pattern_file, args.year, args.mode, grid=grid)
+        return
+    return generator
 
 
 if __name__ == "__main__":
@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+git 실행 파일 없이 Git 저장소를 직접 읽고 쓰는 모듈
+오브젝트 해시, zlib 압축, 팩파일(.pack)과 인덱스(.idx v2) 작성을 담당합니다.
+"""
+
+import fnmatch
+import hashlib
+import os
+import struct
+import zlib
+
+OBJ_COMMIT = 1
+OBJ_TREE = 2
+OBJ_BLOB = 3
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+
+# 팩에 쓰는 블롭 델타 체인의 최대 길이 (git pack-objects 기본값과 같음)
+MAX_DELTA_DEPTH = 50
+# 델타로 찾을 때 target 앞부분을 base에서 검색하는 길이
+DELTA_PROBE = 32
+
+TYPE_NAMES = {OBJ_COMMIT: b"commit", OBJ_TREE: b"tree", OBJ_BLOB: b"blob"}
+TYPE_CODES = {name: code for code, name in TYPE_NAMES.items()}
+
+
+def object_id(type_code, data):
+    """오브젝트 내용의 SHA-1 해시(20바이트) 계산"""
+    header = b"%s %d\0" % (TYPE_NAMES[type_code], len(data))
+    return hashlib.sha1(header + data).digest()
+
+
+def commit_object(tree, parent, ident, when, message):
+    """커밋 오브젝트 내용 생성 (tree/parent: 20바이트 해시, ident: b'이름 <이메일>')"""
+    data = b"tree " + tree.hex().encode() + b"\n"
+    if parent:
+        data += b"parent " + parent.hex().encode() + b"\n"
+    data += b"author " + ident + b" " + when + b"\n"
+    data += b"committer " + ident + b" " + when + b"\n"
+    return data + b"\n" + message + b"\n"
+
+
+def is_bare_git_dir(path):
+    """path 자체가 git 디렉토리(bare 저장소)인지"""
+    return (os.path.isfile(os.path.join(path, "HEAD"))
+            and os.path.isdir(os.path.join(path, "objects"))
+            and os.path.isdir(os.path.join(path, "refs")))
+
+
+def find_git_dir(start="."):
+    """start부터 상위로 올라가며 (작업 디렉토리 루트, .git 디렉토리) 찾기
+
+    bare 저장소(또는 GIT_WORK_TREE 없이 GIT_DIR만 지정한 경우)는 작업 디렉토리 루트가 None입니다.
+    GIT_DIR 환경 변수는 start가 현재 디렉토리일 때만 따릅니다 (git과 같은 동작).
+    """
+    if start == "." and os.environ.get("GIT_DIR"):
+        work_tree = os.environ.get("GIT_WORK_TREE")
+        return (os.path.abspath(work_tree) if work_tree else None,
+                os.path.abspath(os.environ["GIT_DIR"]))
+    path = os.path.abspath(start)
+    while True:
+        if is_bare_git_dir(path):
+            return None, path
+        candidate = os.path.join(path, ".git")
+        if os.path.isdir(candidate):
+            return path, candidate
+        if os.path.isfile(candidate):
+            # 워크트리/서브모듈: "gitdir: <경로>" 형식의 파일
+            with open(candidate) as f:
+                gitdir = f.read().strip().split(":", 1)[1].strip()
+            return path, os.path.normpath(os.path.join(path, gitdir))
+        parent = os.path.dirname(path)
+        if parent == path:
+            raise FileNotFoundError("Git 저장소를 찾을 수 없습니다")
+        path = parent
+
+
+def _include_applies(condition, git_dir, config_file):
+    """includeIf 조건 판별 (gitdir:, gitdir/i:만 지원, 나머지 조건은 적용하지 않음)"""
+    for prefix, fold in (("gitdir:", False), ("gitdir/i:", True)):
+        if not condition.startswith(prefix):
+            continue
+        pattern = condition[len(prefix):]
+        if pattern.startswith("~/"):
+            pattern = os.path.expanduser(pattern)
+        elif pattern.startswith("./"):
+            pattern = os.path.join(os.path.dirname(config_file), pattern[2:])
+        elif not os.path.isabs(pattern):
+            pattern = "**/" + pattern
+        if pattern.endswith("/"):
+            pattern += "**"
+        path = os.path.abspath(git_dir)
+        if fold:
+            pattern, path = pattern.lower(), path.lower()
+        return fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(path + "/", pattern)
+    return False
+
+
+def _read_user_config(config_file, git_dir, values, depth=0):
+    """설정 파일의 user.name/user.email을 values에 덮어씀 (include/includeIf 포함, 뒤의 값이 우선)"""
+    if depth > 10 or not os.path.isfile(config_file):
+        return
+    section = None
+    with open(config_file, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(("#", ";")):
+                continue
+            if line.startswith("["):
+                section = line.strip("[]").strip()
+                continue
+            if "=" not in line:
+                continue
+            key, value = (part.strip() for part in line.split("=", 1))
+            key, value = key.lower(), value.strip('"')
+            name = section.split(" ", 1)[0].lower() if section else None
+            if name == "user" and key in ("name", "email"):
+                values[key] = value
+            elif key == "path" and name in ("include", "includeif"):
+                if name == "includeif":
+                    condition = section.split(" ", 1)[1].strip().strip('"') if " " in section else ""
+                    if not _include_applies(condition, git_dir, config_file):
+                        continue
+                path = os.path.expanduser(value)
+                if not os.path.isabs(path):
+                    path = os.path.join(os.path.dirname(config_file), path)
+                _read_user_config(path, git_dir, values, depth + 1)
+
+
+def config_files(git_dir):
+    """git이 읽는 설정 파일을 우선순위 높은 순서로 (저장소, 전역, XDG, 시스템)"""
+    xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    files = [os.path.join(git_dir, "config")]
+    if os.environ.get("GIT_CONFIG_GLOBAL"):
+        files.append(os.environ["GIT_CONFIG_GLOBAL"])
+    else:
+        files += [os.path.expanduser("~/.gitconfig"), os.path.join(xdg, "git", "config")]
+    if not os.environ.get("GIT_CONFIG_NOSYSTEM"):
+        files.append(os.environ.get("GIT_CONFIG_SYSTEM") or "/etc/gitconfig")
+    return files
+
+
+def read_identity(git_dir):
+    """환경 변수나 git 설정 파일에서 '이름 <이메일>' 읽기"""
+    name = os.environ.get("GIT_COMMITTER_NAME") or os.environ.get("GIT_AUTHOR_NAME")
+    email = os.environ.get("GIT_COMMITTER_EMAIL") or os.environ.get("GIT_AUTHOR_EMAIL")
+
+    for config_file in config_files(git_dir):
+        if name and email:
+            break
+        values = {}
+        _read_user_config(config_file, git_dir, values)
+        name = name or values.get("name")
+        email = email or values.get("email")
+
+    if not name or not email:
+        raise ValueError("작성자 정보(user.name, user.email)를 찾을 수 없습니다. "
+                         "git config user.name/user.email을 설정하세요.")
+    return f"{name} <{email}>"
+
+
+def apply_delta(base, delta):
+    """git 델타 명령을 base에 적용"""
+    def varint(pos):
+        value = shift = 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value, pos
+
+    _, pos = varint(0)
+    _, pos = varint(pos)
+    out = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            offset = size = 0
+            for i in range(4):
+                if opcode & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if opcode & (1 << (4 + i)):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset:offset + (size or 0x10000)]
+        else:
+            out += delta[pos:pos + opcode]
+            pos += opcode
+    return bytes(out)
+
+
+def _varint(value):
+    """델타 헤더의 크기 정수 (7비트씩, 작은 자리부터)"""
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if not value:
+            out.append(byte)
+            return out
+        out.append(byte | 0x80)
+
+
+def make_delta(base, target):
+    """base를 기준으로 target을 만드는 git 델타 (쓸모없으면 None)
+
+    payload 파일은 직전 버전 뒤에 줄이 붙거나(append) 앞줄이 빠지고 뒤에 붙으므로(rotate),
+    target의 앞부분이 base 안에 이어져 있는 가장 긴 구간을 복사하고 나머지는 그대로 넣습니다.
+    """
+    probe = target[:DELTA_PROBE]
+    start = base.find(probe) if len(probe) == DELTA_PROBE else -1
+    if start < 0:
+        return None
+    # base[start:]와 target이 앞에서부터 같은 길이를 이분 탐색 (비교는 C의 memcmp)
+    lo, hi = len(probe), min(len(base) - start, len(target))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if base[start:start + mid] == target[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    length = lo
+    if length < len(target) // 2:
+        return None
+
+    delta = _varint(len(base)) + _varint(len(target))
+    copied = 0
+    while copied < length:
+        # 복사 명령 하나의 크기는 최대 3바이트 (0xffffff)
+        size = min(length - copied, 0xffffff)
+        offset = start + copied
+        opcode = 0x80
+        args = bytearray()
+        for i in range(4):
+            if offset >> (8 * i) & 0xff:
+                opcode |= 1 << i
+                args.append(offset >> (8 * i) & 0xff)
+        for i in range(3):
+            if size >> (8 * i) & 0xff:
+                opcode |= 1 << (4 + i)
+                args.append(size >> (8 * i) & 0xff)
+        delta.append(opcode)
+        delta += args
+        copied += size
+    for pos in range(length, len(target), 0x7f):
+        chunk = target[pos:pos + 0x7f]
+        delta.append(len(chunk))
+        delta += chunk
+    return bytes(delta)
+
+
+class PackReader:
+    """기존 팩파일(.idx v2 + .pack)에서 오브젝트 읽기"""
+
+    def __init__(self, idx_path):
+        with open(idx_path, "rb") as f:
+            idx = f.read()
+        if idx[:4] != b"\377tOc":
+            raise ValueError(f"지원하지 않는 팩 인덱스 형식: {idx_path}")
+        self.fanout = struct.unpack(">256I", idx[8:8 + 1024])
+        self.count = self.fanout[255]
+        names_start = 8 + 1024
+        self.names = idx[names_start:names_start + 20 * self.count]
+        offsets_start = names_start + 24 * self.count
+        self.offsets = idx[offsets_start:offsets_start + 4 * self.count]
+        self.large_offsets = idx[offsets_start + 4 * self.count:]
+        self.pack_path = idx_path[:-4] + ".pack"
+
+    def find(self, sha):
+        """sha의 팩 내 오프셋 반환 (없으면 None)"""
+        lo = self.fanout[sha[0] - 1] if sha[0] else 0
+        hi = self.fanout[sha[0]]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name = self.names[20 * mid:20 * mid + 20]
+            if name < sha:
+                lo = mid + 1
+            elif name > sha:
+                hi = mid
+            else:
+                offset, = struct.unpack_from(">I", self.offsets, 4 * mid)
+                if offset & 0x80000000:
+                    offset, = struct.unpack_from(">Q", self.large_offsets, 8 * (offset & 0x7fffffff))
+                return offset
+        return None
+
+    def read_at(self, f, offset, store):
+        """오프셋 위치의 오브젝트를 (타입, 내용)으로 읽기 (델타 해석 포함)"""
+        f.seek(offset)
+        header = f.read(32)
+        type_code = (header[0] >> 4) & 7
+        pos = 1
+        byte = header[0]
+        while byte & 0x80:
+            byte = header[pos]
+            pos += 1
+
+        base = None
+        if type_code == OBJ_OFS_DELTA:
+            byte = header[pos]
+            pos += 1
+            base_offset = byte & 0x7f
+            while byte & 0x80:
+                byte = header[pos]
+                pos += 1
+                base_offset = ((base_offset + 1) << 7) | (byte & 0x7f)
+            base = self.read_at(f, offset - base_offset, store)
+        elif type_code == OBJ_REF_DELTA:
+            base = store.read(header[pos:pos + 20])
+            pos += 20
+
+        f.seek(offset + pos)
+        decompressor = zlib.decompressobj()
+        data = b""
+        while not decompressor.eof:
+            chunk = f.read(4096)
+            if not chunk:
+                break
+            data += decompressor.decompress(chunk)
+
+        if base is not None:
+            return base[0], apply_delta(base[1], data)
+        return type_code, data
+
+
+class ObjectStore:
+    """git 실행 파일 없이 저장소의 오브젝트와 ref를 다루는 클래스"""
+
+    def __init__(self, git_dir):
+        self.git_dir = git_dir
+        # 워크트리는 오브젝트와 브랜치를 공통 디렉토리에 저장
+        common_file = os.path.join(git_dir, "commondir")
+        self.common_dir = git_dir
+        if os.path.exists(common_file):
+            with open(common_file) as f:
+                self.common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        self.objects_dir = os.path.join(self.common_dir, "objects")
+        self._packs = None
+
+    def packs(self):
+        if self._packs is None:
+            pack_dir = os.path.join(self.objects_dir, "pack")
+            self._packs = []
+            if os.path.isdir(pack_dir):
+                for name in sorted(os.listdir(pack_dir)):
+                    if name.endswith(".idx"):
+                        self._packs.append(PackReader(os.path.join(pack_dir, name)))
+        return self._packs
+
+    def read(self, sha):
+        """오브젝트를 (타입 코드, 내용)으로 읽기"""
+        hex_sha = sha.hex()
+        loose = os.path.join(self.objects_dir, hex_sha[:2], hex_sha[2:])
+        if os.path.exists(loose):
+            with open(loose, "rb") as f:
+                raw = zlib.decompress(f.read())
+            header, _, data = raw.partition(b"\0")
+            return TYPE_CODES[header.split(b" ")[0]], data
+
+        for pack in self.packs():
+            offset = pack.find(sha)
+            if offset is not None:
+                with open(pack.pack_path, "rb") as f:
+                    return pack.read_at(f, offset, self)
+        raise KeyError(f"오브젝트를 찾을 수 없습니다: {hex_sha}")
+
+    def head_ref(self):
+        """HEAD가 가리키는 브랜치 ref 반환 (예: refs/heads/main)"""
+        with open(os.path.join(self.git_dir, "HEAD")) as f:
+            head = f.read().strip()
+        if not head.startswith("ref: "):
+            raise ValueError("HEAD가 브랜치를 가리키지 않습니다 (detached HEAD)")
+        return head[5:]
+
+    def read_ref(self, ref):
+        """ref가 가리키는 커밋 해시(20바이트) 반환 (없으면 None)"""
+        for base in (self.git_dir, self.common_dir):
+            path = os.path.join(base, ref)
+            if os.path.isfile(path):
+                with open(path) as f:
+                    return bytes.fromhex(f.read().strip())
+
+        packed = os.path.join(self.common_dir, "packed-refs")
+        if os.path.exists(packed):
+            with open(packed) as f:
+                for line in f:
+                    if line.startswith(("#", "^")):
+                        continue
+                    sha, _, name = line.strip().partition(" ")
+                    if name == ref:
+                        return bytes.fromhex(sha)
+        return None
+
+    def resolve(self, name):
+        """ref 이름("HEAD", 브랜치, 전체 ref) 또는 커밋 해시를 커밋 해시 문자열로 (없으면 None)"""
+        if name == "HEAD":
+            name = self.head_ref()
+        if len(name) == 40 and all(c in "0123456789abcdef" for c in name):
+            return name
+        sha = self.read_ref(name if name.startswith("refs/") else f"refs/heads/{name}")
+        return sha.hex() if sha else None
+
+    def write_ref(self, ref, sha):
+        """ref를 잠금 파일을 거쳐 원자적으로 갱신"""
+        path = os.path.join(self.common_dir, ref)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lock = path + ".lock"
+        with open(lock, "x") as f:
+            f.write(sha.hex() + "\n")
+        os.replace(lock, path)
+
+    def commit_tree(self, commit_sha):
+        """커밋이 가리키는 트리 해시 반환"""
+        _, data = self.read(commit_sha)
+        return bytes.fromhex(data[5:45].decode())
+
+    def tree_entries(self, tree_sha):
+        """트리 오브젝트를 [(모드, 이름, 해시)] 목록으로 파싱"""
+        if tree_sha is None:
+            return []
+        _, data = self.read(tree_sha)
+        entries = []
+        pos = 0
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            nul = data.index(b"\0", space)
+            entries.append((data[pos:space], data[space + 1:nul], data[nul + 1:nul + 21]))
+            pos = nul + 21
+        return entries
+
+    def read_path(self, commit_sha, path):
+        """커밋의 트리에서 path(저장소 루트 기준, "/" 구분) 파일 내용 반환 (없으면 None)"""
+        sha = self.commit_tree(commit_sha)
+        for name in path.encode().split(b"/"):
+            for _, entry, entry_sha in self.tree_entries(sha):
+                if entry == name:
+                    sha = entry_sha
+                    break
+            else:
+                return None
+        type_code, data = self.read(sha)
+        return data if type_code == OBJ_BLOB else None
+
+
+def tree_sort_key(mode, name):
+    """git 트리 정렬 순서 (디렉토리는 이름 뒤에 '/'가 붙은 것으로 비교)"""
+    return name + b"/" if mode == b"40000" else name
+
+
+class TreeTemplate:
+    """경로 하나만 바뀌는 트리 체인을 빠르게 만들기 위한 템플릿
+
+    경로의 각 단계마다 바뀌는 항목 앞뒤의 직렬화된 바이트를 미리 계산해 두고,
+    커밋마다 20바이트 해시만 끼워 넣습니다.
+    """
+
+    def __init__(self, store, root_tree, path):
+        self.levels = []
+        parts = path.encode().split(b"/")
+        tree_sha = root_tree
+        for depth, part in enumerate(parts):
+            is_leaf = depth == len(parts) - 1
+            mode = b"100644" if is_leaf else b"40000"
+            entries = []
+            child = None
+            for entry_mode, name, sha in store.tree_entries(tree_sha):
+                if name != part:
+                    entries.append((entry_mode, name, sha))
+                elif entry_mode == b"40000" and not is_leaf:
+                    child = sha
+            key = tree_sort_key(mode, part)
+            before = b"".join(m + b" " + n + b"\0" + s for m, n, s in entries
+                              if tree_sort_key(m, n) < key)
+            after = b"".join(m + b" " + n + b"\0" + s for m, n, s in entries
+                             if tree_sort_key(m, n) > key)
+            self.levels.append((before + mode + b" " + part + b"\0", after))
+            tree_sha = child
+
+    def build(self, leaf_sha):
+        """leaf_sha를 넣은 트리들을 아래에서 위로 [(해시, 내용)] 생성"""
+        trees = []
+        sha = leaf_sha
+        for before, after in reversed(self.levels):
+            data = before + sha + after
+            sha = object_id(OBJ_TREE, data)
+            trees.append((sha, data))
+        return trees
+
+
+class PackWriter:
+    """오브젝트를 하나의 팩파일로 쓰고 .idx v2 인덱스를 생성
+
+    블롭은 같은 팩에 직전에 쓴 블롭을 기준으로 ofs-delta를 찾아 봅니다. payload 파일은
+    커밋마다 조금씩만 바뀌므로 블롭 전체 대신 바뀐 줄만 저장되어 (체인은 MAX_DELTA_DEPTH까지)
+    append 방식에서도 팩 크기가 커밋 수에 비례합니다.
+    """
+
+    def __init__(self, objects_dir, level=1):
+        self.pack_dir = os.path.join(objects_dir, "pack")
+        os.makedirs(self.pack_dir, exist_ok=True)
+        self.tmp_path = os.path.join(self.pack_dir, f"tmp_pack_{os.getpid()}")
+        self.file = open(self.tmp_path, "w+b")
+        self.file.write(b"PACK" + struct.pack(">II", 2, 0))
+        self.offset = 12
+        self.level = level
+        self.entries = {}  # sha -> (crc32, offset)
+        # 델타 기준이 될 직전 블롭 (해시, 내용, 델타 체인 길이)
+        self.last_blob = None
+
+    def add(self, type_code, data, sha=None):
+        """오브젝트 추가 (이미 추가된 오브젝트는 건너뜀). 해시 반환"""
+        if sha is None:
+            sha = object_id(type_code, data)
+        if sha in self.entries:
+            return sha
+
+        body, depth = data, 0
+        header = bytearray()
+        if type_code == OBJ_BLOB and self.last_blob:
+            base_sha, base_data, base_depth = self.last_blob
+            delta = make_delta(base_data, data) if base_depth < MAX_DELTA_DEPTH else None
+            if delta is not None:
+                body, depth = delta, base_depth + 1
+
+        stored_type = type_code if depth == 0 else OBJ_OFS_DELTA
+        size = len(body)
+        byte = (stored_type << 4) | (size & 0x0f)
+        size >>= 4
+        while size:
+            header.append(byte | 0x80)
+            byte = size & 0x7f
+            size >>= 7
+        header.append(byte)
+        if depth:
+            # 기준 오브젝트까지의 거리 (git의 ofs-delta 인코딩: 이어지는 바이트마다 1을 뺌)
+            distance = self.offset - self.entries[base_sha][1]
+            encoded = bytearray([distance & 0x7f])
+            distance >>= 7
+            while distance:
+                distance -= 1
+                encoded.append(0x80 | (distance & 0x7f))
+                distance >>= 7
+            header += encoded[::-1]
+        if type_code == OBJ_BLOB:
+            self.last_blob = (sha, data, depth)
+
+        record = bytes(header) + zlib.compress(body, self.level)
+        self.entries[sha] = (zlib.crc32(record), self.offset)
+        self.file.write(record)
+        self.offset += len(record)
+        return sha
+
+    def finish(self):
+        """팩 헤더와 체크섬을 마무리하고 (팩 경로, 인덱스 경로) 반환"""
+        count = len(self.entries)
+        self.file.seek(8)
+        self.file.write(struct.pack(">I", count))
+        self.file.flush()
+
+        # 헤더가 바뀌었으므로 전체를 순차적으로 다시 읽어 체크섬 계산
+        digest = hashlib.sha1()
+        self.file.seek(0)
+        while True:
+            chunk = self.file.read(1 << 20)
+            if not chunk:
+                break
+            digest.update(chunk)
+        pack_sha = digest.digest()
+        self.file.write(pack_sha)
+        self.file.close()
+
+        names = sorted(self.entries)
+        idx = bytearray(b"\377tOc" + struct.pack(">I", 2))
+        fanout = [0] * 256
+        for sha in names:
+            fanout[sha[0]] += 1
+        total = 0
+        for i in range(256):
+            total += fanout[i]
+            fanout[i] = total
+        idx += struct.pack(">256I", *fanout)
+        idx += b"".join(names)
+        idx += b"".join(struct.pack(">I", self.entries[sha][0]) for sha in names)
+
+        large = []
+        for sha in names:
+            offset = self.entries[sha][1]
+            if offset < 0x80000000:
+                idx += struct.pack(">I", offset)
+            else:
+                idx += struct.pack(">I", 0x80000000 | len(large))
+                large.append(offset)
+        idx += b"".join(struct.pack(">Q", offset) for offset in large)
+        idx += pack_sha
+        idx += hashlib.sha1(idx).digest()
+
+        # 인덱스가 생기는 순간 팩이 보이므로 팩을 먼저 옮김
+        base = os.path.join(self.pack_dir, f"pack-{pack_sha.hex()}")
+        os.replace(self.tmp_path, base + ".pack")
+        with open(base + ".idx.tmp", "wb") as f:
+            f.write(idx)
+        os.replace(base + ".idx.tmp", base + ".idx")
+        return base + ".pack", base + ".idx"
+
+    def abort(self):
+        """작성 중인 임시 팩 삭제"""
+        self.file.close()
+        os.remove(self.tmp_path)
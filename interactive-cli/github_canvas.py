@@ -6,37 +6,77 @@ GitHub 잔디밭 대화형 에디터
 
 import curses
 import json
+import math
 import os
+import sys
+import time
+from collections import deque
 from datetime import datetime, timedelta
 from typing import List, Tuple
 
+from background import GenerationJob
+from canvas_grid import CanvasGrid
+from edit_history import EditHistory
+from pattern_store import load_grid
+
+# 화면 갱신 최대 빈도 (초당 60프레임). 그 사이에 들어온 입력은 모아서 한 번에 반영
+FRAME_INTERVAL = 1 / 60
+
+# 버튼을 누른 채 움직일 때도 마우스 위치를 보고하는 xterm 모드 (드래그로 칠하기)
+MOUSE_DRAG_ON = "\033[?1002h"
+MOUSE_DRAG_OFF = "\033[?1002l"
+
 
 class GitHubCanvas:
     """GitHub 잔디밭 캔버스"""
 
-    def __init__(self):
-        self.width = 52  # 52주
+    def __init__(self, width=52):
+        self.width = width  # 주 수 (1년 = 52주, 여러 해는 260주 이상)
         self.height = 7  # 일요일~토요일
-        self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        self.grid = CanvasGrid(self.width, self.height)
         self.cursor_x = 0
         self.cursor_y = 0
         self.intensity_levels = [0, 1, 2, 3, 4]  # 0=없음, 1-4=강도
-        self.current_intensity = 0
+        self.current_intensity = 4  # 마우스로 칠할 강도 (숫자 키로 바꿈)
+        self.history = EditHistory()  # 실행 취소/다시 실행 기록
+
+    def set_cell(self, y, x, intensity):
+        """셀 하나를 바꾸고 실행 취소 기록에 델타 추가"""
+        index = self.grid.index(y, x)
+        self.history.record(index, self.grid.get_index(index), intensity)
+        self.grid.set_index(index, intensity)
 
     def toggle_cell(self):
         """현재 셀의 강도 토글"""
-        current = self.grid[self.cursor_y][self.cursor_x]
+        current = self.grid[self.cursor_y, self.cursor_x]
         # 순환: 0 -> 1 -> 2 -> 3 -> 4 -> 0
-        self.grid[self.cursor_y][self.cursor_x] = (current + 1) % 5
+        self.set_cell(self.cursor_y, self.cursor_x, (current + 1) % 5)
 
     def clear_cell(self):
         """현재 셀 지우기"""
-        self.grid[self.cursor_y][self.cursor_x] = 0
+        self.set_cell(self.cursor_y, self.cursor_x, 0)
 
     def set_intensity(self, intensity):
-        """현재 셀에 특정 강도 설정"""
+        """현재 셀에 특정 강도 설정 (마우스로 칠할 강도도 같이 바뀜)"""
         if 0 <= intensity <= 4:
-            self.grid[self.cursor_y][self.cursor_x] = intensity
+            self.current_intensity = intensity
+            self.set_cell(self.cursor_y, self.cursor_x, intensity)
+
+    def paint_line(self, y0, x0, y1, x1):
+        """(y0, x0)부터 (y1, x1)까지 직선 위의 셀을 현재 강도로 칠하고 칠한 (y, x) 목록 반환
+
+        빠르게 드래그하면 마우스 이벤트 사이에 건너뛴 셀이 생기므로 두 위치 사이를 메웁니다.
+        커서는 마지막 셀로 옮깁니다.
+        """
+        steps = max(abs(y1 - y0), abs(x1 - x0), 1)
+        cells = []
+        for i in range(steps + 1):
+            y = y0 + round((y1 - y0) * i / steps)
+            x = x0 + round((x1 - x0) * i / steps)
+            self.set_cell(y, x, self.current_intensity)
+            cells.append((y, x))
+        self.cursor_y, self.cursor_x = y1, x1
+        return cells
 
     def move_cursor(self, dy, dx):
         """커서 이동"""
@@ -54,7 +94,7 @@ class GitHubCanvas:
 
         filepath = os.path.join(patterns_dir, filename)
         data = {
-            'grid': self.grid,
+            'grid': self.grid.to_list(),
             'width': self.width,
             'height': self.height,
             'created': datetime.now().isoformat()
@@ -63,35 +103,80 @@ class GitHubCanvas:
             json.dump(data, f, indent=2)
 
     def load_pattern(self, filename):
-        """JSON 파일에서 패턴 불러오기"""
+        """패턴 파일(.json 또는 .cgrid)에서 불러오기"""
         filepath = os.path.join('patterns', filename)
         if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-                self.grid = data['grid']
-                self.width = data['width']
-                self.height = data['height']
-                return True
+            grid = load_grid(filepath)
+            self.history.record_replace(self.grid.snapshot(), grid.snapshot())
+            self.replace_grid(grid)
+            return True
         return False
 
+    def replace_grid(self, grid):
+        """그리드 교체 (크기가 달라졌을 수 있으므로 커서를 캔버스 안으로)"""
+        self.grid = grid
+        self.width = grid.width
+        self.height = grid.height
+        self.cursor_x = min(self.cursor_x, self.width - 1)
+        self.cursor_y = min(self.cursor_y, self.height - 1)
+
     def clear_all(self):
-        """전체 캔버스 초기화"""
-        self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        """전체 캔버스 초기화 (칠해진 셀만 델타로 기록)"""
+        for index, intensity in self.grid.nonzero():
+            self.history.record(index, intensity, 0)
+        self.grid.clear()
+
+    def undo(self):
+        """마지막 편집 되돌리기 (바뀐 (y, x) 목록 반환, 그리드 교체면 None)"""
+        return self._apply_history(*self.history.undo(self.grid))
+
+    def redo(self):
+        """되돌린 편집 다시 적용"""
+        return self._apply_history(*self.history.redo(self.grid))
+
+    def _apply_history(self, grid, changed):
+        if changed is None:
+            self.replace_grid(grid)
+            return None
+        height = self.height
+        return [(index % height, index // height) for index in changed]
 
 
 class GitHubCanvasEditor:
     """대화형 캔버스 에디터"""
 
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, weeks=52, year=2024):
         self.stdscr = stdscr
-        self.canvas = GitHubCanvas()
+        self.canvas = GitHubCanvas(weeks)
+        self.year = year  # G로 커밋을 생성할 연도
         self.status_message = ""  # 상태 메시지 (동적)
+        # 백그라운드 커밋 생성 작업과 진행 상황 표시
+        self.job = None
+        self.job_message = ""
         self.style_mode = "shade"  # "shade" 또는 "block"
 
+        # 레이아웃
+        self.start_y = 2
+        self.start_x = 2
+        self.cell_width = 2
+
+        # 화면 갱신 상태: 전체 다시 그리기 여부와 바뀐 셀 목록
+        self.full_redraw = True
+        self.dirty_cells = set()
+        self.view_x = 0          # 보이는 첫 주 (가로 스크롤)
+        self.visible_weeks = 0
+        self.last_frame = 0.0    # 마지막으로 화면을 내보낸 시각 (time.monotonic)
+
+        # 마우스 드래그 상태: 칠하는 중이면 마지막으로 칠한 셀 (y, x), 아니면 None
+        self.drag_cell = None
+        # 읽었지만 아직 반영하지 않은 입력 [(키, 마우스 이벤트)] (질문의 답으로도 씀)
+        self.pending = deque()
+
         # 단축키 안내 (항상 표시)
         self.help_lines = [
-            "방향키: 이동 | Space: 색칠 | 숫자 0-4: 강도 | T: 스타일 변경",
-            "S: 저장 | L: 불러오기 | C: 초기화 | Q/ESC: 종료"
+            "방향키: 이동 | Space: 색칠 | 숫자 0-4: 강도 | 마우스 드래그: 칠하기 | T: 스타일 변경",
+            "U: 실행 취소 | R: 다시 실행 | S: 저장 | L: 불러오기 | C: 초기화 | Q/ESC: 종료",
+            "G: 커밋 생성 (백그라운드) | X: 생성 취소"
         ]
 
         # 색상 초기화
@@ -115,9 +200,36 @@ class GitHubCanvasEditor:
         self.shade_chars = ['⬜', '░░', '▒▒', '▓▓', '██']
         self.block_chars = ['  ', '██', '██', '██', '██']
 
+        # 스타일별 (강도별 색상 속성, 커서 속성)을 미리 계산
+        self.attr_cache = {}
+        for style in ("shade", "block"):
+            self.style_mode = style
+            self.attr_cache[style] = (
+                [self.get_color_pair(i) for i in range(5)],
+                self.get_color_pair(0, is_cursor=True),
+            )
+        self.style_mode = "shade"
+
         # 커서 숨기기
         curses.curs_set(0)
 
+        # 마우스: 누름/뗌을 클릭으로 합치지 않도록 간격 0, 드래그 중 위치 보고 켜기
+        mask = curses.BUTTON1_PRESSED | curses.BUTTON1_RELEASED | curses.REPORT_MOUSE_POSITION
+        self.mouse = curses.mousemask(mask)[0] != 0
+        if self.mouse:
+            curses.mouseinterval(0)
+        self.set_drag_reporting(True)
+
+    def set_drag_reporting(self, enabled):
+        """터미널의 드래그 위치 보고(1002 모드) 켜기/끄기 (마우스를 쓸 수 없으면 무시)"""
+        if self.mouse:
+            sys.stdout.write(MOUSE_DRAG_ON if enabled else MOUSE_DRAG_OFF)
+            sys.stdout.flush()
+
+    def close(self):
+        """드래그 위치 보고 끄기 (종료할 때, endwin 전에)"""
+        self.set_drag_reporting(False)
+
     def get_color_pair(self, intensity, is_cursor=False):
         """강도에 따른 색상 페어와 속성 반환"""
         if self.style_mode == "shade":
@@ -164,169 +276,408 @@ class GitHubCanvasEditor:
         else:
             self.style_mode = "shade"
             self.status_message = "✓ 음영 스타일로 변경"
-
-    def draw_canvas(self):
-        """캔버스 그리기"""
-        self.stdscr.clear()
-
-        # 제목
+        self.full_redraw = True
+
+    def update_viewport(self):
+        """터미널 크기에 맞춰 보이는 주 범위를 정하고, 커서가 보이도록 가로 스크롤"""
+        _, cols = self.stdscr.getmaxyx()
+        # 오른쪽에 요일 라벨(4칸) 자리를 남김
+        visible = max(1, (cols - self.start_x - 4) // self.cell_width)
+        visible = min(visible, self.canvas.width)
+        view_x = min(self.view_x, self.canvas.width - visible)
+
+        cursor_x = self.canvas.cursor_x
+        if cursor_x < view_x:
+            view_x = cursor_x
+        elif cursor_x >= view_x + visible:
+            view_x = cursor_x - visible + 1
+
+        if (view_x, visible) != (self.view_x, self.visible_weeks):
+            self.view_x = view_x
+            self.visible_weeks = visible
+            self.full_redraw = True
+
+    def draw_cell(self, y, x):
+        """셀 하나 그리기 (보이는 범위 밖이면 무시)"""
+        if not self.view_x <= x < self.view_x + self.visible_weeks:
+            return
+        attrs, cursor_attr = self.attr_cache[self.style_mode]
+        intensity = self.canvas.grid[y, x]
+        char = self.get_display_char(intensity)
+        color = attrs[intensity]
+
+        if y == self.canvas.cursor_y and x == self.canvas.cursor_x:
+            color = cursor_attr
+            # 커서 위치 표시 (음영 스타일만)
+            if self.style_mode == "shade":
+                char = "◆◆"  # 커서 전용 문자
+
+        py = self.start_y + y
+        px = self.start_x + (x - self.view_x) * self.cell_width
+        try:
+            self.stdscr.addstr(py, px, char, color)
+        except curses.error:
+            pass
+
+    def draw_static(self):
+        """셀 이외의 고정 요소 그리기 (제목, 요일 라벨, 범례, 단축키 안내)"""
         title = "🌷 GitHub 잔디밭 에디터"
         self.stdscr.addstr(0, 2, title, curses.A_BOLD)
 
-        # 캔버스 그리기
-        start_y = 2
-        start_x = 2
-        cell_width = 2
-
-        for y in range(self.canvas.height):
-            for x in range(self.canvas.width):
-                intensity = self.canvas.grid[y][x]
-                is_cursor = (y == self.canvas.cursor_y and x == self.canvas.cursor_x)
-
-                color = self.get_color_pair(intensity, is_cursor)
-                char = self.get_display_char(intensity)
-
-                # 커서 위치 표시 (음영 스타일만)
-                if is_cursor and self.style_mode == "shade":
-                    char = "◆◆"  # 커서 전용 문자
-
-                py = start_y + y
-                px = start_x + x * cell_width
-
-                try:
-                    self.stdscr.addstr(py, px, char, color)
-                except curses.error:
-                    pass
-
         # 요일 라벨
         days = ['일', '월', '화', '수', '목', '금', '토']
+        label_x = self.start_x + self.visible_weeks * self.cell_width + 2
         for i, day in enumerate(days):
             try:
-                self.stdscr.addstr(start_y + i, start_x + self.canvas.width * cell_width + 2, day)
+                self.stdscr.addstr(self.start_y + i, label_x, day)
             except curses.error:
                 pass
 
-        # 현재 위치 정보
-        info_y = start_y + self.canvas.height + 2
-        info = f"위치: ({self.canvas.cursor_x}, {self.canvas.cursor_y}) | 현재 강도: {self.canvas.grid[self.canvas.cursor_y][self.canvas.cursor_x]}"
-        self.stdscr.addstr(info_y, start_x, info)
-
         # 강도 범례 및 스타일 표시
-        legend_y = info_y + 1
+        attrs, _ = self.attr_cache[self.style_mode]
+        legend_y = self.start_y + self.canvas.height + 3
         style_name = "음영" if self.style_mode == "shade" else "블록"
-        self.stdscr.addstr(legend_y, start_x, f"강도 (스타일: {style_name}): ")
-        legend_offset = len(f"강도 (스타일: {style_name}): ")
-        for i in range(5):
-            color = self.get_color_pair(i)
-            char = self.get_display_char(i)
-            self.stdscr.addstr(legend_y, start_x + legend_offset + i * 4, char, color)
-            self.stdscr.addstr(legend_y, start_x + legend_offset + 2 + i * 4, f"{i} ")
+        legend = f"강도 (스타일: {style_name}): "
+        try:
+            self.stdscr.addstr(legend_y, self.start_x, legend)
+            legend_offset = len(legend)
+            for i in range(5):
+                char = self.get_display_char(i)
+                self.stdscr.addstr(legend_y, self.start_x + legend_offset + i * 4, char, attrs[i])
+                self.stdscr.addstr(legend_y, self.start_x + legend_offset + 2 + i * 4, f"{i} ")
+        except curses.error:
+            pass
 
         # 단축키 안내 (항상 표시)
         help_y = legend_y + 2
         for i, help_line in enumerate(self.help_lines):
             try:
-                self.stdscr.addstr(help_y + i, start_x, help_line, curses.A_DIM)
+                self.stdscr.addstr(help_y + i, self.start_x, help_line, curses.A_DIM)
             except curses.error:
                 pass
 
-        # 상태 메시지 (동적 - 명령 실행 결과)
-        if self.status_message:
-            status_y = help_y + len(self.help_lines) + 1
+    def draw_status(self):
+        """매 프레임 바뀔 수 있는 줄 그리기 (현재 위치, 상태 메시지)"""
+        info_y = self.start_y + self.canvas.height + 2
+        cursor_x, cursor_y = self.canvas.cursor_x, self.canvas.cursor_y
+        info = (f"위치: ({cursor_x}, {cursor_y}) | 현재 강도: {self.canvas.grid[cursor_y, cursor_x]}"
+                f" | 붓: {self.canvas.current_intensity}")
+        if self.visible_weeks < self.canvas.width:
+            last = self.view_x + self.visible_weeks
+            info += f" | 주 {self.view_x + 1}-{last}/{self.canvas.width}"
+        if self.job_message:
+            info += f" | {self.job_message}"
+
+        status_y = info_y + 4 + len(self.help_lines)
+        for y, text, attr in ((info_y, info, curses.A_NORMAL),
+                              (status_y, f"[상태] {self.status_message}" if self.status_message else "",
+                               curses.A_BOLD)):
             try:
-                self.stdscr.addstr(status_y, start_x, f"[상태] {self.status_message}", curses.A_BOLD)
+                self.stdscr.move(y, self.start_x)
+                self.stdscr.clrtoeol()
+                self.stdscr.addstr(y, self.start_x, text, attr)
             except curses.error:
                 pass
 
-        self.stdscr.refresh()
+    def draw_canvas(self):
+        """캔버스 그리기
+
+        바뀐 셀(이전/현재 커서, 칠한 셀)만 다시 그리고, 스크롤/스타일 변경/전체 편집
+        때만 화면 전체를 다시 그립니다. 출력은 noutrefresh/doupdate로 한 번에 내보냅니다.
+        """
+        self.update_viewport()
+
+        if self.full_redraw:
+            self.stdscr.erase()
+            self.draw_static()
+            for y in range(self.canvas.height):
+                for x in range(self.view_x, self.view_x + self.visible_weeks):
+                    self.draw_cell(y, x)
+            self.full_redraw = False
+        else:
+            for y, x in self.dirty_cells:
+                self.draw_cell(y, x)
+        self.dirty_cells.clear()
+
+        self.draw_status()
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+        self.last_frame = time.monotonic()
+
+    def mark_dirty(self, y, x):
+        """다음 프레임에 다시 그릴 셀 표시"""
+        self.dirty_cells.add((y, x))
+
+    def confirm(self, message):
+        """상태 줄에 질문을 보여주고 키 하나를 받음 (생성 중에도 입력을 기다림)
+
+        질문을 연 키와 같은 배치로 이미 읽은 입력이 있으면 (예: 빠르게 친 "qy") 다음 입력을 답으로
+        씁니다. 없으면 드래그 위치 보고를 끈 채 키를 기다립니다.
+        """
+        self.status_message = message
+        self.draw_canvas()
+        if self.pending:
+            return self.pending.popleft()[0]
+        self.set_drag_reporting(False)
+        self.stdscr.timeout(-1)
+        try:
+            return self.stdscr.getch()
+        finally:
+            self.set_drag_reporting(True)
+
+    def start_generation(self):
+        """현재 그리드의 스냅샷으로 백그라운드 커밋 생성 시작"""
+        if self.job is not None:
+            self.status_message = "이미 커밋을 생성하는 중입니다 (X: 취소)"
+            return
+        if not any(True for _ in self.canvas.grid.nonzero()):
+            self.status_message = "✗ 칠한 칸이 없습니다"
+            return
+        answer = self.confirm(f"현재 그림으로 {self.year}년 커밋을 생성하시겠습니까? (y/n)")
+        if answer not in [ord('y'), ord('Y')]:
+            self.status_message = "커밋 생성을 취소했습니다."
+            return
+        self.job = GenerationJob(self.canvas.grid.snapshot(), self.year).start()
+        self.job_message = "⏳ 생성 준비 중"
+        self.status_message = "✓ 백그라운드에서 커밋 생성을 시작했습니다 (편집 계속 가능)"
+
+    def poll_generation(self):
+        """생성 작업의 이벤트를 모두 반영 (기다리지 않음)"""
+        for event in self.job.poll():
+            kind = event[0]
+            if kind == "start":
+                self.job_message = f"⏳ 커밋 0/{event[1]}"
+            elif kind == "progress":
+                _, done, total, rate = event
+                percent = done / total if total else 1.0
+                self.job_message = f"⏳ 커밋 {done}/{total} ({percent:.0%}, {rate:,.0f}커밋/초)"
+            elif kind == "done":
+                self.job = None
+                self.job_message = ""
+                self.status_message = f"✅ 커밋 {event[1]}개 생성 완료 (git push -f origin main)"
+            elif kind == "cancelled":
+                self.job = None
+                self.job_message = ""
+                self.status_message = (f"생성 취소: {event[1]}개 커밋까지 확정 "
+                                       "(git_generator.py resume으로 이어서 생성)")
+            elif kind == "error":
+                self.job = None
+                self.job_message = ""
+                self.status_message = f"✗ 커밋 생성 실패: {event[1]}"
+            if self.job is None:
+                return
+
+    def stop_generation(self):
+        """진행 중인 생성을 취소하고 정리될 때까지 기다림 (종료할 때)"""
+        if self.job is None:
+            return
+        self.job.cancel()
+        self.job_message = "생성 취소 중..."
+        self.draw_canvas()
+        self.job.wait()
+        self.poll_generation()
+
+    def cell_at(self, screen_y, screen_x):
+        """화면 좌표의 셀 (y, x) (캔버스 밖이면 None)"""
+        y = screen_y - self.start_y
+        column = screen_x - self.start_x
+        if not 0 <= y < self.canvas.height or column < 0:
+            return None
+        x = column // self.cell_width
+        if x >= self.visible_weeks:
+            return None
+        return y, self.view_x + x
+
+    def handle_mouse(self, event):
+        """마우스 이벤트 하나 반영: 왼쪽 버튼을 누르면 칠하기 시작, 누른 채 움직이면 이어서 칠함
+
+        드래그 위치 보고(1002) 모드는 버튼을 누르고 있을 때만 움직임을 보고하므로 위치 이벤트는
+        모두 드래그입니다. 입력이 한꺼번에 들어오면 curses가 누름 이벤트를 위치 이벤트로 합치기도
+        하므로 누름이 없어도 위치 이벤트부터 칠하기 시작합니다.
+        """
+        _, screen_x, screen_y, _, state = event
+        if state & curses.BUTTON1_PRESSED:
+            self.drag_cell = None
+        cell = self.cell_at(screen_y, screen_x)
+        if cell is not None:
+            # 마지막으로 칠한 셀부터 이어서 칠함 (드래그를 시작할 때는 그 셀만)
+            for y, x in self.canvas.paint_line(*(self.drag_cell or cell), *cell):
+                self.mark_dirty(y, x)
+            self.drag_cell = cell
+            self.status_message = ""
+        if state & curses.BUTTON1_RELEASED:
+            self.drag_cell = None
+
+    def read_events(self):
+        """한 프레임 동안의 입력을 모아서 [(키, 마우스 이벤트 또는 None)]으로 반환
+
+        첫 입력은 기다리고 (생성 중에는 100ms까지, 입력이 없으면 빈 목록), 이후에는 쌓인 입력을
+        기다리지 않고 모두 꺼냅니다. 직전 프레임에서 FRAME_INTERVAL이 지나지 않았으면 남은 시간 동안
+        들어오는 입력도 같은 배치에 넣습니다. curses의 마우스 이벤트 큐는 작으므로 KEY_MOUSE를 읽으면
+        바로 getmouse로 꺼내 둡니다.
+        """
+        self.stdscr.timeout(100 if self.job else -1)
+        key = self.stdscr.getch()
+        events = []
+        while key != -1:
+            if key == curses.KEY_MOUSE:
+                try:
+                    events.append((key, curses.getmouse()))
+                except curses.error:
+                    pass  # 해석할 수 없는 마우스 입력은 무시
+            else:
+                events.append((key, None))
+            remaining = self.last_frame + FRAME_INTERVAL - time.monotonic()
+            self.stdscr.timeout(max(0, math.ceil(remaining * 1000)))
+            key = self.stdscr.getch()
+        return events
 
     def run(self):
-        """에디터 실행"""
+        """에디터 실행
+
+        입력을 한 프레임 분량씩 모아 모두 반영한 뒤 화면을 한 번만 다시 그립니다.
+        방향키를 누르고 있거나 빠르게 드래그해도 화면 갱신이 입력을 따라가지 못해 밀리지 않습니다.
+        """
         while True:
             self.draw_canvas()
 
             try:
-                key = self.stdscr.getch()
+                self.pending.extend(self.read_events())
             except KeyboardInterrupt:
                 break
+            if self.job is not None:
+                self.poll_generation()
+            # 질문(G, Q)은 남은 입력에서 답을 꺼내 감. handle_key가 False(종료)면 남은 입력은 버림
+            running = True
+            while running and self.pending:
+                running = self.handle_key(*self.pending.popleft())
+            if not running:
+                break
 
-            # 방향키
-            if key == curses.KEY_UP:
-                self.canvas.move_cursor(-1, 0)
-                self.status_message = ""  # 상태 메시지 지우기
-            elif key == curses.KEY_DOWN:
-                self.canvas.move_cursor(1, 0)
-                self.status_message = ""
-            elif key == curses.KEY_LEFT:
-                self.canvas.move_cursor(0, -1)
-                self.status_message = ""
-            elif key == curses.KEY_RIGHT:
-                self.canvas.move_cursor(0, 1)
-                self.status_message = ""
-
-            # 스페이스: 토글
-            elif key == ord(' '):
-                self.canvas.toggle_cell()
-                self.status_message = ""
-
-            # 숫자 0-4: 강도 설정
-            elif key in [ord('0'), ord('1'), ord('2'), ord('3'), ord('4')]:
-                intensity = int(chr(key))
-                self.canvas.set_intensity(intensity)
-                self.status_message = ""
-
-            # Delete/Backspace: 셀 지우기
-            elif key in [curses.KEY_BACKSPACE, curses.KEY_DC, 127]:
-                self.canvas.clear_cell()
-                self.status_message = ""
-
-            # T: 스타일 토글
-            elif key in [ord('t'), ord('T')]:
-                self.toggle_style()
-
-            # S: 저장
-            elif key in [ord('s'), ord('S')]:
+        # 종료할 때 진행 중인 생성은 확정된 지점까지만 남기고 정리
+        self.stop_generation()
+
+    def handle_key(self, key, mouse=None):
+        """입력 하나 반영 (종료하면 False 반환)"""
+        # 커서 이동/칠하기는 이전 커서 위치와 새 커서 위치만 다시 그림
+        self.mark_dirty(self.canvas.cursor_y, self.canvas.cursor_x)
+
+        if key == curses.KEY_RESIZE:
+            self.full_redraw = True
+
+        # 마우스: 왼쪽 버튼을 누르거나 누른 채 움직이면 현재 붓 강도로 칠하기
+        elif key == curses.KEY_MOUSE:
+            self.handle_mouse(mouse)
+
+        # 방향키
+        elif key == curses.KEY_UP:
+            self.canvas.move_cursor(-1, 0)
+            self.status_message = ""  # 상태 메시지 지우기
+        elif key == curses.KEY_DOWN:
+            self.canvas.move_cursor(1, 0)
+            self.status_message = ""
+        elif key == curses.KEY_LEFT:
+            self.canvas.move_cursor(0, -1)
+            self.status_message = ""
+        elif key == curses.KEY_RIGHT:
+            self.canvas.move_cursor(0, 1)
+            self.status_message = ""
+
+        # 스페이스: 토글
+        elif key == ord(' '):
+            self.canvas.toggle_cell()
+            self.status_message = ""
+
+        # 숫자 0-4: 강도 설정
+        elif key in [ord('0'), ord('1'), ord('2'), ord('3'), ord('4')]:
+            intensity = int(chr(key))
+            self.canvas.set_intensity(intensity)
+            self.status_message = ""
+
+        # Delete/Backspace: 셀 지우기
+        elif key in [curses.KEY_BACKSPACE, curses.KEY_DC, 127]:
+            self.canvas.clear_cell()
+            self.status_message = ""
+
+        # T: 스타일 토글
+        elif key in [ord('t'), ord('T')]:
+            self.toggle_style()
+
+        # S: 저장
+        elif key in [ord('s'), ord('S')]:
+            self.canvas.save_pattern('pattern.json')
+            self.status_message = "✓ 저장 완료: patterns/pattern.json"
+
+        # L: 불러오기
+        elif key in [ord('l'), ord('L')]:
+            if self.canvas.load_pattern('pattern.json'):
+                self.full_redraw = True
+                self.status_message = "✓ 불러오기 완료: patterns/pattern.json"
+            else:
+                self.status_message = "✗ patterns/pattern.json 파일을 찾을 수 없습니다"
+
+        # C: 초기화
+        elif key in [ord('c'), ord('C')]:
+            self.canvas.clear_all()
+            self.full_redraw = True
+            self.status_message = "✓ 캔버스 초기화 완료"
+
+        # U: 실행 취소, R: 다시 실행
+        elif key in [ord('u'), ord('U'), ord('r'), ord('R')]:
+            undo = key in [ord('u'), ord('U')]
+            changed = self.canvas.undo() if undo else self.canvas.redo()
+            if changed is None:
+                self.full_redraw = True
+            else:
+                for y, x in changed:
+                    self.mark_dirty(y, x)
+            if changed == []:
+                self.status_message = "되돌릴 편집이 없습니다" if undo else "다시 실행할 편집이 없습니다"
+            else:
+                self.status_message = "✓ 실행 취소" if undo else "✓ 다시 실행"
+
+        # G: Git 커밋 생성 (백그라운드), X: 생성 취소
+        elif key in [ord('g'), ord('G')]:
+            self.start_generation()
+        elif key in [ord('x'), ord('X')]:
+            if self.job is None:
+                self.status_message = "진행 중인 커밋 생성이 없습니다"
+            else:
+                self.job.cancel()
+                self.job_message = "생성 취소 중..."
+
+        # Q 또는 ESC: 종료
+        elif key in [ord('q'), ord('Q'), 27]:
+            # 저장 확인
+            confirm = self.confirm("저장하고 종료하시겠습니까? (y: 저장 후 종료 | n: 저장 안 함 | 기타: 취소)")
+            if confirm in [ord('y'), ord('Y')]:
                 self.canvas.save_pattern('pattern.json')
-                self.status_message = "✓ 저장 완료: patterns/pattern.json"
-
-            # L: 불러오기
-            elif key in [ord('l'), ord('L')]:
-                if self.canvas.load_pattern('pattern.json'):
-                    self.status_message = "✓ 불러오기 완료: patterns/pattern.json"
-                else:
-                    self.status_message = "✗ patterns/pattern.json 파일을 찾을 수 없습니다"
-
-            # C: 초기화
-            elif key in [ord('c'), ord('C')]:
-                self.canvas.clear_all()
-                self.status_message = "✓ 캔버스 초기화 완료"
-
-            # G: Git 커밋 생성
-            elif key in [ord('g'), ord('G')]:
-                self.status_message = "Git 커밋 생성 준비 중... (구현 예정)"
-
-            # Q 또는 ESC: 종료
-            elif key in [ord('q'), ord('Q'), 27]:
-                # 저장 확인
-                self.status_message = "저장하고 종료하시겠습니까? (y: 저장 후 종료 | n: 저장 안 함 | 기타: 취소)"
+                self.status_message = "✓ 저장 완료 (patterns/pattern.json). 종료합니다."
                 self.draw_canvas()
-                confirm = self.stdscr.getch()
-                if confirm in [ord('y'), ord('Y')]:
-                    self.canvas.save_pattern('pattern.json')
-                    self.status_message = "✓ 저장 완료 (patterns/pattern.json). 종료합니다."
-                    self.draw_canvas()
-                    break
-                elif confirm in [ord('n'), ord('N')]:
-                    break
-                else:
-                    self.status_message = "종료를 취소했습니다."
-
-
-def main(stdscr):
+                return False
+            elif confirm in [ord('n'), ord('N')]:
+                return False
+            else:
+                self.status_message = "종료를 취소했습니다."
+
+        # 이번 입력으로 바뀐 셀들을 실행 취소 한 단계로 묶음 (드래그는 버튼을 뗄 때까지 한 단계)
+        if self.drag_cell is None:
+            self.canvas.history.commit()
+        self.mark_dirty(self.canvas.cursor_y, self.canvas.cursor_x)
+        return True
+
+
+def main(stdscr, weeks=52, year=2024):
     """메인 함수"""
-    editor = GitHubCanvasEditor(stdscr)
-    editor.run()
+    editor = GitHubCanvasEditor(stdscr, weeks, year)
+    try:
+        editor.run()
+    finally:
+        editor.close()
 
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    # 사용법: python3 github_canvas.py [주 수] [연도]  (예: 260 = 5년, 연도는 G로 생성할 때 사용)
+    weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 52
+    year = int(sys.argv[2]) if len(sys.argv) > 2 else 2024
+    curses.wrapper(main, weeks, year)
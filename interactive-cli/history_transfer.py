@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+생성한 히스토리 내보내기/가져오기
+생성한 커밋 범위(base..head)를 git 번들(.bundle) 또는 팩(.pack) 파일 하나로 내보내고,
+다른 저장소에서 그 파일을 한 번에 가져와 브랜치를 옮깁니다. 한 번 생성한 결과를
+여러 저장소에 그대로 적용할 수 있고, 가져올 때는 파일을 순차적으로 읽기만 합니다.
+
+- 번들: 시작 커밋(전제 조건)과 끝 커밋의 ref가 함께 기록되어 git bundle verify로 확인 가능
+- 팩: 오브젝트만 들어 있으므로 가져올 때 팩 안의 커밋 관계로 시작/끝 커밋을 찾음
+"""
+
+import os
+import subprocess
+
+from git_backends import git_output
+
+EXPORT_REF = "refs/canvas-export/head"
+BUNDLE_SIGNATURES = (b"# v2 git bundle\n", b"# v3 git bundle\n")
+
+
+def file_format(path):
+    """파일 앞부분으로 형식 판별 ("bundle" 또는 "pack")"""
+    with open(path, "rb") as f:
+        head = f.read(16)
+    if head.startswith(BUNDLE_SIGNATURES):
+        return "bundle"
+    if head.startswith(b"PACK"):
+        return "pack"
+    raise ValueError(f"git 번들이나 팩 파일이 아닙니다: {path}")
+
+
+def export_range(base, head, path):
+    """base..head 커밋 범위를 path에 쓰기 (확장자가 .pack이면 팩, 아니면 번들)
+
+    base가 None이면 head까지의 전체 히스토리를 내보냅니다.
+    반환값: (형식, 커밋 수)
+    """
+    revisions = [head] + ([f"^{base}"] if base else [])
+    commits = int(git_output(["rev-list", "--count"] + revisions))
+    if path.endswith(".pack"):
+        with open(path, "wb") as f:
+            process = subprocess.Popen(
+                ["git", "pack-objects", "--revs", "--stdout", "-q", "--delta-base-offset"],
+                stdin=subprocess.PIPE,
+                stdout=f
+            )
+            process.communicate("\n".join(revisions).encode() + b"\n")
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, "git pack-objects")
+        return "pack", commits
+
+    # 번들은 끝 커밋을 ref 이름으로 기록하므로 임시 ref를 거쳐 만듦
+    subprocess.run(["git", "update-ref", EXPORT_REF, head], check=True)
+    try:
+        subprocess.run(["git", "bundle", "create", path, EXPORT_REF] + revisions[1:],
+                       check=True, capture_output=True)
+    finally:
+        subprocess.run(["git", "update-ref", "-d", EXPORT_REF], check=True)
+    return "bundle", commits
+
+
+def read_bundle_header(path):
+    """번들 헤더에서 (전제 조건 커밋 목록, [(커밋, ref)]) 읽기"""
+    prerequisites, heads = [], []
+    with open(path, "rb") as f:
+        f.readline()
+        for line in f:
+            line = line.rstrip(b"\n").decode()
+            if not line:
+                break
+            if line.startswith("@"):
+                # v3의 기능 표시 (예: @object-format=sha1)
+                continue
+            if line.startswith("-"):
+                prerequisites.append(line[1:].split(" ", 1)[0])
+            else:
+                heads.append(tuple(line.split(" ", 1)))
+    return prerequisites, heads
+
+
+def pack_range(idx_path):
+    """가져온 팩 안의 커밋들로 (시작 커밋(팩 밖의 부모, 없으면 None), 끝 커밋, 커밋 수) 계산"""
+    with open(idx_path, "rb") as f:
+        listing = subprocess.run(["git", "show-index"], stdin=f, check=True,
+                                 capture_output=True, text=True).stdout
+    shas = [line.split()[1] for line in listing.splitlines()]
+    types = subprocess.run(
+        ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+        input="\n".join(shas) + "\n", check=True, capture_output=True, text=True
+    ).stdout
+    commits = [line.split()[0] for line in types.splitlines() if line.endswith(" commit")]
+    relations = subprocess.run(
+        ["git", "log", "--no-walk=unsorted", "--format=%H %P", "--stdin"],
+        input="\n".join(commits) + "\n", check=True, capture_output=True, text=True
+    ).stdout
+    in_pack = set(commits)
+    parents = set()
+    for line in relations.splitlines():
+        parents.update(line.split()[1:])
+    tips = [sha for sha in commits if sha not in parents]
+    outside = parents - in_pack
+    if len(tips) != 1 or len(outside) > 1:
+        raise ValueError("팩에 일렬로 이어진 커밋 범위 하나만 들어 있어야 합니다")
+    return (outside.pop() if outside else None), tips[0], len(commits)
+
+
+def import_file(path):
+    """번들/팩 파일의 오브젝트를 한 번에 저장소로 가져오기 (브랜치는 옮기지 않음)
+
+    반환값: (시작 커밋 또는 None, 끝 커밋, 커밋 수)
+    """
+    path = os.path.abspath(path)
+    if file_format(path) == "bundle":
+        prerequisites, heads = read_bundle_header(path)
+        if len(heads) != 1 or len(prerequisites) > 1:
+            raise ValueError("커밋 범위 하나를 내보낸 번들이 아닙니다")
+        # 전제 조건 커밋이 없으면 verify가 실패함
+        result = subprocess.run(["git", "bundle", "verify", "-q", path], capture_output=True,
+                                text=True)
+        if result.returncode != 0:
+            raise ValueError(f"번들의 시작 커밋 {prerequisites[0][:12]}이 이 저장소에 없습니다"
+                             if prerequisites else result.stderr.strip())
+        subprocess.run(["git", "bundle", "unbundle", path], check=True, capture_output=True)
+        base = prerequisites[0] if prerequisites else None
+        head = heads[0][0]
+        revisions = f"{base}..{head}" if base else head
+        return base, head, int(git_output(["rev-list", "--count", revisions]))
+
+    # 팩: index-pack이 저장소의 objects/pack에 팩과 인덱스를 씀
+    with open(path, "rb") as f:
+        output = subprocess.run(["git", "index-pack", "--stdin", "--fix-thin"], stdin=f,
+                                check=True, capture_output=True, text=True).stdout
+    pack_name = output.split()[-1]
+    objects_dir = git_output(["rev-parse", "--git-path", "objects"])
+    return pack_range(os.path.join(objects_dir, "pack", f"pack-{pack_name}.idx"))
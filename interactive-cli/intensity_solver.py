@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+최소 커밋 수 계산 (--counts minimal, 선택 사항)
+
+주의: 이 모듈은 GitHub의 색 구분을 구현하지 않은 근사입니다. GitHub는 커밋이 있는 날들의
+분포(사분위수)로 단계 경계를 정하지만, 여기서는 표시 기간(연도)의 하루 최대 커밋 수
+peak에 대한 고정 비율로 경계를 둡니다. 커밋 c개인 날의 단계는
+
+    0개 → 0단계, 그 외 → ceil(4 * c / peak)  (peak의 1/4, 2/4, 3/4가 경계)
+
+로 계산합니다. 분포가 한쪽으로 치우친 해에는 계산한 단계와 실제 표시되는 색이 다를 수
+있으므로 기본 방식(random)이 아니라 --counts minimal로 골랐을 때만 사용합니다.
+
+칠한 칸마다 원하는 단계가 나오는 가장 작은 커밋 수를 구하되, 이미 있는 커밋은
+지울 수 없으므로 기존 날짜별 커밋 수를 하한으로 두고, 칠하지 않은 날의 기존 커밋이
+만드는 peak도 함께 고려합니다.
+"""
+
+from collections import Counter, namedtuple
+
+LEVELS = 4
+
+# counts: 칠한 칸별 최종 커밋 수 (기존 + 생성), peak: 기간의 하루 최대 커밋 수,
+# shift: 모든 칸을 올린 단계 수 (4단계 칸이 없어 그대로는 불가능했을 때)
+Solution = namedtuple("Solution", "counts peak shift")
+
+
+def github_level(count, peak):
+    """하루 최대 커밋 수가 peak일 때 커밋 count개인 날이 표시되는 단계"""
+    if count <= 0:
+        return 0
+    return min(LEVELS, -(-count * LEVELS // peak))
+
+
+def level_range(level, peak):
+    """peak 기준으로 level 단계가 되는 커밋 수 범위 (최소, 최대)"""
+    low = (level - 1) * peak // LEVELS + 1
+    high = peak if level == LEVELS else level * peak // LEVELS
+    return low, high
+
+
+def _cost(groups, peak, others_peak):
+    """peak일 때 추가할 커밋 수 (불가능하면 None)
+
+    groups: {(기존 커밋 수, 단계): 칸 수}
+    """
+    total = 0
+    # 최대값인 날이 실제로 있어야 peak가 맞음 (없으면 4단계 칸 하나를 peak까지 올림)
+    anchored = others_peak == peak
+    gap = None
+    for (have, level), n in groups.items():
+        low, high = level_range(level, peak)
+        if low > high or have > high:
+            return None
+        final = max(have, low)
+        total += (final - have) * n
+        if final == peak:
+            anchored = True
+        elif level == LEVELS and (gap is None or peak - final < gap):
+            gap = peak - final
+    if anchored:
+        return total
+    if gap is None:
+        return None
+    return total + gap
+
+
+def _search(cells, others_peak):
+    """추가 커밋이 가장 적은 peak 찾기 (같으면 작은 peak)"""
+    groups = Counter(cells)
+    highest = max([others_peak, 1] + [have for have, _ in cells])
+    # peak가 기존 최대값의 4배를 넘으면 기존 커밋은 모두 1단계 범위에 들어가므로
+    # 그 이상에서는 비용이 줄지 않음
+    best = None
+    for peak in range(highest, max(4 * highest, LEVELS) + LEVELS + 1):
+        cost = _cost(groups, peak, others_peak)
+        if cost is not None and (best is None or cost < best[0]):
+            best = (cost, peak)
+    return best
+
+
+def solve(cells, others_peak=0):
+    """칠한 칸들이 원하는 단계로 보이는 최소 커밋 수 계산
+
+    cells: 날짜 순서의 (기존 커밋 수, 원하는 단계 1~4) 목록
+    others_peak: 칠하지 않은 날(같은 기간)의 기존 하루 최대 커밋 수
+    """
+    cells = [(have, min(max(level, 1), LEVELS)) for have, level in cells]
+    if not cells:
+        return Solution([], others_peak, 0)
+
+    shift = 0
+    best = _search(cells, others_peak)
+    if best is None:
+        # 기간에서 가장 많은 날은 항상 4단계로 보이므로, 4단계 칸이 없으면
+        # 가장 진한 칸이 4단계가 되도록 모든 칸을 같은 만큼 올림
+        shift = LEVELS - max(level for _, level in cells)
+        cells = [(have, level + shift) for have, level in cells]
+        best = _search(cells, others_peak)
+    _, peak = best
+
+    counts = []
+    for have, level in cells:
+        low, _ = level_range(level, peak)
+        counts.append(max(have, low))
+    if others_peak != peak and peak not in counts:
+        # 최대값인 날을 만들기 위해 peak에 가장 가까운 4단계 칸 하나를 올림
+        top = max(count for count, (_, level) in zip(counts, cells) if level == LEVELS)
+        counts[counts.index(top)] = peak
+    return Solution(counts, peak, shift)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+메모리 저장소
+오브젝트와 ref를 메모리에만 두는 저장소입니다. memory 백엔드가 커밋을 여기에 기록하므로
+디스크나 git 프로세스 없이 계획을 끝까지 실행해 볼 수 있고 (테스트, 계획/payload 비용만 측정),
+마지막에 flush()로 실제 저장소에 팩 하나와 ref 갱신으로 한 번에 옮길 수 있습니다.
+
+실제 저장소의 ObjectStore를 넘기면 메모리에 없는 오브젝트와 ref는 그 저장소에서 읽으므로
+기존 브랜치 위에 이어서 생성할 수 있습니다 (읽기만 하고 쓰지는 않음).
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from git_objects import ObjectStore, PackWriter, find_git_dir, object_id, read_identity
+
+
+def author_day(line):
+    """커밋의 author 줄에서 작성자 시간대 기준 날짜 ordinal 계산 (git log --date=short와 같음)"""
+    epoch, offset = line.rsplit(b" ", 2)[1:]
+    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    tz = timezone(timedelta(minutes=-minutes if offset[:1] == b"-" else minutes))
+    return datetime.fromtimestamp(int(epoch), tz).toordinal()
+
+
+class MemoryRepository(ObjectStore):
+    """오브젝트와 ref를 메모리에 두는 저장소
+
+    ObjectStore의 읽기 메서드(read, read_ref, commit_tree, tree_entries 등)와
+    PackWriter의 add를 함께 제공하므로 팩 백엔드의 커밋 생성 코드를 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, store=None, ident=b"canvas <canvas@localhost>", head="refs/heads/main",
+                 prefix=""):
+        # 디렉토리 경로는 쓰지 않으므로 ObjectStore.__init__은 부르지 않음
+        self.store = store
+        self.ident = ident
+        self.head = head
+        # payload 파일 앞에 붙일 저장소 루트 기준 경로 (예: "interactive-cli/")
+        self.prefix = prefix
+        self.objects = {}  # 해시 -> (타입 코드, 내용)
+        self.refs = {}
+        # flush할 때 실제 저장소의 ref가 그대로인지 확인하기 위해 처음 읽은 값 기록
+        self.seen_refs = {}
+
+    @classmethod
+    def open(cls, start="."):
+        """현재 저장소를 읽기 전용 바탕으로 하는 메모리 저장소"""
+        root, git_dir = find_git_dir(start)
+        store = ObjectStore(git_dir)
+        prefix = ""
+        if root:
+            prefix = os.path.relpath(os.path.abspath(start), root).replace(os.sep, "/")
+            prefix = "" if prefix == "." else prefix + "/"
+        return cls(store, read_identity(git_dir).encode(), store.head_ref(), prefix)
+
+    def add(self, type_code, data, sha=None):
+        """오브젝트 추가 (PackWriter.add와 같음). 해시 반환"""
+        if sha is None:
+            sha = object_id(type_code, data)
+        if sha not in self.objects:
+            self.objects[sha] = (type_code, data)
+        return sha
+
+    def read(self, sha):
+        if sha in self.objects:
+            return self.objects[sha]
+        if self.store is not None:
+            return self.store.read(sha)
+        raise KeyError(f"오브젝트를 찾을 수 없습니다: {sha.hex()}")
+
+    def head_ref(self):
+        return self.head
+
+    def read_ref(self, ref):
+        if ref in self.refs:
+            return self.refs[ref]
+        if ref not in self.seen_refs:
+            self.seen_refs[ref] = self.store.read_ref(ref) if self.store is not None else None
+        return self.seen_refs[ref]
+
+    def write_ref(self, ref, sha):
+        self.refs[ref] = sha
+
+    def log(self, commit):
+        """commit부터 첫 번째 부모를 따라가며 (해시, 커밋 내용) 생성"""
+        sha = bytes.fromhex(commit) if isinstance(commit, str) else commit
+        while sha:
+            _, data = self.read(sha)
+            yield sha, data
+            sha = None
+            for line in data.split(b"\n"):
+                if line.startswith(b"parent "):
+                    sha = bytes.fromhex(line[7:].decode())
+                    break
+                if not line:
+                    break
+
+    def day_counts(self, commit):
+        """commit까지의 히스토리의 날짜별 커밋 수 ({날짜 ordinal: 커밋 수}, read_day_counts와 같음)"""
+        counts = {}
+        for _, data in self.log(commit):
+            for line in data.split(b"\n"):
+                if line.startswith(b"author "):
+                    day = author_day(line)
+                    counts[day] = counts.get(day, 0) + 1
+                    break
+        return counts
+
+    def flush(self, git_dir=None):
+        """메모리의 오브젝트를 실제 저장소에 팩 하나로 쓰고 바뀐 ref를 갱신
+
+        git_dir이 없으면 바탕으로 넘긴 저장소에 씁니다. 처음 읽은 뒤 실제 ref가 바뀌었으면
+        (바탕 저장소가 없었다면 ref가 이미 있으면) 아무것도 쓰지 않고 ValueError를 냅니다.
+        반환값: 쓴 오브젝트 수
+        """
+        store = ObjectStore(git_dir) if git_dir else self.store
+        if store is None:
+            raise ValueError("기록할 저장소가 없습니다 (git_dir을 지정하세요)")
+        for ref in self.refs:
+            if store.read_ref(ref) != self.seen_refs.get(ref):
+                raise ValueError(f"{ref}가 메모리에서 생성하는 동안 바뀌었거나 이미 있습니다")
+
+        count = len(self.objects)
+        if count:
+            writer = PackWriter(store.objects_dir)
+            for sha, (type_code, data) in self.objects.items():
+                writer.add(type_code, data, sha)
+            writer.finish()
+        for ref, sha in self.refs.items():
+            store.write_ref(ref, sha)
+
+        # 이후에는 기록한 저장소를 바탕으로 이어서 생성
+        self.store = store
+        self.seen_refs.update(self.refs)
+        self.refs.clear()
+        self.objects.clear()
+        return count
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+패턴 파일 읽기/쓰기와 패턴 라이브러리 색인
+
+JSON 패턴(.json) 외에 작은 바이너리 패턴(.cgrid)을 지원합니다.
+
+.cgrid 형식 (리틀 엔디언):
+    헤더 19바이트: 매직 b"CGRD", 버전(1), 인코딩, 주 수(u16), 요일 수(u8),
+                  연도(u16, 0=없음), CRC32(u32, 풀어낸 셀 바이트), 본문 길이(u32)
+    본문: 인코딩 0 = 셀 2개를 1바이트에 (하위 4비트 먼저)
+          인코딩 1 = (반복 수, 강도) 쌍의 런 길이 인코딩
+    셀 순서는 CanvasGrid와 같은 주(열) 단위입니다. 저장할 때 더 작은 인코딩을 고릅니다.
+
+patterns/.index.json에는 파일별 (수정 시각, 크기, 메타데이터, 인코딩된 본문)을 저장하여
+목록/미리보기에서 파일을 다시 파싱하지 않습니다. 바뀐 파일만 다시 읽습니다.
+"""
+
+import base64
+import json
+import mmap
+import os
+import re
+import struct
+import zlib
+from datetime import datetime
+
+from canvas_grid import CanvasGrid
+
+MAGIC = b"CGRD"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHBHII")
+ENCODING_NIBBLE = 0
+ENCODING_RLE = 1
+
+INDEX_FILE = ".index.json"
+PATTERN_EXTENSIONS = (".json", ".cgrid")
+
+# 같은 바이트가 최대 255번 반복되는 구간
+RUN = re.compile(rb"(.)\1{0,254}", re.DOTALL)
+# 한 바이트에 담긴 셀 2개 분리용 변환표
+LOW_NIBBLE = bytes(i & 0x0F for i in range(256))
+HIGH_NIBBLE = bytes(i >> 4 for i in range(256))
+
+
+def encode_cells(data):
+    """셀 바이트를 (인코딩, 본문)으로 압축 (더 작은 쪽 선택)"""
+    low, high = data[0::2], data[1::2]
+    nibbles = bytes(a | b << 4 for a, b in zip(low, high + b"\x00"))
+    runs = b"".join(bytes((len(m.group()), m.group()[0])) for m in RUN.finditer(data))
+    if len(runs) < len(nibbles):
+        return ENCODING_RLE, runs
+    return ENCODING_NIBBLE, nibbles
+
+
+def decode_cells(encoding, body, count):
+    """본문을 셀 count개의 bytearray로 풀기"""
+    if encoding == ENCODING_NIBBLE:
+        data = bytearray(len(body) * 2)
+        data[0::2] = body.translate(LOW_NIBBLE)
+        data[1::2] = body.translate(HIGH_NIBBLE)
+        del data[count:]
+    elif encoding == ENCODING_RLE:
+        data = bytearray()
+        for i in range(0, len(body), 2):
+            data += body[i + 1:i + 2] * body[i]
+    else:
+        raise ValueError(f"알 수 없는 패턴 인코딩: {encoding}")
+    if len(data) != count:
+        raise ValueError("패턴 본문의 셀 수가 헤더와 맞지 않습니다")
+    return data
+
+
+def save_binary(path, grid, year=None):
+    """그리드를 .cgrid 파일로 저장"""
+    data = bytes(grid)
+    encoding, body = encode_cells(data)
+    header = HEADER.pack(MAGIC, VERSION, encoding, grid.width, grid.height,
+                         year or 0, zlib.crc32(data), len(body))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header + body)
+    os.replace(tmp_path, path)
+
+
+def read_binary(path):
+    """.cgrid 파일을 메모리 맵으로 읽어 (그리드, 연도) 반환"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise ValueError(f"패턴 파일이 너무 짧습니다: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, version, encoding, width, height, year, checksum, length = \
+                HEADER.unpack_from(mapped)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"지원하지 않는 패턴 파일입니다: {path}")
+            body = mapped[HEADER.size:HEADER.size + length]
+    data = decode_cells(encoding, body, width * height)
+    if zlib.crc32(data) != checksum:
+        raise ValueError(f"패턴 파일 체크섬이 맞지 않습니다: {path}")
+    return CanvasGrid(width, height, data), year or None
+
+
+def read_pattern(path):
+    """패턴 파일(.json 또는 .cgrid)을 읽어 (그리드, 연도) 반환"""
+    if path.endswith(".cgrid"):
+        return read_binary(path)
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return CanvasGrid.from_list(data['grid']), data.get('year')
+
+
+def save_pattern(path, grid, year=None):
+    """그리드를 확장자에 맞는 형식(.json 또는 .cgrid)으로 저장"""
+    if path.endswith(".cgrid"):
+        save_binary(path, grid, year)
+        return
+    data = {
+        'grid': grid.to_list(),
+        'width': grid.width,
+        'height': grid.height,
+        'created': datetime.now().isoformat()
+    }
+    if year:
+        data['year'] = year
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load_grid(pattern_file):
+    """패턴 파일에서 그리드 읽기"""
+    return read_pattern(pattern_file)[0]
+
+
+class PatternLibrary:
+    """patterns/ 폴더의 패턴 목록과 색인"""
+
+    def __init__(self, directory="patterns"):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.entries = {}
+        self.changed = False
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path) as f:
+                    index = json.load(f)
+                if index.get("version") == VERSION:
+                    self.entries = index["patterns"]
+            except (OSError, ValueError, KeyError):
+                # 색인이 깨졌으면 새로 만듦
+                self.changed = True
+
+    def names(self):
+        """폴더의 패턴 파일 이름 목록 (정렬)"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory)
+                      if name.endswith(PATTERN_EXTENSIONS) and name != INDEX_FILE)
+
+    def entry(self, name):
+        """패턴의 색인 항목 (파일이 바뀌었으면 다시 읽어 갱신)"""
+        stat = os.stat(os.path.join(self.directory, name))
+        entry = self.entries.get(name)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry
+
+        grid, year = read_pattern(os.path.join(self.directory, name))
+        encoding, body = encode_cells(bytes(grid))
+        entry = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "width": grid.width,
+            "height": grid.height,
+            "year": year,
+            "cells": sum(1 for _ in grid.nonzero()),
+            "encoding": encoding,
+            "body": base64.b64encode(body).decode(),
+        }
+        self.entries[name] = entry
+        self.changed = True
+        return entry
+
+    def load(self, name):
+        """색인에서 그리드 복원 (파일이 바뀌지 않았으면 파일을 파싱하지 않음)"""
+        entry = self.entry(name)
+        data = decode_cells(entry["encoding"], base64.b64decode(entry["body"]),
+                            entry["width"] * entry["height"])
+        return CanvasGrid(entry["width"], entry["height"], data)
+
+    def scan(self):
+        """모든 패턴의 색인 항목을 갱신하고 (이름, 항목) 목록 반환"""
+        names = self.names()
+        for name in set(self.entries) - set(names):
+            del self.entries[name]
+            self.changed = True
+        return [(name, self.entry(name)) for name in names]
+
+    def save(self):
+        """바뀐 내용이 있으면 색인 파일 쓰기"""
+        if not self.changed or not os.path.isdir(self.directory):
+            return
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": VERSION, "patterns": self.entries}, f)
+        os.replace(tmp_path, self.index_path)
+        self.changed = False
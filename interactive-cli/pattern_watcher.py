@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+패턴 파일 감시 (watch)
+에디터에서 S로 저장할 때마다 바뀐 부분만 자동으로 다시 생성합니다.
+
+파일의 (수정 시각, 크기)를 주기적으로 확인하고, 바뀐 뒤 debounce초 동안 더 바뀌지 않으면
+그리드를 읽어 해시가 다를 때만 반영합니다. 생성 기록, 현재 계획, 기존 히스토리의 날짜별
+커밋 수는 메모리에 두므로, 변경 하나를 반영할 때 git log나 상태 파일을 다시 읽지 않습니다.
+"""
+
+import os
+import time
+
+from canvas_grid import CanvasGrid
+from git_backends import read_day_counts, resolve_commit
+from pattern_store import read_pattern
+
+
+def file_signature(path):
+    """파일의 (수정 시각, 크기) (없으면 None)"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PatternWatcher:
+    """패턴 파일을 감시하며 생성 기록을 최신 패턴으로 유지"""
+
+    def __init__(self, generator, pattern_file, interval=0.5, debounce=1.0):
+        self.generator = generator
+        self.pattern_file = pattern_file
+        self.interval = interval
+        self.debounce = debounce
+        self.ref = None
+        self.state = None
+        self.plan = None
+        self.existing = None
+        self.digest = None
+
+    def load(self):
+        """생성 기록과 현재 계획을 메모리에 준비 (불가능하면 False)"""
+        generator = self.generator
+        self.ref = generator.branch()
+        self.state = generator.load_generation(self.ref)
+        if self.state is None:
+            return False
+        base = self.state["base"]
+        # minimal 방식의 기존 커밋 수는 base 기준이라 감시하는 동안 바뀌지 않음
+        self.existing = read_day_counts(base) if generator.count_mode == "minimal" and base else {}
+        self.plan = generator.compile_plan(self.state["grid"], self.state["seed"], base,
+                                           self.existing)
+        self.digest = CanvasGrid.from_list(self.state["grid"]).digest()
+        return True
+
+    def branch_unchanged(self):
+        """감시하는 브랜치가 마지막 생성 이후 그대로인지"""
+        return resolve_commit(self.ref) == self.state["head"]
+
+    def apply(self):
+        """패턴 파일을 읽어 바뀌었으면 반영 (계속 감시할 수 없으면 False)"""
+        try:
+            grid, _ = read_pattern(self.pattern_file)
+        except (OSError, ValueError) as e:
+            # 저장하는 도중에 읽었을 수 있으므로 다음 변경을 기다림
+            print(f"⚠️  패턴을 읽을 수 없습니다: {e}")
+            return True
+        digest = grid.digest()
+        if digest == self.digest:
+            return True
+        if not self.branch_unchanged():
+            print("✗ 브랜치에 다른 커밋이 추가되어 감시를 멈춥니다.")
+            return False
+
+        started = time.perf_counter()
+        generator = self.generator
+        plan = generator.compile_plan(grid, self.state["seed"], self.state["base"], self.existing)
+        total, state = generator.apply_change(self.ref, self.state, self.plan, plan, grid,
+                                              self.pattern_file)
+        if generator.error:
+            return False
+        if state is not None:
+            self.state = state
+            self.plan = plan
+        self.digest = digest
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"✓ {time.strftime('%H:%M:%S')} 반영 완료: 커밋 {total}개 생성, "
+              f"전체 {plan.total}개 ({elapsed:.0f}ms)")
+        return True
+
+    def run(self):
+        """Ctrl-C를 누를 때까지 감시"""
+        if not self.load():
+            return
+        print(f"👀 {self.pattern_file} 감시 중 ({self.interval}초 간격, "
+              f"{self.debounce}초 동안 변화가 없으면 반영, Ctrl-C로 종료)")
+        signature = file_signature(self.pattern_file)
+        changed_at = None
+        try:
+            # 마지막 생성 이후 이미 바뀐 패턴은 바로 반영
+            if not self.apply():
+                return
+            while True:
+                time.sleep(self.interval)
+                current = file_signature(self.pattern_file)
+                if current != signature:
+                    # 연속 저장은 마지막 저장 이후 debounce초가 지날 때까지 모음
+                    signature = current
+                    changed_at = time.monotonic()
+                    continue
+                if changed_at is None or time.monotonic() - changed_at < self.debounce:
+                    continue
+                changed_at = None
+                if current is not None and not self.apply():
+                    return
+        except KeyboardInterrupt:
+            print("\n감시를 종료합니다.")
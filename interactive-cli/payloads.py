@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+커밋 payload 전략
+커밋마다 payload 파일 내용을 어떻게 바꿀지 결정합니다.
+
+- append: 파일 끝에 한 줄씩 추가 (기존 방식, 커밋 N의 블롭 크기가 N줄로 커짐)
+- rotate: 최근 N줄만 유지하는 고정 크기 파일 (블롭 크기 일정)
+- empty:  파일을 바꾸지 않는 빈 커밋 (모든 커밋이 하나의 트리를 재사용)
+"""
+
+import os
+from collections import deque
+
+
+class Payload:
+    """payload 전략 기본 클래스"""
+
+    name = None
+
+    def __init__(self, payload_file, initial=None):
+        self.payload_file = payload_file
+        self.initial = initial
+        self.content = None
+
+    def load(self):
+        """초기 내용 반환 (initial이 없으면 작업 디렉토리의 기존 payload 파일 읽기)"""
+        if self.initial is not None:
+            return self.initial
+        if os.path.exists(self.payload_file):
+            with open(self.payload_file, "rb") as f:
+                return f.read()
+        return b""
+
+    def next(self, line):
+        """line을 반영한 새 파일 내용 반환 (파일을 바꾸지 않으면 None)"""
+        raise NotImplementedError
+
+
+class AppendPayload(Payload):
+    """파일 끝에 한 줄씩 추가 (기존 방식)"""
+
+    name = "append"
+
+    def __init__(self, payload_file, initial=None):
+        super().__init__(payload_file, initial)
+        self.content = self.load()
+
+    def next(self, line):
+        self.content += line.encode()
+        return self.content
+
+
+class RotatePayload(Payload):
+    """최근 max_lines줄만 유지하는 고정 크기 파일"""
+
+    name = "rotate"
+
+    def __init__(self, payload_file, initial=None, max_lines=64):
+        super().__init__(payload_file, initial)
+        self.lines = deque(self.load().splitlines(keepends=True), maxlen=max_lines)
+        self.content = b"".join(self.lines)
+
+    def next(self, line):
+        self.lines.append(line.encode())
+        self.content = b"".join(self.lines)
+        return self.content
+
+
+class EmptyPayload(Payload):
+    """파일을 바꾸지 않는 빈 커밋"""
+
+    name = "empty"
+
+    def next(self, line):
+        return None
+
+
+PAYLOADS = {
+    AppendPayload.name: AppendPayload,
+    RotatePayload.name: RotatePayload,
+    EmptyPayload.name: EmptyPayload,
+}
+
+
+def make_payload(strategy, payload_file, initial=None):
+    """전략 이름으로 payload 생성 (initial: 파일 대신 사용할 초기 내용)"""
+    if strategy not in PAYLOADS:
+        raise ValueError(f"알 수 없는 payload 전략: {strategy} (가능: {', '.join(PAYLOADS)})")
+    return PAYLOADS[strategy](payload_file, initial)
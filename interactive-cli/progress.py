@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+진행률 표시와 단계별 시간 측정
+
+ProgressBar는 커밋마다 호출해도 일정 간격으로만 화면을 갱신하므로 터미널 출력이
+생성 속도에 영향을 주지 않습니다. PhaseTimer는 --profile일 때만 켜지며, 꺼져 있으면
+phase()가 아무것도 하지 않는 컨텍스트를 돌려줍니다.
+"""
+
+import contextlib
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+# 꺼진 타이머가 돌려주는 컨텍스트 (재사용 가능)
+NULL_PHASE = contextlib.nullcontext()
+
+# 하위 단계 이름 구분자 (예: "커밋 > git add")
+SUBPHASE = " > "
+
+
+class _Phase:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, time.perf_counter() - self.started)
+
+
+class PhaseTimer:
+    """단계별 누적 시간 (enabled=False면 측정하지 않음)"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.totals = {}
+        self.calls = {}
+        self.notes = []
+        # 첫 단계가 시작된 시각 (확인 입력을 기다린 시간은 빼고 측정)
+        self.started = None
+
+    def phase(self, name):
+        """with 블록의 실행 시간을 name 단계에 더함"""
+        if not self.enabled:
+            return NULL_PHASE
+        if self.started is None:
+            self.started = time.perf_counter()
+        if name not in self.totals:
+            # 요약에서 바깥 단계가 하위 단계보다 먼저 나오도록 시작 순서로 등록
+            self.totals[name] = 0.0
+            self.calls[name] = 0
+        return _Phase(self, name)
+
+    def add(self, name, seconds, calls=1):
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + calls
+
+    def note(self, text):
+        """요약 아래에 덧붙일 설명 (예: 설치된 훅)"""
+        if self.enabled:
+            self.notes.append(text)
+
+    def print_summary(self):
+        """단계별 호출 수, 합계, 평균, 전체 대비 비율 출력"""
+        if self.started is None:
+            return
+        wall = max(time.perf_counter() - self.started, 1e-9)
+        print("=" * 60)
+        print(f"⏱  단계별 시간 (전체 {wall:.2f}초)")
+        print("=" * 60)
+        print(f"{'단계':<26}{'호출':>8}{'합계':>10}{'평균':>10}{'비율':>6}")
+        measured = 0.0
+        for name, total in self.totals.items():
+            calls = self.calls[name]
+            if SUBPHASE in name:
+                label = "  └ " + name.split(SUBPHASE)[-1]
+            else:
+                label = name
+                measured += total
+            print(f"{label:<26}{calls:>8}{total:>9.3f}s{total / calls * 1000:>8.2f}ms"
+                  f"{total / wall:>6.0%}")
+        other = max(wall - measured, 0.0)
+        print(f"{'기타 (계획 순회, 출력 등)':<26}{'':>8}{other:>9.3f}s{'':>10}"
+              f"{other / wall:>6.0%}")
+        for text in self.notes:
+            print(f"※ {text}")
+        print("=" * 60)
+
+
+def installed_hooks():
+    """현재 저장소에 설치된 (예제가 아닌) git 훅 이름 목록"""
+    try:
+        hooks_dir = subprocess.run(["git", "rev-parse", "--git-path", "hooks"],
+                                   check=True, capture_output=True, text=True).stdout.strip()
+    except (subprocess.CalledProcessError, OSError):
+        return []
+    if not os.path.isdir(hooks_dir):
+        return []
+    return sorted(name for name in os.listdir(hooks_dir)
+                  if not name.endswith(".sample")
+                  and os.access(os.path.join(hooks_dir, name), os.X_OK))
+
+
+def spawn_cost(samples=5):
+    """git 프로세스 하나를 실행하는 데 드는 평균 시간 (git --version 기준, 초)"""
+    started = time.perf_counter()
+    for _ in range(samples):
+        subprocess.run(["git", "--version"], check=True, capture_output=True)
+    return (time.perf_counter() - started) / samples
+
+
+class ProgressBar:
+    """갱신 간격을 제한하는 진행률 표시 (속도와 남은 시간 포함)
+
+    터미널이면 한 줄을 덮어쓰고, 파일/파이프로 출력하면 더 긴 간격으로 줄 단위로 씁니다.
+    """
+
+    def __init__(self, total, label="커밋 생성", start=0, interval=0.1, width=30):
+        self.total = total
+        self.label = label
+        self.start = start
+        self.width = width
+        self.tty = sys.stdout.isatty()
+        self.interval = interval if self.tty else 2.0
+        self.started = time.perf_counter()
+        self.last_draw = 0.0
+        self.done = start
+
+    def update(self, done):
+        """done개 완료 (간격이 지나지 않았으면 그리지 않음)"""
+        self.done = done
+        now = time.perf_counter()
+        if now - self.last_draw >= self.interval:
+            self.last_draw = now
+            self.draw(now)
+
+    def draw(self, now=None):
+        now = now or time.perf_counter()
+        done, total = self.done, self.total
+        elapsed = now - self.started
+        rate = (done - self.start) / elapsed if elapsed > 0 else 0.0
+        fraction = done / total if total else 1.0
+        filled = int(self.width * fraction)
+        bar = "█" * filled + "░" * (self.width - filled)
+        line = (f"{self.label} [{bar}] {fraction:>4.0%} {done}/{total} | "
+                f"{rate:,.0f}커밋/초 | {self.format_eta(rate)}")
+        if self.tty:
+            columns = shutil.get_terminal_size().columns
+            sys.stdout.write("\r" + line[:columns - 1] + "\x1b[K")
+            sys.stdout.flush()
+        else:
+            print(line)
+
+    def format_eta(self, rate):
+        remaining = self.total - self.done
+        if remaining <= 0:
+            return f"완료 {time.perf_counter() - self.started:.1f}초"
+        if rate <= 0:
+            return "남은 시간 계산 중"
+        seconds = int(remaining / rate)
+        return f"남은 시간 {seconds // 60}:{seconds % 60:02d}"
+
+    def finish(self):
+        """마지막 상태를 그리고 줄 바꿈"""
+        self.draw()
+        if self.tty:
+            sys.stdout.write("\n")
+            sys.stdout.flush()
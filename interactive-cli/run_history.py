@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+생성 실행 기록
+생성을 시작할 때 브랜치 끝을 refs/canvas-runs/<실행 ID>/base에, 끝났을 때 만든 범위의
+끝을 .../head에 저장합니다. 되돌릴 때는 ref 하나만 읽으므로 히스토리를 훑지 않고,
+ref가 커밋을 가리키고 있어 gc로 사라지지도 않습니다.
+
+실행별 정보(브랜치, 패턴, 연도, 커밋 수 등)는 .git/canvas/runs.json에 저장합니다.
+"""
+
+import os
+import subprocess
+from datetime import datetime
+
+from canvas_state import read_state, write_state
+from git_backends import git_output, resolve_commit, worktree_ref
+
+RUNS_NAMESPACE = "refs/canvas-runs"
+RUNS_FILE = "runs.json"
+
+
+def run_ref(run_id, end):
+    """실행의 base/head ref 이름"""
+    return f"{RUNS_NAMESPACE}/{run_id}/{end}"
+
+
+def _read_runs():
+    return read_state(RUNS_FILE) or {}
+
+
+def _write_ref(ref, commit, backend):
+    """실행 기록 ref 쓰기 (백엔드가 있으면 백엔드로, pack 백엔드는 git 없이 씀)"""
+    if backend is not None:
+        backend.write_ref(ref, commit)
+    else:
+        subprocess.run(["git", "update-ref", ref, commit], check=True)
+
+
+def start_run(ref, base, info, backend=None):
+    """생성 시작 기록 (base: 시작 전 브랜치 끝, 비어 있었으면 None) 후 실행 ID 반환
+
+    backend: 기록할 ref를 쓸 커밋 백엔드 (없으면 git update-ref)
+    """
+    runs = _read_runs()
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    suffix = 1
+    while run_id + (f"-{suffix}" if suffix > 1 else "") in runs:
+        suffix += 1
+    if suffix > 1:
+        run_id += f"-{suffix}"
+
+    if base:
+        _write_ref(run_ref(run_id, "base"), base, backend)
+    runs[run_id] = dict(info, ref=ref, base=base, head=None, commits=0,
+                        started=datetime.now().isoformat(timespec="seconds"), status="running")
+    write_state(RUNS_FILE, runs)
+    return run_id
+
+
+def finish_run(run_id, head, commits, backend=None):
+    """생성이 끝난 브랜치 끝(head)과 만든 커밋 수 기록"""
+    runs = _read_runs()
+    if run_id not in runs:
+        return
+    if head:
+        _write_ref(run_ref(run_id, "head"), head, backend)
+    runs[run_id].update(head=head, commits=commits, status="done")
+    write_state(RUNS_FILE, runs)
+
+
+def list_runs():
+    """(실행 ID, 정보) 목록 (오래된 순, ref가 지워진 실행은 뺌)"""
+    runs = _read_runs()
+    refs = {}
+    output = git_output(["for-each-ref", "--format=%(refname) %(objectname)", RUNS_NAMESPACE])
+    for line in output.splitlines():
+        name, sha = line.split()
+        run_id, end = name[len(RUNS_NAMESPACE) + 1:].rsplit("/", 1)
+        refs.setdefault(run_id, {})[end] = sha
+
+    result = []
+    for run_id in sorted(runs):
+        info = runs[run_id]
+        present = refs.get(run_id, {})
+        # 기록한 ref 중 하나라도 지워졌으면 뺌 (빈 브랜치에서 시작한 실행은 base ref가 없음)
+        if any(info[end] and end not in present for end in ("base", "head")):
+            continue
+        result.append((run_id, info))
+    return result
+
+
+def find_run(run_id=None):
+    """실행 ID의 정보 (None이면 가장 최근 실행)"""
+    runs = list_runs()
+    if not runs:
+        return None, None
+    if run_id is None:
+        return runs[-1]
+    for candidate, info in runs:
+        if candidate == run_id:
+            return candidate, info
+    return run_id, None
+
+
+def reset_branch(ref, target, payload_file):
+    """브랜치를 target으로 되돌림 (None이면 브랜치를 비움)
+
+    체크아웃되지 않은 브랜치(또는 bare 저장소)는 ref만 옮기고 작업 디렉토리는 건드리지 않습니다.
+    """
+    if worktree_ref() != ref:
+        if target:
+            subprocess.run(["git", "update-ref", ref, target], check=True)
+        elif resolve_commit(ref):
+            subprocess.run(["git", "update-ref", "-d", ref], check=True)
+        return
+    if target and not resolve_commit(ref):
+        # 빈 브랜치에서는 reset을 쓸 수 없으므로 브랜치를 옮긴 뒤 트리를 체크아웃
+        subprocess.run(["git", "update-ref", ref, target], check=True)
+        subprocess.run(["git", "read-tree", "-m", "-u", target], check=True)
+        return
+    if target:
+        subprocess.run(["git", "reset", "-q", "--keep", target], check=True)
+        return
+    # 생성 전 브랜치가 비어 있었으면 브랜치를 처음 상태로 되돌림
+    subprocess.run(["git", "update-ref", "-d", ref], check=True)
+    subprocess.run(["git", "read-tree", "--empty"], check=True)
+    if os.path.exists(payload_file):
+        os.remove(payload_file)
+
+
+def rollback(run_id, end, ref=None):
+    """실행의 base(생성 전) 또는 head(생성 후)로 실행한 브랜치를 되돌림
+
+    ref를 주면 그 브랜치에서 실행한 기록인지 확인합니다.
+    반환값: (성공 여부, 메시지)
+    """
+    run_id, info = find_run(run_id)
+    if info is None:
+        return False, f"실행 기록을 찾을 수 없습니다: {run_id}" if run_id else "실행 기록이 없습니다."
+    if ref and info["ref"] != ref:
+        return False, f"{run_id}는 {info['ref']} 브랜치의 실행입니다."
+    if end == "head" and not info["head"]:
+        return False, f"{run_id}는 끝나지 않은 실행이라 생성 후 상태가 없습니다."
+
+    target = resolve_commit(run_ref(run_id, end)) if info[end] else None
+    if target == resolve_commit(info["ref"]):
+        return True, "이미 해당 상태입니다."
+    reset_branch(info["ref"], target, info.get("payload_file", "canvas_commits.txt"))
+    where = "생성 전" if end == "base" else "생성 후"
+    return True, f"{run_id}의 {where} 상태({(target or '빈 브랜치')[:12]})로 되돌렸습니다."
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+커밋 시각 스케줄러
+계획 전체의 커밋 시각을 시드 하나로 한 번에 만듭니다.
+
+- 요일(일~토) x 시간(0~23) 가중치로 된 활동 프로필에 따라 시간대를 고릅니다.
+- 하루 안의 커밋은 서로 다른 초로 뽑아 정렬하므로 계획 전체에서 시각이 엄격히 증가합니다.
+- 난수는 날짜 순서로 소비하므로, 앞쪽 날짜들이 같으면 그 날짜들의 시각도 항상 같습니다
+  (regenerate가 바뀌지 않은 앞부분을 그대로 유지할 수 있음).
+- 연도별 (주, 요일) -> 날짜 표는 한 번만 계산하여 재사용합니다.
+"""
+
+import itertools
+import json
+import os
+import random
+import re
+from array import array
+from datetime import date, timedelta, timezone
+from functools import lru_cache
+
+# 시각 생성 방식이 바뀌면 올림 (저장된 생성 기록과 호환 여부 확인용)
+SCHEDULE_VERSION = 2
+
+HOURS = range(24)
+
+
+class ActivityProfile:
+    """요일별 시간대 가중치 (weights[요일][시간], 요일 0 = 일요일)"""
+
+    def __init__(self, name, weights):
+        if len(weights) != 7 or any(len(day) != 24 for day in weights):
+            raise ValueError(f"활동 프로필은 7일 x 24시간 가중치여야 합니다: {name}")
+        if any(sum(day) <= 0 for day in weights):
+            raise ValueError(f"활동 프로필의 모든 요일에 가중치가 있어야 합니다: {name}")
+        self.name = name
+        self.weights = [list(day) for day in weights]
+        # random.choices에 넘길 누적 가중치
+        self.cum_weights = [list(itertools.accumulate(day)) for day in weights]
+
+    @classmethod
+    def from_hours(cls, name, weekday_hours, weekend_hours=None):
+        """평일/주말 시간대 가중치로 생성"""
+        weekend_hours = weekend_hours or weekday_hours
+        return cls(name, [weekend_hours if day in (0, 6) else weekday_hours for day in range(7)])
+
+
+def hours(*ranges):
+    """(시작, 끝, 가중치) 구간들로 24시간 가중치 만들기 (끝 시각은 포함하지 않음)"""
+    weights = [0] * 24
+    for start, end, weight in ranges:
+        for hour in range(start, end):
+            weights[hour % 24] = weight
+    return weights
+
+
+PROFILES = {
+    # 기존 방식: 매일 09:00~22:59 균등
+    "uniform": ActivityProfile.from_hours("uniform", hours((9, 23, 1))),
+    # 평일 업무 시간 위주, 주말은 낮에 가끔
+    "workday": ActivityProfile.from_hours(
+        "workday",
+        hours((9, 12, 3), (12, 13, 1), (13, 18, 4), (18, 21, 1)),
+        hours((11, 18, 1)),
+    ),
+    # 퇴근 후 저녁과 주말 위주
+    "evening": ActivityProfile.from_hours(
+        "evening",
+        hours((7, 9, 1), (12, 13, 1), (19, 24, 4), (0, 1, 2)),
+        hours((10, 24, 2)),
+    ),
+    # 밤늦게 활동
+    "night-owl": ActivityProfile.from_hours(
+        "night-owl",
+        hours((14, 20, 1), (20, 24, 3), (0, 3, 4), (3, 4, 1)),
+    ),
+}
+
+DEFAULT_PROFILE = "uniform"
+
+
+def load_profile(name):
+    """이름(PROFILES) 또는 JSON 파일 경로로 활동 프로필 읽기
+
+    JSON 형식: {"hours": [24개]} (모든 요일 같음),
+              {"weekday": [24개], "weekend": [24개]} 또는 {"days": [[24개] x 7]} (일요일부터)
+    """
+    if name in PROFILES:
+        return PROFILES[name]
+    if not os.path.exists(name):
+        raise ValueError(f"알 수 없는 활동 프로필: {name} (가능: {', '.join(PROFILES)} 또는 JSON 파일)")
+    with open(name) as f:
+        data = json.load(f)
+    label = os.path.basename(name)
+    if "days" in data:
+        return ActivityProfile(label, data["days"])
+    if "weekday" in data:
+        return ActivityProfile.from_hours(label, data["weekday"], data.get("weekend"))
+    return ActivityProfile.from_hours(label, data["hours"])
+
+
+def parse_tz(text):
+    """'+09:00', '-0500', 'Z' 형식의 시간대를 분 단위 오프셋으로 (None이면 로컬 시간대)"""
+    if text is None:
+        return None
+    if text.upper() in ("Z", "UTC"):
+        return 0
+    match = re.fullmatch(r"([+-])(\d{1,2}):?(\d{2})?", text)
+    if not match:
+        raise ValueError(f"시간대 형식이 잘못되었습니다: {text} (예: +09:00, -0500)")
+    sign, hh, mm = match.groups()
+    minutes = int(hh) * 60 + int(mm or 0)
+    if minutes >= 24 * 60:
+        raise ValueError(f"시간대 범위를 벗어났습니다: {text}")
+    return -minutes if sign == "-" else minutes
+
+
+def make_tzinfo(offset):
+    """분 단위 오프셋의 tzinfo (None이면 None = 로컬 시간대)"""
+    if offset is None:
+        return None
+    return timezone(timedelta(minutes=offset))
+
+
+def year_start_date(year):
+    """해당 연도 잔디밭의 첫 칸(1월 1일이 속한 주의 일요일)"""
+    jan_1 = date(year, 1, 1)
+    # weekday(): 0=월요일, 6=일요일
+    return jan_1 - timedelta(days=(jan_1.weekday() + 1) % 7)
+
+
+@lru_cache(maxsize=None)
+def year_calendar(year):
+    """연도 잔디밭의 index(week * 7 + day) -> 날짜 ordinal 표 (연도 밖의 칸은 0)"""
+    start = year_start_date(year).toordinal()
+    first = date(year, 1, 1).toordinal()
+    last = date(year, 12, 31).toordinal()
+    weeks = (last - start) // 7 + 1
+    return array('l', (ordinal if first <= ordinal <= last else 0
+                       for ordinal in range(start, start + weeks * 7)))
+
+
+def weekday_index(ordinal):
+    """날짜 ordinal의 요일 (0 = 일요일)"""
+    # ordinal 1(0001-01-01)은 월요일
+    return ordinal % 7
+
+
+class CommitScheduler:
+    """계획 전체의 커밋 시각을 한 번에 생성"""
+
+    def __init__(self, seed, profile=DEFAULT_PROFILE):
+        self.seed = seed
+        self.profile = profile if isinstance(profile, ActivityProfile) else load_profile(profile)
+
+    def schedule(self, days, counts):
+        """날짜별 커밋 수에 맞춰 커밋마다 '그날 0시부터의 초'를 담은 배열 반환
+
+        하루 안에서는 서로 다른 초가 오름차순으로 정렬되어 있습니다.
+        """
+        rng = random.Random(f"{self.seed}:time")
+        cum_weights = self.profile.cum_weights
+        seconds = array('l')
+        for ordinal, count in zip(days, counts):
+            if count == 0:
+                continue
+            # 시간대를 한 번에 뽑고, 같은 시간대 안에서는 겹치지 않는 초를 뽑음
+            picked = rng.choices(HOURS, cum_weights=cum_weights[weekday_index(ordinal)], k=count)
+            per_hour = {}
+            for hour in picked:
+                per_hour[hour] = per_hour.get(hour, 0) + 1
+            if max(per_hour.values()) <= 3600:
+                day_seconds = []
+                for hour, n in per_hour.items():
+                    day_seconds.extend(hour * 3600 + offset for offset in rng.sample(range(3600), n))
+            else:
+                # 한 시간에 3600개가 넘으면 활동 시간대 전체에서 겹치지 않게 뽑음
+                active = [hour for hour in HOURS
+                          if self.profile.weights[weekday_index(ordinal)][hour] > 0]
+                if count > len(active) * 3600:
+                    raise ValueError(f"하루 커밋 수가 너무 많습니다: {count}")
+                day_seconds = [active[i // 3600] * 3600 + i % 3600
+                               for i in rng.sample(range(len(active) * 3600), count)]
+            day_seconds.sort()
+            seconds.extend(day_seconds)
+        return seconds
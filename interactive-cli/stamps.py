@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+스탬프 합성 엔진
+튤립, 하트, 글자 같은 작은 스탬프를 여러 위치에 찍어 연도 그리드(CanvasGrid)를 만듭니다.
+
+스탬프는 미리 7칸 높이의 주(열) 단위 바이트로 펼쳐 두므로, 한 번 찍는 것이 그리드
+버퍼의 연속 구간 하나와의 바이트 연산입니다. 셀별 반복 대신 구간 전체를 큰 정수로
+바꿔 한 번에 더하고(강도가 작아 바이트 사이 올림이 생기지 않음), 변환표(translate)로
+최댓값/상한을 적용합니다. 달력 밖의 칸은 마지막에 마스크 한 번으로 지웁니다.
+"""
+
+import argparse
+import os
+from collections import namedtuple
+
+from canvas_grid import CanvasGrid
+from pattern_store import save_pattern
+from scheduler import year_calendar
+
+HEIGHT = 7
+
+# 스탬프 하나를 찍을 위치 (intensity: 칠한 칸의 강도를 이 값으로 바꿈, None이면 그대로)
+Placement = namedtuple("Placement", "stamp week day intensity", defaults=(0, None))
+
+# a * 8 + b (a, b <= 4) -> max(a, b), 합 -> 최대 4
+MAX_TABLE = bytes(max(i >> 3, i & 7) for i in range(256))
+CLIP_TABLE = bytes(min(i, 4) for i in range(256))
+# 칠한 칸을 강도 i로 바꾸는 변환표
+INTENSITY_TABLES = [bytes([0] + [i] * 255) for i in range(5)]
+
+
+class Stamp:
+    """스탬프 (rows[day][week] 강도, 주 단위 바이트로 저장)"""
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.height = len(rows)
+        self.width = max((len(row) for row in rows), default=0)
+        if self.height > HEIGHT:
+            raise ValueError(f"스탬프 높이는 {HEIGHT}칸 이하여야 합니다: {name}")
+        self.rows = [list(row) + [0] * (self.width - len(row)) for row in rows]
+        self._columns = {}
+
+    @classmethod
+    def from_art(cls, name, art, intensity=4):
+        """문자 그림에서 생성 ('.'/공백 = 0, 숫자 = 강도, 그 외 = intensity)"""
+        rows = []
+        for line in art:
+            row = []
+            for char in line:
+                if char in ". ":
+                    row.append(0)
+                elif char.isdigit():
+                    row.append(min(int(char), 4))
+                else:
+                    row.append(intensity)
+            rows.append(row)
+        return cls(name, rows)
+
+    def columns(self, day=0):
+        """day칸 아래로 내려 7칸 높이로 펼친 주 단위 바이트 (캐시)"""
+        if day not in self._columns:
+            data = bytearray(self.width * HEIGHT)
+            for y, row in enumerate(self.rows):
+                if 0 <= y + day < HEIGHT:
+                    data[y + day::HEIGHT] = bytes(row)
+            self._columns[day] = bytes(data)
+        return self._columns[day]
+
+
+def merge_max(a, b):
+    """같은 길이의 강도 바이트열의 칸별 최댓값"""
+    n = len(a)
+    combined = (int.from_bytes(a, "little") << 3) + int.from_bytes(b, "little")
+    return combined.to_bytes(n, "little").translate(MAX_TABLE)
+
+
+def merge_sum(a, b):
+    """같은 길이의 강도 바이트열의 칸별 합 (4에서 자름)"""
+    n = len(a)
+    total = int.from_bytes(a, "little") + int.from_bytes(b, "little")
+    return total.to_bytes(n, "little").translate(CLIP_TABLE)
+
+
+MERGES = {"max": merge_max, "sum": merge_sum}
+
+
+def year_weeks(year):
+    """해당 연도 잔디밭의 주 수 (1월 1일이 속한 주 ~ 12월 31일이 속한 주)"""
+    return len(year_calendar(year)) // HEIGHT
+
+
+def calendar_mask(year, width):
+    """연도 안의 칸은 0xFF, 밖의 칸은 0x00인 마스크"""
+    mask = bytes(0xFF if ordinal else 0 for ordinal in year_calendar(year))
+    mask = mask[:width * HEIGHT].ljust(width * HEIGHT, b"\x00")
+    return int.from_bytes(mask, "little")
+
+
+def composite(placements, year=None, width=None, merge="max"):
+    """스탬프들을 그리드에 합성
+
+    year를 주면 그 연도의 주 수를 너비로 쓰고 달력 밖의 칸을 지웁니다.
+    그리드 밖으로 나간 부분은 잘립니다.
+    """
+    if merge not in MERGES:
+        raise ValueError(f"알 수 없는 합성 방식: {merge} (가능: {', '.join(MERGES)})")
+    combine = MERGES[merge]
+    if width is None:
+        width = year_weeks(year) if year else 52
+    data = bytearray(width * HEIGHT)
+
+    for placement in placements:
+        stamp = placement.stamp
+        columns = stamp.columns(placement.day)
+        if placement.intensity is not None:
+            columns = columns.translate(INTENSITY_TABLES[placement.intensity])
+        # 그리드 좌우 밖으로 나간 주 잘라내기
+        first = max(placement.week, 0)
+        last = min(placement.week + stamp.width, width)
+        if first >= last:
+            continue
+        columns = columns[(first - placement.week) * HEIGHT:(last - placement.week) * HEIGHT]
+        lo, hi = first * HEIGHT, last * HEIGHT
+        data[lo:hi] = combine(data[lo:hi], columns)
+
+    if year:
+        clipped = int.from_bytes(data, "little") & calendar_mask(year, width)
+        data = bytearray(clipped.to_bytes(len(data), "little"))
+    return CanvasGrid(width, HEIGHT, data)
+
+
+STAMPS = {
+    # 튤립 (7줄 x 5칸)
+    "tulip": Stamp.from_art("tulip", [
+        "..#..",
+        ".###.",
+        "#####",
+        ".###.",
+        "..#..",
+        "..#..",
+        "..#..",
+    ]),
+    "heart": Stamp.from_art("heart", [
+        ".##.##.",
+        "#######",
+        "#######",
+        ".#####.",
+        "..###..",
+        "...#...",
+    ]),
+    "small-heart": Stamp.from_art("small-heart", [
+        "#.#",
+        "###",
+        ".#.",
+    ]),
+}
+
+# 3x5 글꼴 (대문자, 숫자, 일부 기호)
+FONT = {
+    "A": ["###", "#.#", "###", "#.#", "#.#"], "B": ["##.", "#.#", "##.", "#.#", "##."],
+    "C": ["###", "#..", "#..", "#..", "###"], "D": ["##.", "#.#", "#.#", "#.#", "##."],
+    "E": ["###", "#..", "###", "#..", "###"], "F": ["###", "#..", "###", "#..", "#.."],
+    "G": ["###", "#..", "#.#", "#.#", "###"], "H": ["#.#", "#.#", "###", "#.#", "#.#"],
+    "I": ["###", ".#.", ".#.", ".#.", "###"], "J": ["..#", "..#", "..#", "#.#", "###"],
+    "K": ["#.#", "#.#", "##.", "#.#", "#.#"], "L": ["#..", "#..", "#..", "#..", "###"],
+    "M": ["#.#", "###", "###", "#.#", "#.#"], "N": ["##.", "#.#", "#.#", "#.#", "#.#"],
+    "O": ["###", "#.#", "#.#", "#.#", "###"], "P": ["###", "#.#", "###", "#..", "#.."],
+    "Q": ["###", "#.#", "#.#", "###", "..#"], "R": ["###", "#.#", "##.", "#.#", "#.#"],
+    "S": ["###", "#..", "###", "..#", "###"], "T": ["###", ".#.", ".#.", ".#.", ".#."],
+    "U": ["#.#", "#.#", "#.#", "#.#", "###"], "V": ["#.#", "#.#", "#.#", "#.#", ".#."],
+    "W": ["#.#", "#.#", "###", "###", "#.#"], "X": ["#.#", "#.#", ".#.", "#.#", "#.#"],
+    "Y": ["#.#", "#.#", ".#.", ".#.", ".#."], "Z": ["###", "..#", ".#.", "#..", "###"],
+    "0": ["###", "#.#", "#.#", "#.#", "###"], "1": [".#.", "##.", ".#.", ".#.", "###"],
+    "2": ["###", "..#", "###", "#..", "###"], "3": ["###", "..#", "###", "..#", "###"],
+    "4": ["#.#", "#.#", "###", "..#", "..#"], "5": ["###", "#..", "###", "..#", "###"],
+    "6": ["###", "#..", "###", "#.#", "###"], "7": ["###", "..#", "..#", "..#", "..#"],
+    "8": ["###", "#.#", "###", "#.#", "###"], "9": ["###", "#.#", "###", "..#", "###"],
+    "!": [".#.", ".#.", ".#.", "...", ".#."], "-": ["...", "...", "###", "...", "..."],
+    ".": ["...", "...", "...", "...", ".#."], " ": ["...", "...", "...", "...", "..."],
+    "♥": [".#.#.", "#####", "#####", ".###.", "..#.."],
+}
+
+
+def letter(char):
+    """글자 스탬프 (없는 글자는 ValueError)"""
+    key = char.upper()
+    if key not in FONT:
+        raise ValueError(f"글꼴에 없는 글자입니다: {char!r}")
+    name = f"letter-{key}"
+    if name not in STAMPS:
+        STAMPS[name] = Stamp.from_art(name, FONT[key])
+    return STAMPS[name]
+
+
+def text_placements(text, week=0, day=1, spacing=1, intensity=None):
+    """글자열을 왼쪽부터 차례로 찍는 배치 목록"""
+    placements = []
+    for char in text:
+        stamp = letter(char)
+        placements.append(Placement(stamp, week, day, intensity))
+        week += stamp.width + spacing
+    return placements
+
+
+def parse_placement(spec):
+    """"이름:주[:요일[:강도]]" 형식의 배치 (예: tulip:5, heart:20:1:3)"""
+    name, *numbers = spec.split(":")
+    if name not in STAMPS:
+        raise argparse.ArgumentTypeError(f"알 수 없는 스탬프: {name} (가능: {', '.join(STAMPS)})")
+    if not 1 <= len(numbers) <= 3:
+        raise argparse.ArgumentTypeError(f"배치 형식이 잘못되었습니다: {spec}")
+    try:
+        values = [int(number) for number in numbers]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"배치 형식이 잘못되었습니다: {spec}")
+    week = values[0]
+    day = values[1] if len(values) > 1 else 0
+    intensity = values[2] if len(values) > 2 else None
+    if intensity is not None and not 1 <= intensity <= 4:
+        raise argparse.ArgumentTypeError(f"강도는 1-4여야 합니다: {spec}")
+    return Placement(STAMPS[name], week, day, intensity)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="스탬프를 합성하여 패턴 파일 만들기",
+        epilog="예: python3 stamps.py banner.cgrid --year 2024 --text HELLO --stamp heart:30"
+    )
+    parser.add_argument("output", help="patterns/ 폴더에 저장할 파일 이름 (.json 또는 .cgrid)")
+    parser.add_argument("--year", type=int, default=None,
+                        help="대상 연도 (주면 달력 밖의 칸을 자름)")
+    parser.add_argument("--width", type=int, default=None,
+                        help="그리드 주 수 (기본: 연도의 주 수, 연도가 없으면 52)")
+    parser.add_argument("--stamp", action="append", type=parse_placement, default=[],
+                        help="스탬프 배치 이름:주[:요일[:강도]] (여러 번 사용 가능)")
+    parser.add_argument("--text", default=None, help="찍을 글자열 (3x5 글꼴)")
+    parser.add_argument("--text-week", type=int, default=1, help="글자열 시작 주 (기본: 1)")
+    parser.add_argument("--merge", choices=list(MERGES), default="max",
+                        help="겹치는 칸 합성 방식 (기본: max)")
+    args = parser.parse_args()
+
+    placements = list(args.stamp)
+    if args.text:
+        placements += text_placements(args.text, args.text_week)
+    grid = composite(placements, args.year, args.width, args.merge)
+
+    os.makedirs("patterns", exist_ok=True)
+    path = os.path.join("patterns", args.output)
+    save_pattern(path, grid, args.year)
+    for day in range(grid.height):
+        print("".join("██" if intensity else "  " for intensity in grid.row(day)))
+    print(f"✓ {path} 저장 (스탬프 {len(placements)}개, {grid.width}주)")
+
+
+if __name__ == "__main__":
+    main()